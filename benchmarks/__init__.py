@@ -0,0 +1,2 @@
+# run these benchmarks from the repository root as:
+# python -m benchmarks.<module>
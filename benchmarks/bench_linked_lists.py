@@ -0,0 +1,170 @@
+"""
+Benchmarks for the linked list implementations
+
+    python -m benchmarks.bench_linked_lists
+"""
+import sys
+
+from benchmarks.common import best_time, report
+from linked_lists import LinkedList, DoubleLinkedList, UnrolledLinkedList, IndexedDeque, Node, DoubleNode
+from queue import LinkedListQueue
+from stack import LinkedListStack
+
+
+class DictNode(object):
+    """
+    The original Node: a __dict__ per instance and a
+    type-checking property setter for next_node
+    """
+    def __init__(self, element=None):
+        self._next_node = None
+        self.element = element
+
+    @property
+    def next_node(self):
+        return self._next_node
+
+    @next_node.setter
+    def next_node(self, next_node):
+        if next_node:
+            if isinstance(next_node, DictNode):
+                self._next_node = next_node
+            else:
+                raise Exception("next_node must be Node instance or None")
+        else:
+            self._next_node = None
+
+
+def node_bytes(node):
+    """
+    Size of a node including its instance __dict__, if any
+    """
+    size = sys.getsizeof(node)
+    if hasattr(node, '__dict__'):
+        size += sys.getsizeof(node.__dict__)
+    return size
+
+
+def link_dict_nodes(n):
+    last = DictNode()
+    for i in range(n):
+        node = DictNode(element=i)
+        last.next_node = node
+        last = node
+
+
+def link_slot_nodes(n):
+    last = Node()
+    for i in range(n):
+        node = Node(i)
+        last.next_node = node
+        last = node
+
+
+def fill(cls, n, **kwargs):
+    l = cls(**kwargs)
+    for i in range(n):
+        l.insert_last(i)
+
+
+def enqueue(n):
+    q = LinkedListQueue()
+    for i in range(n):
+        q.enqueue(i)
+
+
+def push(n):
+    s = LinkedListStack()
+    for i in range(n):
+        s.push(i)
+
+
+def iterate(l):
+    for _ in l:
+        pass
+
+
+def delete_all(l, order):
+    for i in order:
+        l.delete(i)
+
+
+def bench_delete(n=100000, scan_n=5000):
+    """
+    Delete every element of a list in random order. Unindexed
+    lists scan for each element, so they run at a smaller n.
+    """
+    import random
+    for cls in (LinkedList, DoubleLinkedList):
+        for indexed, size in ((False, scan_n), (True, n)):
+            order = list(range(size))
+            random.Random(0).shuffle(order)
+            l = cls(indexed=indexed)
+            for i in range(size):
+                l.insert_last(i)
+            report("{0}.delete indexed={1}".format(cls.__name__, indexed),
+                   size, best_time(delete_all, l, order, repeat=1))
+
+
+def random_access(l, indexes):
+    for i in indexes:
+        l[i]
+
+
+def bench_random_access(n=200000, lookups=100000):
+    """
+    O(1) indexing on IndexedDeque vs a python list and collections.deque,
+    whose indexing is O(n) away from the ends
+    """
+    from collections import deque
+    import random
+
+    rng = random.Random(0)
+    indexes = [rng.randrange(n) for _ in range(lookups)]
+    l = IndexedDeque()
+    l.insert_last_many(range(n))
+    report("IndexedDeque[i]", lookups, best_time(random_access, l, indexes))
+    report("list[i]", lookups, best_time(random_access, list(range(n)), indexes))
+    report("collections.deque[i]", lookups, best_time(random_access, deque(range(n)), indexes))
+
+
+def main(n=200000):
+    print("bytes per node")
+    print("  DictNode (before):   {0}".format(node_bytes(DictNode(1))))
+    print("  Node (slots):        {0}".format(node_bytes(Node(1))))
+    print("  DoubleNode (slots):  {0}".format(node_bytes(DoubleNode(1))))
+    print()
+
+    report("DictNode link (before)", n, best_time(link_dict_nodes, n))
+    report("Node link", n, best_time(link_slot_nodes, n))
+    report("LinkedList.insert_last debug=True", n,
+           best_time(lambda: fill(LinkedList, n, debug=True)))
+    report("LinkedList.insert_last", n,
+           best_time(lambda: fill(LinkedList, n)))
+    report("DoubleLinkedList.insert_last debug=True", n,
+           best_time(lambda: fill(DoubleLinkedList, n, debug=True)))
+    report("DoubleLinkedList.insert_last", n,
+           best_time(lambda: fill(DoubleLinkedList, n)))
+    report("UnrolledLinkedList.insert_last", n,
+           best_time(lambda: fill(UnrolledLinkedList, n)))
+    report("IndexedDeque.insert_last", n,
+           best_time(lambda: fill(IndexedDeque, n)))
+    report("LinkedListQueue.enqueue", n, best_time(enqueue, n))
+    report("LinkedListStack.push", n, best_time(push, n))
+    print()
+
+    for cls in (LinkedList, UnrolledLinkedList, IndexedDeque):
+        l = cls()
+        for i in range(n):
+            l.insert_last(i)
+        report("{0} iteration".format(cls.__name__), n, best_time(iterate, l))
+        report("{0}.search (miss)".format(cls.__name__), n, best_time(l.search, -1))
+    print()
+
+    bench_random_access()
+    print()
+    bench_delete()
+
+
+if __name__ == '__main__':
+    main()
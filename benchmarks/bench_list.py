@@ -0,0 +1,99 @@
+"""
+Benchmarks for the list implementations
+
+    python -m benchmarks.bench_list
+"""
+from benchmarks.common import best_time, report
+from linked_lists import LinkedList, DoubleLinkedList, UnrolledLinkedList
+from list import OrderedLinkedList, SkipListOrderedList
+
+
+def build(backend, n):
+    """
+    Build an ordered list of n ints. Adding in descending order
+    means every add inserts at the front, so the build is O(n).
+    """
+    l = OrderedLinkedList(int, backend=backend)
+    for i in range(n, 0, -1):
+        l.add(i)
+    return l
+
+
+def drain_last(l):
+    while not l.is_empty:
+        l.remove_last()
+
+
+def bench_drain_last(n=1000000, singly_n=10000):
+    """
+    Drain an ordered list from the tail. DoubleLinkedList and
+    UnrolledLinkedList are O(1) per remove_last; LinkedList is O(n),
+    so it runs at a smaller n.
+    """
+    for backend, size in ((LinkedList, singly_n),
+                          (DoubleLinkedList, n),
+                          (UnrolledLinkedList, n)):
+        l = build(backend, size)
+        report("remove_last drain ({0})".format(backend.__name__),
+               size, best_time(drain_last, l, repeat=1))
+
+
+def add_all(l, items):
+    for x in items:
+        l.add(x)
+
+
+def contains_all(l, items):
+    for x in items:
+        l.contains(x)
+
+
+def bench_add_contains(sizes=(10000, 100000, 1000000), linked_max=10000):
+    """
+    Add n random ints, then look each one up. OrderedLinkedList
+    is O(n) per add, so it only runs up to linked_max elements.
+    """
+    import random
+    for n in sizes:
+        rng = random.Random(n)
+        items = [rng.randrange(n) for _ in range(n)]
+        for cls in (OrderedLinkedList, SkipListOrderedList):
+            if cls is OrderedLinkedList and n > linked_max:
+                print("{0:<45} n={1:<10} skipped".format(cls.__name__ + ".add", n))
+                continue
+            l = cls(int)
+            report("{0}.add".format(cls.__name__), n,
+                   best_time(add_all, l, items, repeat=1))
+            report("{0}.contains".format(cls.__name__), n,
+                   best_time(contains_all, l, items, repeat=1))
+
+
+def bench_bulk_load(n=200000, add_n=5000):
+    """
+    Seed an ordered list from a snapshot: repeated add vs from_iterable,
+    then merge a sorted batch into the list with extend
+    """
+    import random
+    rng = random.Random(n)
+    items = [rng.randrange(n) for _ in range(n)]
+
+    report("OrderedLinkedList.add", add_n,
+           best_time(add_all, OrderedLinkedList(int), items[:add_n], repeat=1))
+    report("OrderedLinkedList.from_iterable", n,
+           best_time(OrderedLinkedList.from_iterable, int, items))
+    l = OrderedLinkedList.from_iterable(int, items)
+    batch = sorted(items[:n // 10])
+    report("OrderedLinkedList.extend presorted (n + batch)", n + len(batch),
+           best_time(l.extend, batch, True, repeat=1))
+
+
+def main():
+    bench_drain_last()
+    print()
+    bench_bulk_load()
+    print()
+    bench_add_contains()
+
+
+if __name__ == '__main__':
+    main()
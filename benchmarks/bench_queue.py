@@ -0,0 +1,315 @@
+"""
+Benchmarks for the queue implementations
+
+    python -m benchmarks.bench_queue
+"""
+import asyncio
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks.common import best_time, report, report_memory, traced_bytes
+from list import OrderedLinkedList
+from queue import CircularArrayQueue, PythonListQueue, LinkedListQueue, \
+    BlockingCircularArrayQueue, BlockingLinkedListQueue, AsyncCircularArrayQueue, \
+    SPSCCircularArrayQueue, PersistentQueue, HeapPriorityQueue, TypedCircularArrayQueue
+
+
+def fill_and_drain(q, n):
+    for i in range(n):
+        q.enqueue(i)
+    for i in range(n):
+        q.dequeue()
+
+
+def bench_unbounded(n=100000, list_n=100000):
+    """
+    Unbounded FIFO: enqueue n items then dequeue them all
+    """
+    report("CircularArrayQueue overflow=grow", n,
+           best_time(lambda: fill_and_drain(CircularArrayQueue(16, overflow=CircularArrayQueue.GROW), n)))
+    report("LinkedListQueue", n,
+           best_time(lambda: fill_and_drain(LinkedListQueue(), n)))
+    report("PythonListQueue", list_n,
+           best_time(lambda: fill_and_drain(PythonListQueue(), list_n)))
+
+
+def per_item(q, n, batch):
+    for start in range(0, n, batch):
+        for i in range(start, start + batch):
+            q.enqueue(i)
+        for i in range(batch):
+            q.dequeue()
+
+
+def batched(q, n, batch):
+    for start in range(0, n, batch):
+        q.enqueue_many(range(start, start + batch))
+        q.dequeue_many(batch)
+
+
+def bench_batches(n=512000, batch=512):
+    """
+    Move n items through each queue in chunks of batch,
+    one item at a time vs enqueue_many/dequeue_many
+    """
+    factories = (
+        ("CircularArrayQueue", lambda: CircularArrayQueue(batch)),
+        ("PythonListQueue", PythonListQueue),
+        ("LinkedListQueue", LinkedListQueue),
+    )
+    for name, factory in factories:
+        report("{0} per item".format(name), n, best_time(per_item, factory(), n, batch))
+        report("{0} batched".format(name), n, best_time(batched, factory(), n, batch))
+
+
+def producers_consumers(q, n, producers, consumers):
+    """
+    Move n items from producer threads to consumer threads through q
+    """
+    def produce(count):
+        for i in range(count):
+            q.put(i)
+
+    def consume(count):
+        for _ in range(count):
+            q.get()
+
+    threads = [threading.Thread(target=produce, args=(n // producers,))
+               for _ in range(producers)]
+    threads += [threading.Thread(target=consume, args=(n // consumers,))
+                for _ in range(consumers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def bench_threads(n=120000, size=1024):
+    """
+    Multi-producer/multi-consumer throughput of the blocking queues
+    """
+    for producers, consumers in ((1, 1), (2, 2), (4, 4)):
+        for name, factory in (("BlockingCircularArrayQueue", lambda: BlockingCircularArrayQueue(size)),
+                              ("BlockingLinkedListQueue", BlockingLinkedListQueue)):
+            report("{0} {1}p/{2}c".format(name, producers, consumers), n,
+                   best_time(lambda: producers_consumers(factory(), n, producers, consumers)))
+
+
+def async_producer_consumer(q, n, batch):
+    """
+    Move n items from a producer task to a consumer task through q
+    """
+    async def produce():
+        if batch:
+            for start in range(0, n, batch):
+                await q.enqueue_many(range(start, start + batch))
+        else:
+            for i in range(n):
+                await q.enqueue(i)
+
+    async def consume():
+        count = 0
+        while count < n:
+            if batch:
+                count += len(await q.dequeue_many(batch))
+            else:
+                await q.dequeue()
+                count += 1
+
+    async def run():
+        await asyncio.gather(produce(), consume())
+    asyncio.run(run())
+
+
+def async_stdlib_queue(n, size):
+    async def run():
+        q = asyncio.Queue(size)
+
+        async def produce():
+            for i in range(n):
+                await q.put(i)
+
+        async def consume():
+            for _ in range(n):
+                await q.get()
+        await asyncio.gather(produce(), consume())
+    asyncio.run(run())
+
+
+def bench_async(n=200000, size=1024, batch=512):
+    """
+    Producer/consumer throughput on one event loop
+    """
+    report("asyncio.Queue", n, best_time(async_stdlib_queue, n, size))
+    report("AsyncCircularArrayQueue per item", n,
+           best_time(lambda: async_producer_consumer(AsyncCircularArrayQueue(size), n, 0)))
+    report("AsyncCircularArrayQueue batched", n,
+           best_time(lambda: async_producer_consumer(AsyncCircularArrayQueue(size), n, batch)))
+
+
+def stress_spsc(n=10000000, size=4096, batch=256):
+    """
+    Stress test: move n integers through an SPSCCircularArrayQueue
+    between one producer and one consumer thread, in batches, and
+    check that none were lost, duplicated or reordered
+    """
+    q = SPSCCircularArrayQueue(size)
+    errors = []
+
+    def produce():
+        i = 0
+        while i < n:
+            k = min(batch, n - i, size - q.size())
+            if k <= 0:
+                time.sleep(0)
+                continue
+            q.enqueue_many(range(i, i + k))
+            i += k
+
+    def consume():
+        expected = 0
+        while expected < n:
+            items = q.dequeue_many(batch)
+            if not items:
+                time.sleep(0)
+                continue
+            if items != list(range(expected, expected + len(items))):
+                errors.append(expected)
+                return
+            expected += len(items)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=produce), threading.Thread(target=consume)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    if errors or not q.is_empty():
+        raise AssertionError("SPSC stress test failed at item {0}".format(errors))
+    report("SPSCCircularArrayQueue stress (verified)", n, elapsed)
+
+
+def bench_spsc(n=200000, size=1024):
+    """
+    One producer and one consumer thread, per item:
+    lock-free SPSC ring vs the locking blocking queue
+    """
+    def spsc():
+        q = SPSCCircularArrayQueue(size)
+
+        def produce():
+            i = 0
+            while i < n:
+                if q.is_full():
+                    time.sleep(0)
+                else:
+                    q.enqueue(i)
+                    i += 1
+
+        def consume():
+            count = 0
+            while count < n:
+                if q.is_empty():
+                    time.sleep(0)
+                else:
+                    q.dequeue()
+                    count += 1
+
+        threads = [threading.Thread(target=produce), threading.Thread(target=consume)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    report("SPSCCircularArrayQueue 1p/1c", n, best_time(spsc))
+    report("BlockingCircularArrayQueue 1p/1c", n,
+           best_time(lambda: producers_consumers(BlockingCircularArrayQueue(size), n, 1, 1)))
+
+
+def bench_persistent(n=200000, payload=b'x'*100, batch=512):
+    """
+    PersistentQueue throughput with everything in memory
+    vs a small memory budget that spills to disk
+    """
+    for name, budget in (("in memory", 1 << 30), ("spilling", 64 * 1024)):
+        def run():
+            with tempfile.TemporaryDirectory() as directory:
+                q = PersistentQueue(directory, max_memory_bytes=budget, segment_size=4 << 20)
+                for start in range(0, n, batch):
+                    q.enqueue_many([payload] * batch)
+                while not q.is_empty():
+                    q.dequeue()
+                q.ack()
+                q.close()
+        report("PersistentQueue {0}".format(name), n, best_time(run, repeat=1))
+
+
+def bench_priority(n=100000, list_n=5000):
+    """
+    Scheduler workload: enqueue n random priorities then dequeue them
+    all, heap vs keeping an OrderedLinkedList
+    """
+    rng = random.Random(0)
+    priorities = [rng.random() for _ in range(n)]
+
+    def heap(d):
+        q = HeapPriorityQueue(d=d)
+        for p in priorities:
+            q.enqueue(p)
+        while not q.is_empty():
+            q.dequeue()
+
+    def ordered_list():
+        q = OrderedLinkedList(float)
+        for p in priorities[:list_n]:
+            q.add(p)
+        while q:
+            q.remove_first()
+
+    for d in (2, 4, 8):
+        report("HeapPriorityQueue d={0}".format(d), n, best_time(heap, d))
+    report("OrderedLinkedList", list_n, best_time(ordered_list))
+
+
+def fill_queue(q, n):
+    for i in range(n):
+        q.enqueue(i * 0.5)
+    return q
+
+
+def bench_typed(n=10000000):
+    """
+    Memory for a full ring of n distinct floats, boxed vs array-backed
+    """
+    for name, factory in (("CircularArrayQueue", lambda: CircularArrayQueue(n)),
+                          ("TypedCircularArrayQueue('d')", lambda: TypedCircularArrayQueue('d', n))):
+        q, nbytes = traced_bytes(lambda: fill_queue(factory(), n))
+        report_memory(name, n, nbytes)
+        del q
+
+
+def main():
+    bench_unbounded()
+    print()
+    bench_batches()
+    print()
+    bench_priority()
+    print()
+    bench_typed()
+    print()
+    bench_threads()
+    print()
+    bench_async()
+    print()
+    bench_persistent()
+    print()
+    bench_spsc()
+    stress_spsc()
+
+
+if __name__ == '__main__':
+    main()
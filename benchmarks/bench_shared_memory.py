@@ -0,0 +1,99 @@
+"""
+Benchmark cross-process transfer through SharedMemoryCircularArrayQueue
+vs pickling through multiprocessing.Queue
+
+    python -m benchmarks.bench_shared_memory
+
+Note: run from the repository root, the local queue.py shadows the
+standard library queue module that multiprocessing.Queue imports.
+In that case the pickling baseline falls back to multiprocessing.Pipe,
+which is the transport multiprocessing.Queue uses underneath.
+"""
+import multiprocessing
+import time
+
+from benchmarks.common import report
+from queue import SharedMemoryCircularArrayQueue, QueueException
+
+RECORD_FORMAT = '<qqd'
+
+
+def shared_memory_producer(q, count, batch):
+    i = 0
+    while i < count:
+        k = min(batch, count - i)
+        try:
+            q.enqueue_many([(i + j, j, 0.5) for j in range(k)])
+            i += k
+        except QueueException:
+            time.sleep(0)
+    q.close()
+
+
+def pickling_producer(conn_or_queue, count, batch):
+    send = getattr(conn_or_queue, 'put', None) or conn_or_queue.send
+    for i in range(0, count, batch):
+        send([(i + j, j, 0.5) for j in range(min(batch, count - i))])
+
+
+def run_shared_memory(n, producers, batch, size=4096):
+    q = SharedMemoryCircularArrayQueue(size, record_format=RECORD_FORMAT)
+    try:
+        procs = [multiprocessing.Process(target=shared_memory_producer,
+                                         args=(q, n // producers, batch))
+                 for _ in range(producers)]
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        got = 0
+        while got < n:
+            got += len(q.dequeue_many(batch))
+        elapsed = time.perf_counter() - start
+        for p in procs:
+            p.join()
+    finally:
+        q.unlink()
+    return elapsed
+
+
+def run_pickling(n, producers, batch):
+    try:
+        channel = multiprocessing.Queue()
+        receivers = [channel] * producers
+        senders = [channel] * producers
+        name = "multiprocessing.Queue"
+    except ImportError:
+        pipes = [multiprocessing.Pipe(duplex=False) for _ in range(producers)]
+        receivers = [r for r, _ in pipes]
+        senders = [s for _, s in pipes]
+        name = "multiprocessing.Pipe"
+
+    procs = [multiprocessing.Process(target=pickling_producer, args=(s, n // producers, batch))
+             for s in senders]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    got = 0
+    if receivers[0] is receivers[-1] and hasattr(receivers[0], 'get'):
+        while got < n:
+            got += len(receivers[0].get())
+    else:
+        for r in receivers:
+            for _ in range(0, n // producers, batch):
+                got += len(r.recv())
+    elapsed = time.perf_counter() - start
+    for p in procs:
+        p.join()
+    return name, elapsed
+
+
+def main(n=400000, batch=64):
+    for producers in (1, 2, 4):
+        report("SharedMemoryCircularArrayQueue {0} producers".format(producers), n,
+               run_shared_memory(n, producers, batch))
+        name, elapsed = run_pickling(n, producers, batch)
+        report("{0} {1} producers".format(name, producers), n, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""
+Benchmarks for the O(n log n) sorting algorithms
+
+    python -m benchmarks.bench_sorts
+
+On a machine with fewer cores than workers the parallel sort cannot
+speed up; the scaling table then shows the process and copy overhead.
+"""
+from operator import itemgetter
+import os
+import random
+import tracemalloc
+
+from array import array
+
+from benchmarks.common import best_time, report
+from sorts.sorting_algorithms import merge_sort, quick_sort, parallel_merge_sort, bottom_up_merge_sort, \
+    sort, numpy, counting_sort, lsd_radix_sort, msd_radix_sort
+
+
+def distributions(n, seed=0):
+    """
+    Return name -> list of n elements for the usual input shapes
+    """
+    rng = random.Random(seed)
+    return {
+        "random": [rng.random() for _ in range(n)],
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "few distinct": [rng.randrange(4) for _ in range(n)],
+    }
+
+
+def sort_copy(func, data):
+    func(list(data))
+
+
+def bench_quick_vs_merge(n=100000):
+    """
+    quick_sort vs merge_sort (and the builtin as a reference) per input shape
+    """
+    for name, data in distributions(n).items():
+        report("quick_sort {0}".format(name), n, best_time(sort_copy, quick_sort, data))
+        report("merge_sort {0}".format(name), n, best_time(sort_copy, merge_sort, data))
+        report("list.sort {0}".format(name), n, best_time(sort_copy, list.sort, data))
+
+
+def bench_parallel(n=1000000, max_workers=None):
+    """
+    parallel_merge_sort scaling from 1 to max_workers processes
+    (default: cpu count, at least 4), for floats through shared memory
+    and for strings through pickling
+    """
+    if max_workers is None:
+        max_workers = max(os.cpu_count() or 1, 4)
+    rng = random.Random(1)
+    inputs = (
+        ("floats", [rng.random() for _ in range(n)]),
+        ("strings", [str(rng.random()) for _ in range(n // 4)]),
+    )
+    for name, data in inputs:
+        workers = 1
+        while workers <= max_workers:
+            report("parallel_merge_sort {0} workers={1}".format(name, workers), len(data),
+                   best_time(lambda: parallel_merge_sort(list(data), workers, threshold=0), repeat=1))
+            workers *= 2
+
+
+def peak_bytes(func, data):
+    """
+    Return the peak memory func allocates while sorting data
+    """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        func(data)
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def bench_bottom_up(n=100000):
+    """
+    Recursive merge_sort vs bottom_up_merge_sort: time and peak memory
+    """
+    for name, data in distributions(n).items():
+        for func in (merge_sort, bottom_up_merge_sort):
+            report("{0} {1}".format(func.__name__, name), n, best_time(sort_copy, func, data))
+            print("    peak allocated: {0:.1f} MiB".format(peak_bytes(func, list(data)) / 2**20))
+
+
+class ByAge(object):
+    """
+    Wrapper giving records a rich comparison, the way callers
+    had to sort by a field before key= existed
+    """
+    __slots__ = ('record',)
+
+    def __init__(self, record):
+        self.record = record
+
+    def __lt__(self, other):
+        return self.record['age'] < other.record['age']
+
+    def __gt__(self, other):
+        return self.record['age'] > other.record['age']
+
+
+def sort_wrapped(func, records):
+    wrapped = [ByAge(r) for r in records]
+    func(wrapped)
+    return [w.record for w in wrapped]
+
+
+def bench_key(n=1000000):
+    """
+    Sort n dict records by one field: wrapper objects vs key=
+    """
+    rng = random.Random(2)
+    records = [{'id': i, 'age': rng.randrange(100), 'score': rng.random()} for i in range(n)]
+    for func in (merge_sort, bottom_up_merge_sort, quick_sort):
+        report("{0} wrapper __lt__".format(func.__name__), n,
+               best_time(sort_wrapped, func, records, repeat=1))
+        report("{0} key=itemgetter('age')".format(func.__name__), n,
+               best_time(lambda: func(list(records), key=itemgetter('age')), repeat=1))
+    report("list.sort key=itemgetter('age')", n,
+           best_time(lambda: list(records).sort(key=itemgetter('age')), repeat=1))
+
+
+def bench_numpy(n=1000000, python_n=100000):
+    """
+    sort with the python and numpy backends on numeric lists and arrays
+    """
+    if numpy is None:
+        print("numpy is not installed; skipping the numpy backend")
+        return
+
+    rng = random.Random(3)
+    ints = [rng.randrange(-2**40, 2**40) for _ in range(n)]
+    floats = [rng.random() for _ in range(n)]
+    for algorithm in ('quick', 'merge'):
+        report("sort {0} python list of ints".format(algorithm), python_n,
+               best_time(lambda: sort(ints[:python_n], algorithm), repeat=1))
+        report("sort {0} numpy list of ints".format(algorithm), n,
+               best_time(lambda: sort(list(ints), algorithm, backend='numpy')))
+        report("sort {0} numpy array('q')".format(algorithm), n,
+               best_time(lambda: sort(array('q', ints), algorithm, backend='numpy')))
+        report("sort {0} numpy list of floats".format(algorithm), n,
+               best_time(lambda: sort(list(floats), algorithm, backend='numpy')))
+        report("sort {0} numpy ndarray float64".format(algorithm), n,
+               best_time(lambda: sort(numpy.array(floats), algorithm, backend='numpy')))
+
+
+def bench_radix(n=1000000, merge_n=200000):
+    """
+    Distribution sorts vs merge_sort and sorted(): 32-bit ids,
+    ids in a small range, and fixed-width and variable-length bytes keys
+    """
+    rng = random.Random(4)
+    inputs = (
+        ("32-bit ids", [rng.getrandbits(32) for _ in range(n)], (
+            ("lsd_radix_sort", lsd_radix_sort),
+            ("lsd_radix_sort radix_bits=16", lambda data: lsd_radix_sort(data, radix_bits=16)),
+            ("lsd_radix_sort array('q')", lambda data: lsd_radix_sort(array('q', data))),
+        )),
+        ("ids in 0..1000", [rng.randrange(1000) for _ in range(n)], (
+            ("counting_sort", counting_sort),
+            ("lsd_radix_sort", lsd_radix_sort),
+        )),
+        ("8-byte keys", [rng.getrandbits(64).to_bytes(8, 'big') for _ in range(n // 4)], (
+            ("msd_radix_sort", msd_radix_sort),
+        )),
+        ("words", [bytes(rng.randrange(97, 123) for _ in range(rng.randrange(1, 12)))
+                   for _ in range(n // 4)], (
+            ("msd_radix_sort", msd_radix_sort),
+        )),
+    )
+    for name, data, funcs in inputs:
+        for label, func in funcs:
+            report("{0} {1}".format(label, name), len(data),
+                   best_time(sort_copy, func, data, repeat=1))
+        size = min(merge_n, len(data))
+        report("merge_sort {0}".format(name), size,
+               best_time(sort_copy, merge_sort, data[:size], repeat=1))
+        report("sorted() {0}".format(name), len(data), best_time(sorted, data, repeat=1))
+
+
+def main():
+    bench_quick_vs_merge()
+    print()
+    bench_bottom_up()
+    print()
+    bench_key()
+    print()
+    bench_numpy()
+    print()
+    bench_radix()
+    print()
+    bench_parallel()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Memory profile of the stack implementations over burst push/pop cycles
+
+    python -m benchmarks.bench_stack
+
+Each stack runs in its own process so resident set sizes do not mix.
+traced is the memory python has allocated (tracemalloc); rss is what the
+process holds from the OS (/proc/self/statm, Linux only). Freed memory
+can stay in the C allocator, so rss may stay high after python has
+released it.
+"""
+import copy
+import multiprocessing
+import os
+import time
+import tracemalloc
+
+from benchmarks.common import best_time, report, report_memory, traced_bytes
+from linked_lists import UnrolledLinkedList
+from stack import ArrayStack, ChunkedArrayStack, LinkedListStack, TypedArrayStack, PersistentStack
+
+
+def rss_mb():
+    """
+    Return the resident set size in MiB, or None if unavailable
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+
+def burst_cycles(factory, n, cycles, depth, conn):
+    """
+    Push n frames then pop back down to depth, cycles times,
+    and send back timings and memory after each phase.
+    Every push is the same frame object, so only the stack's
+    own storage is measured.
+    """
+    frame = ('frame', 0)
+    tracemalloc.start()
+    stack = factory()
+    lines = []
+    for cycle in range(cycles):
+        start = time.perf_counter()
+        for _ in range(n):
+            stack.push(frame)
+        push_seconds = time.perf_counter() - start
+        pushed = (tracemalloc.get_traced_memory()[0], rss_mb())
+
+        start = time.perf_counter()
+        for _ in range(stack.size() - depth):
+            stack.pop()
+        pop_seconds = time.perf_counter() - start
+        popped = (tracemalloc.get_traced_memory()[0], rss_mb())
+        lines.append((cycle, push_seconds, pop_seconds, pushed, popped))
+    peak = tracemalloc.get_traced_memory()[1]
+    conn.send((lines, peak))
+
+
+def format_memory(traced, rss):
+    rss = "n/a" if rss is None else "{0:.1f} MiB".format(rss)
+    return "traced {0:>7.1f} MiB rss {1:>10}".format(traced / 2**20, rss)
+
+
+def fill_stack(stack, n):
+    for i in range(n):
+        stack.push(i * 0.5)
+    return stack
+
+
+def bench_typed(n=10000000):
+    """
+    Memory for n distinct floats: boxed in ArrayStack vs unboxed in TypedArrayStack
+    """
+    for name, factory in (("ArrayStack", ArrayStack),
+                          ("TypedArrayStack('d')", lambda: TypedArrayStack('d'))):
+        stack, nbytes = traced_bytes(lambda: fill_stack(factory(), n))
+        report_memory(name, n, nbytes)
+        del stack
+
+    stack = fill_stack(TypedArrayStack('d'), n)
+    with stack.snapshot() as view:
+        report_memory("TypedArrayStack('d') snapshot", n, view.nbytes)
+
+
+def per_item(stack, n, batch):
+    for start in range(0, n, batch):
+        for i in range(start, start + batch):
+            stack.push(i)
+        for i in range(batch):
+            stack.pop()
+
+
+def batched(stack, n, batch):
+    for start in range(0, n, batch):
+        stack.push_many(range(start, start + batch))
+        stack.pop_many(batch)
+
+
+def bench_batches(n=512000, batch=512):
+    """
+    Push and pop n frames in chunks of batch,
+    one item at a time vs push_many/pop_many
+    """
+    factories = (
+        ("ArrayStack", ArrayStack),
+        ("LinkedListStack", LinkedListStack),
+        ("LinkedListStack unrolled", lambda: LinkedListStack(backend=UnrolledLinkedList)),
+        ("ChunkedArrayStack", ChunkedArrayStack),
+    )
+    for name, factory in factories:
+        report("{0} push/pop".format(name), n, best_time(per_item, factory(), n, batch))
+        report("{0} push_many/pop_many".format(name), n, best_time(batched, factory(), n, batch))
+
+
+def snapshot_copies(stack, n):
+    history = []
+    for i in range(n):
+        stack.push(i)
+        history.append(copy.copy(stack._array))
+    return history
+
+
+def snapshot_persistent(stack, n):
+    history = []
+    for i in range(n):
+        stack = stack.push(i)
+        history.append(stack)
+    return history
+
+
+def bench_snapshots(n=5000):
+    """
+    Push n frames keeping a snapshot after every push:
+    copying ArrayStack's list vs keeping PersistentStack versions
+    """
+    report("ArrayStack push + list copy", n, best_time(snapshot_copies, ArrayStack(), n))
+    report("PersistentStack push (snapshot is free)", n,
+           best_time(snapshot_persistent, PersistentStack(), n))
+
+
+def main(n=2000000, cycles=3, depth=1000):
+    factories = (
+        ("ArrayStack", ArrayStack),
+        ("ChunkedArrayStack", ChunkedArrayStack),
+        ("LinkedListStack", LinkedListStack),
+    )
+    for name, factory in factories:
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        proc = multiprocessing.Process(target=burst_cycles,
+                                       args=(factory, n, cycles, depth, sender))
+        proc.start()
+        lines, peak = receiver.recv()
+        proc.join()
+
+        for cycle, push_seconds, pop_seconds, pushed, popped in lines:
+            report("{0} push (cycle {1})".format(name, cycle), n, push_seconds)
+            report("{0} pop  (cycle {1})".format(name, cycle), n - depth, pop_seconds)
+            print("    after push: {0}".format(format_memory(*pushed)))
+            print("    after pop:  {0}".format(format_memory(*popped)))
+        print("    peak traced: {0:.1f} MiB".format(peak / 2**20))
+        print()
+
+    bench_typed()
+    print()
+    bench_batches()
+    print()
+    bench_snapshots()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+import time
+import tracemalloc
+
+
+def best_time(func, *args, repeat=3):
+    """
+    Run func(*args) repeat times and return the fastest wall time
+    :param func: callable to time
+    :param repeat: number of runs
+    :return: best time in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def report(name, n, seconds):
+    """
+    Print one line of benchmark output
+    :param name: name of the benchmark case
+    :param n: number of operations performed
+    :param seconds: time taken for n operations
+    """
+    rate = n / seconds if seconds else float('inf')
+    print("{0:<45} n={1:<10} {2:>10.4f}s {3:>14,.0f} ops/sec"
+          .format(name, n, seconds, rate))
+
+
+def traced_bytes(func, *args):
+    """
+    Run func(*args) and measure the python memory it leaves allocated
+    :param func: callable building a data structure
+    :return: (result of func, bytes still allocated)
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func(*args)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def report_memory(name, n, nbytes):
+    """
+    Print one line of memory benchmark output
+    :param name: name of the benchmark case
+    :param n: number of elements stored
+    :param nbytes: bytes used for n elements
+    """
+    print("{0:<45} n={1:<10} {2:>10.1f} MiB {3:>8.1f} bytes/element"
+          .format(name, n, nbytes / 2**20, nbytes / n))
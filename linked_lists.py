@@ -1,85 +1,260 @@
 """
 Implement linked list data structures
 """
+from bisect import bisect_right
 
 
 class Node(object):
     """
     Represents a node in a linked list
     Each node has a next_node link
+
+    Nodes use __slots__ and plain attributes so that linking
+    is a simple store. Use CheckedNode for type-checked links.
+    """
+    __slots__ = ('element', 'next_node')
+
+    def __init__(self, element=None, next_node=None):
+        self.element = element
+        self.next_node = next_node
+
+    def __str__(self):
+        return "<Node object: {0}>".format(self.element, self.next_node)
+
+
+class DoubleNode(Node):
+    """
+    Represents a doubly-linked node in a linked list
+    Each node has a previous and next node link
     """
-    def __init__(self, element=None):
-        self._next_node = None
+    __slots__ = ('previous_node',)
+
+    def __init__(self, element=None, next_node=None, previous_node=None):
         self.element = element
+        self.next_node = next_node
+        self.previous_node = previous_node
+
+    def __str__(self):
+        return "<Node object: {0}>".format(self.element, self.previous_node)
+
+
+# raw slot descriptors, used by the checked nodes to store their links
+_next_node_slot = Node.next_node
+_previous_node_slot = DoubleNode.previous_node
+
+
+def _check_link(link, name):
+    """
+    Validate a node link for the checked (debug) nodes
+    :param link: Node or None
+    :param name: name of the link attribute, for the error message
+    :return: link
+    :raise: Exception if link is not a Node or None
+    """
+    if link is not None and not isinstance(link, Node):
+        # bad case. we only accept Nodes and Nones
+        raise Exception("{0} must be Node instance or None".format(name))
+    return link
+
+
+class CheckedNode(Node):
+    """
+    Node that type checks its next_node link on every assignment.
+    Used by the linked lists in debug mode.
+    """
+    __slots__ = ()
 
     @property
     def next_node(self):
         """
         Next node connected to this node
         """
-        return self._next_node
+        return _next_node_slot.__get__(self)
 
     @next_node.setter
     def next_node(self, next_node):
-        if next_node:
-            if isinstance(next_node, Node):
-                self._next_node = next_node
-            else:
-                # bad case. we only accept Nodes and Nones
-                raise Exception("next_node must be Node instance or None")
-        else:
-            self._next_node = None
-
-    def __str__(self):
-        return "<Node object: {0}>".format(self.element, self.next_node)
+        _next_node_slot.__set__(self, _check_link(next_node, "next_node") or None)
 
 
-class DoubleNode(Node):
+class CheckedDoubleNode(CheckedNode, DoubleNode):
     """
-    Represents a doubly-linked node in a linked list
-    Each node has a previous and next node link
+    DoubleNode that type checks its previous_node and next_node
+    links on every assignment. Used by the linked lists in debug mode.
     """
-    def __init__(self, element=None):
-        self._prev_node = None
-        super(DoubleNode, self).__init__(element)
+    __slots__ = ()
 
     @property
     def previous_node(self):
         """
         Previous node connected to this node
         """
-        return self._prev_node
+        return _previous_node_slot.__get__(self)
 
     @previous_node.setter
     def previous_node(self, prev_node):
-        if prev_node:
-            if isinstance(prev_node, Node):
-                self._prev_node = prev_node
-            else:
-                # bad case. we only accept Nodes and Nones
-                raise Exception("previous_node must be Node instance or None")
-        else:
-            self._prev_node = None
+        _previous_node_slot.__set__(self, _check_link(prev_node, "previous_node") or None)
+
+
+class BlockNode(object):
+    """
+    Represents a block in an unrolled linked list
+    Each block holds a python list of up to block_size elements
+    and has a previous and next block link
+    """
+    __slots__ = ('elements', 'next_node', 'previous_node')
+
+    def __init__(self, elements=None, next_node=None, previous_node=None):
+        self.elements = elements if elements is not None else []
+        self.next_node = next_node
+        self.previous_node = previous_node
 
     def __str__(self):
-        return "<Node object: {0}>".format(self.element, self.previous_node)
+        return "<BlockNode object: {0}>".format(self.elements)
+
+
+class SkipNode(object):
+    """
+    Represents a node in a skip list
+    Each node has one next node link per level it belongs to
+    """
+    __slots__ = ('element', 'next_nodes')
+
+    def __init__(self, element=None, level=1):
+        self.element = element
+        self.next_nodes = [None] * level
+
+    def __str__(self):
+        return "<SkipNode object: {0}>".format(self.element)
+
+
+class NodeIndex(object):
+    """
+    Maps each hashable element of a linked list to the node(s) holding it,
+    so a linked list can find an element without scanning.
+    The nodes for an element are kept in list order, so the Nth
+    occurrence of a duplicated element is found without scanning too.
+    Unhashable elements are counted but not indexed; while any are
+    in the list, lookups return None and the list falls back to scanning.
+    """
+    __slots__ = ('_nodes', 'unindexed')
+
+    def __init__(self):
+        self._nodes = {}
+        self.unindexed = 0
+
+    def lookup(self, obj):
+        """
+        Find the nodes holding obj
+        :param obj: element to look up
+        :return: list of nodes in list order,
+        or None if the list must be scanned instead
+        """
+        if self.unindexed:
+            return None
+        try:
+            return self._nodes.get(obj, ())
+        except TypeError:
+            # obj is unhashable
+            return None
+
+    def _nodes_for(self, node):
+        """
+        Return the node list for node's element, creating it if needed
+        :return: list of nodes, or None if the element is unhashable
+        """
+        try:
+            return self._nodes.setdefault(node.element, [])
+        except TypeError:
+            self.unindexed += 1
+            return None
+
+    def add(self, node):
+        """
+        Index a node that was linked in after every node with an equal element
+        """
+        nodes = self._nodes_for(node)
+        if nodes is not None:
+            nodes.append(node)
+
+    def add_first(self, node):
+        """
+        Index a node that was linked in at the front of the list
+        """
+        nodes = self._nodes_for(node)
+        if nodes is not None:
+            nodes.insert(0, node)
+
+    def add_after(self, node, prev_node):
+        """
+        Index a node that was linked in right after prev_node.
+        Unless prev_node is the last node with an equal element, this
+        walks forward from node to the next equal element to find its
+        place, so it costs O(distance to that element).
+        """
+        nodes = self._nodes_for(node)
+        if nodes is None:
+            return
+        if not nodes or nodes[-1] is prev_node:
+            nodes.append(node)
+            return
+        element = node.element
+        if prev_node.element == element:
+            # nodes do not define __eq__, so index matches by identity
+            nodes.insert(nodes.index(prev_node) + 1, node)
+            return
+        n = node.next_node
+        while n is not None and not n.element == element:
+            n = n.next_node
+        if n is None:
+            nodes.append(node)
+        else:
+            nodes.insert(nodes.index(n), node)
+
+    def remove(self, node):
+        """
+        Drop a node that was unlinked from the list
+        """
+        try:
+            nodes = self._nodes[node.element]
+        except TypeError:
+            self.unindexed -= 1
+            return
+        if len(nodes) == 1:
+            del self._nodes[node.element]
+        elif nodes[-1] is node:
+            nodes.pop()
+        else:
+            # nodes do not define __eq__, so this matches by identity
+            nodes.remove(node)
 
 
 class LinkedList(object):
     """
     Implements the LinkedList api to store objects in a linked list.
     Our linked list allows addition/removal of objects to the list.
+
+    An indexed LinkedList keeps a NodeIndex and each node's previous
+    node, so search, delete, delete_last and insert_after (any occurrence)
+    are O(1) on average for hashable elements, at the cost of extra
+    memory per element. With k duplicates of an element, deleting one
+    or inserting one mid-list also shifts the index's list of k nodes.
     """
-    def __init__(self):
+    def __init__(self, debug=False, indexed=False):
         """
         --first: pointer to first Node
         --len: number of elements in list
         --last: pointer to last Node
+        :param debug: if True, use CheckedNode to type check node links
+        :param indexed: if True, maintain an element index for fast lookups
         :return:
         """
         self.first = None
         self.len = 0
         self.last = None
+        self._node_class = CheckedNode if debug else Node
+        # element -> nodes, and node -> previous node (indexed mode only)
+        self._index = NodeIndex() if indexed else None
+        self._prev = {} if indexed else None
 
     def __iter__(self):
         """
@@ -106,17 +281,20 @@ class LinkedList(object):
         :param: python object to insert
         :return:
         """
-        node = Node(element=obj)
         old_first = self.first
+        node = self._node_class(obj, old_first)
         self.first = node
 
-        if old_first:
-            node.next_node = old_first
-        else:
+        if old_first is None:
             # very first entry
-            self.first = node
             self.last = node
 
+        if self._index is not None:
+            self._index.add_first(node)
+            self._prev[node] = None
+            if old_first:
+                self._prev[old_first] = node
+
         self.len += 1
 
     def insert_last(self, obj):
@@ -125,7 +303,7 @@ class LinkedList(object):
         :param obj: a python object
         :return:
         """
-        node = Node(element=obj)
+        node = self._node_class(obj)
         old_last = self.last
         self.last = node
 
@@ -136,23 +314,145 @@ class LinkedList(object):
             self.last = node
             self.first = node
 
+        if self._index is not None:
+            self._index.add(node)
+            self._prev[node] = old_last
+
         self.len += 1
 
-    def _find_node(self, start_node, obj):
+    def insert_last_many(self, objs):
+        """
+        Insert each obj at the end of the linked list, in order.
+        The new nodes are chained together first, then spliced on once.
+        :param objs: iterable of python objects
+        :return:
+        """
+        if self._index is not None:
+            for obj in objs:
+                self.insert_last(obj)
+            return
+
+        node_class = self._node_class
+        first = last = None
+        count = 0
+        for obj in objs:
+            node = node_class(obj)
+            if last is None:
+                first = node
+            else:
+                last.next_node = node
+            last = node
+            count += 1
+
+        if first is None:
+            return
+
+        if self.last:
+            self.last.next_node = first
+        else:
+            self.first = first
+        self.last = last
+        self.len += count
+
+    def insert_first_many(self, objs):
+        """
+        Insert each obj at the beginning of the linked list, in order,
+        so the last obj becomes first (like repeated insert_first).
+        The new nodes are chained together first, then spliced on once.
+        :param objs: iterable of python objects
+        :return:
+        """
+        if self._index is not None:
+            for obj in objs:
+                self.insert_first(obj)
+            return
+
+        node_class = self._node_class
+        first = last = None
+        count = 0
+        for obj in objs:
+            first = node_class(obj, first)
+            if last is None:
+                last = first
+            count += 1
+
+        if first is None:
+            return
+
+        last.next_node = self.first
+        if self.first is None:
+            self.last = last
+        self.first = first
+        self.len += count
+
+    def peek_first(self):
+        """
+        Return the first element of the list without removing it
+        :return: first object
+        :raise: Exception if list is empty
+        """
+        if self.first is None:
+            raise Exception("Cannot peek into empty list")
+        return self.first.element
+
+    def peek_last(self):
+        """
+        Return the last element of the list without removing it
+        :return: last object
+        :raise: Exception if list is empty
+        """
+        if self.last is None:
+            raise Exception("Cannot peek into empty list")
+        return self.last.element
+
+    def insert_ordered(self, obj):
+        """
+        Insert obj before the first element that is greater than obj.
+        Used to keep the list in order; equal elements keep insertion order.
+        :param obj: an order-comparable python object
+        :return:
+        """
+        # loop until we hit a bigger item then insert
+        prev_node = None
+        node = self.first
+        while node:
+            if node.element > obj:
+                break
+            prev_node = node
+            node = node.next_node
+
+        if prev_node is None:
+            # first item was greater than obj (or list is empty)
+            self.insert_first(obj)
+        else:
+            self.insert_after_node(prev_node, obj)
+
+    def _locate(self, obj, occurrence=1):
         """
-        Find the node in the linked list
+        Find the Nth occurrence of obj in the linked list
+        Uses the index when possible, else scans from the first node
         :param obj: element of the node to find
-        :return: node if it exists, else None
+        :param occurrence: occurrence of obj to find (1 is the first)
+        :return: (previous node, node); node is None if not found
         """
-        n = start_node
-        found = None
+        if self._index is not None:
+            nodes = self._index.lookup(obj)
+            if nodes is not None:
+                if len(nodes) < occurrence:
+                    return None, None
+                node = nodes[max(occurrence, 1) - 1]
+                return self._prev[node], node
+
+        prev_node = None
+        n = self.first
         while n:
             if n.element == obj:
-                found = n
-                break
-            else:
-                n = n.next_node
-        return found
+                occurrence -= 1
+                if occurrence <= 0:
+                    return prev_node, n
+            prev_node = n
+            n = n.next_node
+        return None, None
 
     def insert_after_node(self, node, new_obj):
         """
@@ -161,14 +461,19 @@ class LinkedList(object):
         :param new_obj: new element to add
         :return:
         """
-        new_node = Node(element=new_obj)
-        new_node.next_node = node.next_node
+        new_node = self._node_class(new_obj, node.next_node)
         node.next_node = new_node
 
         # move last pointer if at the end
         if new_node.next_node is None:
             self.last = new_node
 
+        if self._index is not None:
+            self._index.add_after(new_node, node)
+            self._prev[new_node] = node
+            if new_node.next_node:
+                self._prev[new_node.next_node] = new_node
+
         self.len += 1
 
         return
@@ -184,26 +489,40 @@ class LinkedList(object):
         :raise: Exception if obj is not found
         """
         # find our node (1st, second, whatever)
-        start_node = self.first
-        current_node = None
-        for i in range(0, occurrence):
-            current_node = self._find_node(start_node, obj)
-            start_node = current_node
+        prev_node, current_node = self._locate(obj, occurrence)
 
         # insert new_obj
         if current_node:
-            new_node = Node(element=new_obj)
-            new_node.next_node = current_node.next_node
-            current_node.next_node = new_node
-
-            # move last pointer if at the end
-            if new_node.next_node is None:
-                self.last = new_node
-
-            self.len += 1
+            self.insert_after_node(current_node, new_obj)
         else:
             raise Exception("Cannot insert new_obj. No node found for obj.")
 
+    def _unlink(self, prev_node, node):
+        """
+        Unlink node, whose previous node is prev_node, from the list
+        :return: element of the unlinked node
+        """
+        next_node = node.next_node
+        if prev_node is None:
+            # first element of list
+            self.first = next_node
+        else:
+            prev_node.next_node = next_node
+
+        # last element of list
+        if next_node is None:
+            self.last = prev_node
+
+        if self._index is not None:
+            self._index.remove(node)
+            del self._prev[node]
+            if next_node:
+                self._prev[next_node] = prev_node
+
+        node.next_node = None
+        self.len -= 1
+        return node.element
+
     def delete_first(self):
         """
         Delete the first element of the list.
@@ -220,32 +539,57 @@ class LinkedList(object):
             if self.first is None:
                 self.last = self.first
 
+            if self._index is not None:
+                self._index.remove(n)
+                del self._prev[n]
+                if new_first:
+                    self._prev[new_first] = None
+
             self.len -= 1
         return n.element
 
+    def delete_first_many(self, n):
+        """
+        Delete up to n elements from the beginning of the list
+        :param n: max number of elements to delete
+        :return: list of deleted objects, in list order
+        """
+        if self._index is not None:
+            return [self.delete_first() for _ in range(min(n, self.len))]
+
+        deleted = []
+        node = self.first
+        while node and len(deleted) < n:
+            deleted.append(node.element)
+            node = node.next_node
+
+        self.first = node
+        if node is None:
+            self.last = None
+        self.len -= len(deleted)
+        return deleted
+
     def delete_last(self):
         """
         Delete the last element of the list
         If length of list is None, leave as None
+        Note: unless the list is indexed, this walks the whole list
+        to find the new last node, O(n).
+        Use DoubleLinkedList when deleting from the end is common.
         :return: deleted object
         """
-        prev_node = None
-        current_node = self.first
+        current_node = self.last
 
         if current_node:
-            while current_node.next_node:
-                prev_node = current_node
-                current_node = current_node.next_node
-
-            if prev_node:
-                prev_node.next_node = None
-                self.last = prev_node
+            if self._index is not None:
+                prev_node = self._prev[current_node]
             else:
-                # we deleted the only node
-                self.first = None
-                self.last = None
-
-            self.len -= 1
+                prev_node = None
+                n = self.first
+                while n is not current_node:
+                    prev_node = n
+                    n = n.next_node
+            return self._unlink(prev_node, current_node)
         return current_node.element
 
     def delete(self, obj):
@@ -256,32 +600,11 @@ class LinkedList(object):
         :raise: Exception if obj not found
         """
         # find the node
-        prev_node = None
-        current_node = self.first
-        found = False
-        while current_node:
-            if current_node.element == obj:
-                found = True
-                break
-            else:
-                prev_node = current_node
-                current_node = current_node.next_node
+        prev_node, current_node = self._locate(obj)
 
         # delete the node
-        if found:
-            if prev_node is None:
-                # found first element of list
-                self.first = current_node.next_node
-            else:
-                prev_node.next_node = current_node.next_node
-
-            # found last element of list
-            if current_node.next_node is None:
-                self.last = prev_node
-
-            current_node.next_node = None
-            self.len -= 1
-            return current_node.element
+        if current_node:
+            return self._unlink(prev_node, current_node)
         else:
             raise Exception("Cannot delete obj. No node found for obj.")
 
@@ -290,6 +613,11 @@ class LinkedList(object):
         Search for obj in the list
         :return: return True if exists, else False
         """
+        if self._index is not None:
+            nodes = self._index.lookup(obj)
+            if nodes is not None:
+                return len(nodes) > 0
+
         n = self.first
         while n:
             if n.element == obj:
@@ -311,17 +639,26 @@ class DoubleLinkedList(object):
     Our linked list allows addition/removal of objects to the list.
 
     The DoubleLinkedList has a faster delete_last method.
+    An indexed DoubleLinkedList keeps a NodeIndex, so search, delete
+    and insert_after (any occurrence) are O(1) on average for hashable
+    elements. With k duplicates of an element, deleting one or inserting
+    one mid-list also shifts the index's list of k nodes.
     """
-    def __init__(self):
+    def __init__(self, debug=False, indexed=False):
         """
         --first: pointer to first Node
         --len: number of elements in list
         --last: pointer to last Node
+        :param debug: if True, use CheckedDoubleNode to type check node links
+        :param indexed: if True, maintain an element index for fast lookups
         :return:
         """
         self.first = None
         self.len = 0
         self.last = None
+        self._node_class = CheckedDoubleNode if debug else DoubleNode
+        # element -> nodes (indexed mode only)
+        self._index = NodeIndex() if indexed else None
 
     def __iter__(self):
         """
@@ -349,18 +686,20 @@ class DoubleLinkedList(object):
         :param: python object to insert
         :return:
         """
-        node = DoubleNode(element=obj)
         old_first = self.first
+        node = self._node_class(obj, old_first)
         self.first = node
 
         if old_first:
             old_first.previous_node = node
-            node.next_node = old_first
         else:
             # very first entry
             self.first = node
             self.last = node
 
+        if self._index is not None:
+            self._index.add_first(node)
+
         self.len += 1
 
     def insert_last(self, obj):
@@ -369,35 +708,158 @@ class DoubleLinkedList(object):
         :param obj: a python object
         :return:
         """
-        node = DoubleNode(element=obj)
         old_last = self.last
+        node = self._node_class(obj, None, old_last)
         self.last = node
 
         if old_last:
             old_last.next_node = node
-            node.previous_node = old_last
         else:
             # very first entry
             self.last = node
             self.first = node
 
+        if self._index is not None:
+            self._index.add(node)
+
         self.len += 1
 
-    def _find_node(self, start_node, obj):
+    def insert_last_many(self, objs):
+        """
+        Insert each obj at the end of the linked list, in order.
+        The new nodes are chained together first, then spliced on once.
+        :param objs: iterable of python objects
+        :return:
+        """
+        if self._index is not None:
+            for obj in objs:
+                self.insert_last(obj)
+            return
+
+        node_class = self._node_class
+        first = last = None
+        count = 0
+        for obj in objs:
+            node = node_class(obj, None, last)
+            if last is None:
+                first = node
+            else:
+                last.next_node = node
+            last = node
+            count += 1
+
+        if first is None:
+            return
+
+        if self.last:
+            self.last.next_node = first
+            first.previous_node = self.last
+        else:
+            self.first = first
+        self.last = last
+        self.len += count
+
+    def insert_first_many(self, objs):
+        """
+        Insert each obj at the beginning of the linked list, in order,
+        so the last obj becomes first (like repeated insert_first).
+        The new nodes are chained together first, then spliced on once.
+        :param objs: iterable of python objects
+        :return:
+        """
+        if self._index is not None:
+            for obj in objs:
+                self.insert_first(obj)
+            return
+
+        node_class = self._node_class
+        first = last = None
+        count = 0
+        for obj in objs:
+            node = node_class(obj, first)
+            if first is None:
+                last = node
+            else:
+                first.previous_node = node
+            first = node
+            count += 1
+
+        if first is None:
+            return
+
+        if self.first:
+            last.next_node = self.first
+            self.first.previous_node = last
+        else:
+            self.last = last
+        self.first = first
+        self.len += count
+
+    def peek_first(self):
+        """
+        Return the first element of the list without removing it
+        :return: first object
+        :raise: Exception if list is empty
+        """
+        if self.first is None:
+            raise Exception("Cannot peek into empty list")
+        return self.first.element
+
+    def peek_last(self):
         """
-        Find the node in the linked list
+        Return the last element of the list without removing it
+        :return: last object
+        :raise: Exception if list is empty
+        """
+        if self.last is None:
+            raise Exception("Cannot peek into empty list")
+        return self.last.element
+
+    def insert_ordered(self, obj):
+        """
+        Insert obj before the first element that is greater than obj.
+        Used to keep the list in order; equal elements keep insertion order.
+        :param obj: an order-comparable python object
+        :return:
+        """
+        # loop until we hit a bigger item then insert
+        prev_node = None
+        node = self.first
+        while node:
+            if node.element > obj:
+                break
+            prev_node = node
+            node = node.next_node
+
+        if prev_node is None:
+            # first item was greater than obj (or list is empty)
+            self.insert_first(obj)
+        else:
+            self.insert_after_node(prev_node, obj)
+
+    def _locate(self, obj, occurrence=1):
+        """
+        Find the Nth occurrence of obj in the linked list
+        Uses the index when possible, else scans from the first node
         :param obj: element of the node to find
+        :param occurrence: occurrence of obj to find (1 is the first)
         :return: node if it exists, else None
         """
-        n = start_node
-        found = None
+        if self._index is not None:
+            nodes = self._index.lookup(obj)
+            if nodes is not None:
+                if len(nodes) < occurrence:
+                    return None
+                return nodes[max(occurrence, 1) - 1]
+
+        n = self.first
         while n:
             if n.element == obj:
-                found = n
-                break
-            else:
-                n = n.next_node
-        return found
+                occurrence -= 1
+                if occurrence <= 0:
+                    return n
+            n = n.next_node
+        return None
 
     def insert_after_node(self, node, new_obj):
         """
@@ -406,15 +868,11 @@ class DoubleLinkedList(object):
         :param new_obj: new element to add
         :return:
         """
-        new_node = DoubleNode(element=new_obj)
-
-        # update next
+        # update next and prev
         old_next_node = node.next_node
+        new_node = self._node_class(new_obj, old_next_node, node)
         node.next_node = new_node
-        new_node.next_node = old_next_node
 
-        # update prev
-        new_node.previous_node = node
         if old_next_node:
             # w x N y
             old_next_node.previous_node = new_node
@@ -422,6 +880,9 @@ class DoubleLinkedList(object):
             # w x N
             self.last = new_node
 
+        if self._index is not None:
+            self._index.add_after(new_node, node)
+
         self.len += 1
 
         return
@@ -437,27 +898,11 @@ class DoubleLinkedList(object):
         :raise: Exception if obj is not found
         """
         # find our node (1st, second, whatever)
-        start_node = self.first
-        current_node = None
-        for i in range(0, occurrence):
-            current_node = self._find_node(start_node, obj)
-            start_node = current_node
+        current_node = self._locate(obj, occurrence)
 
         # insert new_obj
         if current_node:
-            new_node = DoubleNode(element=new_obj)
-            new_node.next_node = current_node.next_node
-            current_node.next_node = new_node
-
-            new_node.previous_node = current_node
-            if new_node.next_node:
-                # x y N z
-                new_node.next_node.previous_node = new_node
-            else:
-                # x y N
-                self.last = new_node
-
-            self.len += 1
+            self.insert_after_node(current_node, new_obj)
         else:
             raise Exception("Cannot insert new_obj. No node found for obj.")
 
@@ -480,9 +925,35 @@ class DoubleLinkedList(object):
                 # N; delete N
                 self.last = self.first
 
+            if self._index is not None:
+                self._index.remove(n)
+
             self.len -= 1
         return n.element
 
+    def delete_first_many(self, n):
+        """
+        Delete up to n elements from the beginning of the list
+        :param n: max number of elements to delete
+        :return: list of deleted objects, in list order
+        """
+        if self._index is not None:
+            return [self.delete_first() for _ in range(min(n, self.len))]
+
+        deleted = []
+        node = self.first
+        while node and len(deleted) < n:
+            deleted.append(node.element)
+            node = node.next_node
+
+        self.first = node
+        if node is None:
+            self.last = None
+        else:
+            node.previous_node = None
+        self.len -= len(deleted)
+        return deleted
+
     def delete_last(self):
         """
         Delete the last element of the list
@@ -503,6 +974,9 @@ class DoubleLinkedList(object):
                 # N; delete N
                 self.first = self.last
 
+            if self._index is not None:
+                self._index.remove(n)
+
             self.len -= 1
 
         return n.element
@@ -515,17 +989,10 @@ class DoubleLinkedList(object):
         :raise: Exception if obj not found
         """
         # find the node
-        current_node = self.first
-        found = False
-        while current_node:
-            if current_node.element == obj:
-                found = True
-                break
-            else:
-                current_node = current_node.next_node
+        current_node = self._locate(obj)
 
         # update list
-        if found:
+        if current_node:
             prev_node = current_node.previous_node
             next_node = current_node.next_node
 
@@ -545,6 +1012,9 @@ class DoubleLinkedList(object):
                 prev_node.next_node = next_node
                 next_node.previous_node = prev_node
 
+            if self._index is not None:
+                self._index.remove(current_node)
+
             self.len -= 1
             return current_node.element
         else:
@@ -555,6 +1025,11 @@ class DoubleLinkedList(object):
         Search for obj in the list
         :return: return True if exists, else False
         """
+        if self._index is not None:
+            nodes = self._index.lookup(obj)
+            if nodes is not None:
+                return len(nodes) > 0
+
         n = self.first
         while n:
             if n.element == obj:
@@ -568,3 +1043,843 @@ class DoubleLinkedList(object):
         :return:
         """
         return self.len
+
+
+class UnrolledLinkedList(object):
+    """
+    Implements the LinkedList api to store objects in an unrolled linked list.
+    Each BlockNode holds up to block_size elements in a python list, so
+    iteration and search walk contiguous arrays instead of one node per element.
+
+    UnrolledLinkedList can be used as the backend of
+    OrderedLinkedList, LinkedListQueue and LinkedListStack.
+    """
+    def __init__(self, block_size=64):
+        """
+        --first: pointer to first BlockNode
+        --len: number of elements in list
+        --last: pointer to last BlockNode
+        :param block_size: max number of elements stored in each block
+        :return:
+        """
+        if block_size < 2:
+            raise Exception("block_size must be >= 2")
+
+        self.first = None
+        self.len = 0
+        self.last = None
+        self.block_size = block_size
+
+    def __iter__(self):
+        """
+        Define iteration for the list, which is the traversal of each block
+        Note: it is NOT a very good ideal to iterate and insert at the same time
+        :return:
+        """
+        block = self.first
+        while block:
+            yield from block.elements
+            block = block.next_node
+
+    def __len__(self):
+        """
+        Define the len function for this list, which is the number of elements
+        :return:
+        """
+        return self.len
+
+    def _link_after(self, block, new_block):
+        """
+        Link new_block into the list after block.
+        If block is None, new_block becomes the first block.
+        """
+        if block is None:
+            new_block.next_node = self.first
+            if self.first:
+                self.first.previous_node = new_block
+            self.first = new_block
+        else:
+            new_block.next_node = block.next_node
+            new_block.previous_node = block
+            if block.next_node:
+                block.next_node.previous_node = new_block
+            block.next_node = new_block
+
+        if new_block.next_node is None:
+            self.last = new_block
+
+    def _unlink(self, block):
+        """
+        Remove block from the chain of blocks
+        """
+        prev_block = block.previous_node
+        next_block = block.next_node
+
+        if prev_block:
+            prev_block.next_node = next_block
+        else:
+            self.first = next_block
+
+        if next_block:
+            next_block.previous_node = prev_block
+        else:
+            self.last = prev_block
+
+        block.next_node = block.previous_node = None
+
+    def _insert_into(self, block, index, obj):
+        """
+        Insert obj at index of block, splitting the block in half if it is full
+        """
+        elements = block.elements
+        if len(elements) >= self.block_size:
+            # split: move the back half into a new block
+            half = len(elements) // 2
+            new_block = BlockNode(elements[half:])
+            del elements[half:]
+            self._link_after(block, new_block)
+
+            if index > half:
+                elements = new_block.elements
+                index -= half
+
+        elements.insert(index, obj)
+        self.len += 1
+
+    def _remove_from(self, block, index):
+        """
+        Remove and return the element at index of block.
+        Empty blocks are unlinked; an underfull block absorbs
+        its successor if their elements fit in one block.
+        """
+        elements = block.elements
+        obj = elements.pop(index)
+        self.len -= 1
+
+        if not elements:
+            self._unlink(block)
+        elif len(elements) < self.block_size // 2:
+            next_block = block.next_node
+            if next_block and len(elements) + len(next_block.elements) <= self.block_size:
+                elements.extend(next_block.elements)
+                self._unlink(next_block)
+        return obj
+
+    def _find(self, obj, occurrence=1):
+        """
+        Find the block and index of the nth occurrence of obj
+        :param obj: element to find
+        :param occurrence: which occurrence to find (1 is the first)
+        :return: (block, index) if it exists, else (None, -1)
+        """
+        block = self.first
+        while block:
+            elements = block.elements
+            index = -1
+            while True:
+                try:
+                    index = elements.index(obj, index + 1)
+                except ValueError:
+                    break
+                occurrence -= 1
+                if occurrence <= 0:
+                    return block, index
+            block = block.next_node
+        return None, -1
+
+    def peek_first(self):
+        """
+        Return the first element of the list without removing it
+        :return: first object
+        :raise: Exception if list is empty
+        """
+        if self.first is None:
+            raise Exception("Cannot peek into empty list")
+        return self.first.elements[0]
+
+    def peek_last(self):
+        """
+        Return the last element of the list without removing it
+        :return: last object
+        :raise: Exception if list is empty
+        """
+        if self.last is None:
+            raise Exception("Cannot peek into empty list")
+        return self.last.elements[-1]
+
+    def insert_first(self, obj):
+        """
+        Insert obj at the beginning of the linked list
+        :param: python object to insert
+        :return:
+        """
+        block = self.first
+        if block is None or len(block.elements) >= self.block_size:
+            block = BlockNode()
+            self._link_after(None, block)
+        block.elements.insert(0, obj)
+        self.len += 1
+
+    def insert_last(self, obj):
+        """
+        Insert obj at the end of the linked list
+        :param obj: a python object
+        :return:
+        """
+        block = self.last
+        if block is None or len(block.elements) >= self.block_size:
+            block = BlockNode()
+            self._link_after(self.last, block)
+        block.elements.append(obj)
+        self.len += 1
+
+    def insert_last_many(self, objs):
+        """
+        Insert each obj at the end of the linked list, in order.
+        Fills the last block, then appends full blocks.
+        :param objs: iterable of python objects
+        :return:
+        """
+        objs = list(objs)
+        block_size = self.block_size
+        start = 0
+        if self.last is not None:
+            start = block_size - len(self.last.elements)
+            self.last.elements.extend(objs[:start])
+
+        for i in range(start, len(objs), block_size):
+            self._link_after(self.last, BlockNode(objs[i:i + block_size]))
+        self.len += len(objs)
+
+    def insert_first_many(self, objs):
+        """
+        Insert each obj at the beginning of the linked list, in order,
+        so the last obj becomes first (like repeated insert_first).
+        Fills the first block, then prepends full blocks.
+        :param objs: iterable of python objects
+        :return:
+        """
+        objs = list(objs)
+        objs.reverse()
+        block_size = self.block_size
+        end = len(objs)
+        if self.first is not None:
+            take = min(block_size - len(self.first.elements), end)
+            self.first.elements[0:0] = objs[end - take:]
+            end -= take
+
+        for i in range(end, 0, -block_size):
+            self._link_after(None, BlockNode(objs[max(i - block_size, 0):i]))
+        self.len += len(objs)
+
+    def insert_after(self, obj, new_obj, occurrence=1):
+        """
+        Insert the new_obj after N occurrences of obj,
+        where the default is after the first occurrence of obj (n=1)
+        :param obj: current obj to find
+        :param new_obj: new object to add
+        :param occurrence: occurrence of obj to insert after
+        :return:
+        :raise: Exception if obj is not found
+        """
+        block, index = self._find(obj, occurrence)
+        if block is None:
+            raise Exception("Cannot insert new_obj. No node found for obj.")
+        self._insert_into(block, index + 1, new_obj)
+
+    def insert_ordered(self, obj):
+        """
+        Insert obj before the first element that is greater than obj.
+        Used to keep the list in order; equal elements keep insertion order.
+        :param obj: an order-comparable python object
+        :return:
+        """
+        # skip whole blocks whose largest element is not bigger than obj
+        block = self.first
+        while block and not block.elements[-1] > obj:
+            block = block.next_node
+
+        if block is None:
+            self.insert_last(obj)
+        else:
+            self._insert_into(block, bisect_right(block.elements, obj), obj)
+
+    def delete_first(self):
+        """
+        Delete the first element of the list.
+        :return: deleted object
+        :raise: Exception if list is empty
+        """
+        if self.first is None:
+            raise Exception("Cannot delete from empty list")
+        block = self.first
+        obj = block.elements.pop(0)
+        self.len -= 1
+        if not block.elements:
+            self._unlink(block)
+        return obj
+
+    def delete_first_many(self, n):
+        """
+        Delete up to n elements from the beginning of the list
+        :param n: max number of elements to delete
+        :return: list of deleted objects, in list order
+        """
+        deleted = []
+        while self.first is not None and len(deleted) < n:
+            block = self.first
+            elements = block.elements
+            take = n - len(deleted)
+            deleted.extend(elements[:take])
+            del elements[:take]
+            if not elements:
+                self._unlink(block)
+
+        self.len -= len(deleted)
+        return deleted
+
+    def delete_last(self):
+        """
+        Delete the last element of the list
+        :return: deleted object
+        :raise: Exception if list is empty
+        """
+        if self.last is None:
+            raise Exception("Cannot delete from empty list")
+        block = self.last
+        obj = block.elements.pop()
+        self.len -= 1
+        if not block.elements:
+            self._unlink(block)
+        return obj
+
+    def delete(self, obj):
+        """
+        Delete obj if it exists
+        :param obj: python object to delete
+        :return: deleted object
+        :raise: Exception if obj not found
+        """
+        block, index = self._find(obj)
+        if block is None:
+            raise Exception("Cannot delete obj. No node found for obj.")
+        return self._remove_from(block, index)
+
+    def search(self, obj):
+        """
+        Search for obj in the list
+        :return: return True if exists, else False
+        """
+        block = self.first
+        while block:
+            if obj in block.elements:
+                return True
+            block = block.next_node
+        return False
+
+    def size(self):
+        """
+        Return the size of the linked list
+        :return:
+        """
+        return self.len
+
+
+class IndexedDeque(object):
+    """
+    Implements the DoubleLinkedList api on a block-based deque.
+    Elements live in fixed-size blocks reached through a central map
+    (a python list of blocks), so both ends are amortized O(1) and
+    indexing with [] is O(1).
+
+    insert_after, insert_ordered and delete shift the elements
+    between the target and the nearer end, so they are O(n).
+    IndexedDeque can be used as the backend of
+    OrderedLinkedList, LinkedListQueue and LinkedListStack.
+    """
+    def __init__(self, block_size=64):
+        """
+        --blocks: central map of blocks, None for unused map entries
+        --head: slot position of the first element
+        --tail: slot position after the last element
+        Slot p is blocks[p // block_size][p % block_size]
+        :param block_size: number of elements stored in each block
+        :return:
+        """
+        if block_size < 2:
+            raise Exception("block_size must be >= 2")
+
+        self._blocks = []
+        self._head = 0
+        self._tail = 0
+        self.block_size = block_size
+
+    def __iter__(self):
+        """
+        Define iteration for the deque, from first to last
+        Note: it is NOT a very good ideal to iterate and insert at the same time
+        :return:
+        """
+        block_size = self.block_size
+        blocks = self._blocks
+        p = self._head
+        tail = self._tail
+        while p < tail:
+            b, offset = divmod(p, block_size)
+            end = min(block_size, offset + tail - p)
+            yield from blocks[b][offset:end]
+            p += end - offset
+
+    def __len__(self):
+        """
+        Define the len function for this deque, which is the number of elements
+        :return:
+        """
+        return self._tail - self._head
+
+    def _slot(self, index):
+        """
+        Return the slot position of index, which may be negative
+        :raise: IndexError if index is out of range
+        """
+        n = self._tail - self._head
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("IndexedDeque index out of range")
+        return self._head + index
+
+    def __getitem__(self, index):
+        """
+        Return the element at index
+        :param index: position from the front; negative counts from the back
+        :return: object at index
+        :raise: IndexError if index is out of range
+        """
+        b, offset = divmod(self._slot(index), self.block_size)
+        return self._blocks[b][offset]
+
+    def __setitem__(self, index, obj):
+        """
+        Replace the element at index
+        :param index: position from the front; negative counts from the back
+        :param obj: python object to store
+        :return:
+        :raise: IndexError if index is out of range
+        """
+        b, offset = divmod(self._slot(index), self.block_size)
+        self._blocks[b][offset] = obj
+
+    def peek_first(self):
+        """
+        Return the first element of the deque without removing it
+        :return: first object
+        :raise: Exception if deque is empty
+        """
+        if self._head == self._tail:
+            raise Exception("Cannot peek into empty list")
+        return self[0]
+
+    def peek_last(self):
+        """
+        Return the last element of the deque without removing it
+        :return: last object
+        :raise: Exception if deque is empty
+        """
+        if self._head == self._tail:
+            raise Exception("Cannot peek into empty list")
+        return self[-1]
+
+    def insert_first(self, obj):
+        """
+        Insert obj at the beginning of the deque
+        :param: python object to insert
+        :return:
+        """
+        block_size = self.block_size
+        if self._head == 0:
+            # no room in front: double the map with unused entries before it
+            room = max(len(self._blocks), 1)
+            self._blocks[0:0] = [None] * room
+            self._head += room * block_size
+            self._tail += room * block_size
+
+        self._head -= 1
+        b, offset = divmod(self._head, block_size)
+        block = self._blocks[b]
+        if block is None:
+            block = self._blocks[b] = [None] * block_size
+        block[offset] = obj
+
+    def insert_last(self, obj):
+        """
+        Insert obj at the end of the deque
+        :param obj: a python object
+        :return:
+        """
+        block_size = self.block_size
+        b, offset = divmod(self._tail, block_size)
+        if b == len(self._blocks):
+            self._blocks.append([None] * block_size)
+        elif self._blocks[b] is None:
+            self._blocks[b] = [None] * block_size
+        self._blocks[b][offset] = obj
+        self._tail += 1
+
+    def insert_last_many(self, objs):
+        """
+        Insert each obj at the end of the deque, in order.
+        Fills the last block, then appends whole blocks.
+        :param objs: iterable of python objects
+        :return:
+        """
+        objs = list(objs)
+        block_size = self.block_size
+        blocks = self._blocks
+        i = 0
+        while i < len(objs):
+            b, offset = divmod(self._tail, block_size)
+            if b == len(blocks):
+                blocks.append([None] * block_size)
+            elif blocks[b] is None:
+                blocks[b] = [None] * block_size
+            take = min(block_size - offset, len(objs) - i)
+            blocks[b][offset:offset + take] = objs[i:i + take]
+            self._tail += take
+            i += take
+
+    def insert_first_many(self, objs):
+        """
+        Insert each obj at the beginning of the deque, in order,
+        so the last obj becomes first (like repeated insert_first).
+        :param objs: iterable of python objects
+        :return:
+        """
+        for obj in objs:
+            self.insert_first(obj)
+
+    def _release_front(self):
+        """
+        Drop the blocks in front of the head block, except the one just
+        before it, which is kept (empty) as a spare so alternating
+        inserts and deletes at a block boundary do not allocate.
+        The map itself is trimmed once more than half of it is unused.
+        """
+        first = self._head // self.block_size
+        blocks = self._blocks
+        for b in range(first - 2, -1, -1):
+            if blocks[b] is None:
+                break
+            blocks[b] = None
+
+        if first > len(blocks) // 2 and first > 1:
+            unused = first - 1
+            del blocks[:unused]
+            self._head -= unused * self.block_size
+            self._tail -= unused * self.block_size
+
+    def delete_first(self):
+        """
+        Delete the first element of the deque.
+        :return: deleted object
+        :raise: Exception if deque is empty
+        """
+        if self._head == self._tail:
+            raise Exception("Cannot delete from empty list")
+        b, offset = divmod(self._head, self.block_size)
+        block = self._blocks[b]
+        obj = block[offset]
+        block[offset] = None
+        self._head += 1
+        if offset == self.block_size - 1:
+            self._release_front()
+        return obj
+
+    def delete_first_many(self, n):
+        """
+        Delete up to n elements from the beginning of the deque
+        :param n: max number of elements to delete
+        :return: list of deleted objects, in deque order
+        """
+        block_size = self.block_size
+        blocks = self._blocks
+        deleted = []
+        n = min(n, self._tail - self._head)
+        while len(deleted) < n:
+            b, offset = divmod(self._head, block_size)
+            take = min(block_size - offset, n - len(deleted))
+            block = blocks[b]
+            deleted.extend(block[offset:offset + take])
+            block[offset:offset + take] = [None] * take
+            self._head += take
+
+        if deleted:
+            self._release_front()
+        return deleted
+
+    def delete_last(self):
+        """
+        Delete the last element of the deque
+        :return: deleted object
+        :raise: Exception if deque is empty
+        """
+        if self._head == self._tail:
+            raise Exception("Cannot delete from empty list")
+        self._tail -= 1
+        b, offset = divmod(self._tail, self.block_size)
+        block = self._blocks[b]
+        obj = block[offset]
+        block[offset] = None
+        if offset == 0:
+            # the block at tail is empty: keep it as a spare for
+            # insert_last, and drop any blocks after it
+            del self._blocks[b + 1:]
+        return obj
+
+    def _insert_at(self, index, obj):
+        """
+        Insert obj before index, shifting the elements toward the nearer end
+        """
+        n = len(self)
+        if index < n // 2:
+            self.insert_first(obj)
+            for i in range(index):
+                self[i] = self[i + 1]
+        else:
+            self.insert_last(obj)
+            for i in range(n, index, -1):
+                self[i] = self[i - 1]
+        self[index] = obj
+
+    def _delete_at(self, index):
+        """
+        Remove and return the element at index, closing the gap from the nearer end
+        """
+        obj = self[index]
+        n = len(self)
+        if index < n // 2:
+            for i in range(index, 0, -1):
+                self[i] = self[i - 1]
+            self.delete_first()
+        else:
+            for i in range(index, n - 1):
+                self[i] = self[i + 1]
+            self.delete_last()
+        return obj
+
+    def _find(self, obj, occurrence=1):
+        """
+        Find the index of the nth occurrence of obj
+        :param obj: element to find
+        :param occurrence: which occurrence to find (1 is the first)
+        :return: index if it exists, else -1
+        """
+        for index, element in enumerate(self):
+            if element == obj:
+                occurrence -= 1
+                if occurrence <= 0:
+                    return index
+        return -1
+
+    def insert_after(self, obj, new_obj, occurrence=1):
+        """
+        Insert the new_obj after N occurrences of obj,
+        where the default is after the first occurrence of obj (n=1)
+        :param obj: current obj to find
+        :param new_obj: new object to add
+        :param occurrence: occurrence of obj to insert after
+        :return:
+        :raise: Exception if obj is not found
+        """
+        index = self._find(obj, occurrence)
+        if index < 0:
+            raise Exception("Cannot insert new_obj. No node found for obj.")
+        self._insert_at(index + 1, new_obj)
+
+    def insert_ordered(self, obj):
+        """
+        Insert obj before the first element that is greater than obj.
+        Used to keep the deque in order; equal elements keep insertion order.
+        Binary search uses the O(1) indexing.
+        :param obj: an order-comparable python object
+        :return:
+        """
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if obj < self[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+        self._insert_at(lo, obj)
+
+    def delete(self, obj):
+        """
+        Delete obj if it exists
+        :param obj: python object to delete
+        :return: deleted object
+        :raise: Exception if obj not found
+        """
+        index = self._find(obj)
+        if index < 0:
+            raise Exception("Cannot delete obj. No node found for obj.")
+        return self._delete_at(index)
+
+    def search(self, obj):
+        """
+        Search for obj in the deque
+        :return: return True if exists, else False
+        """
+        return self._find(obj) >= 0
+
+    def size(self):
+        """
+        Return the size of the deque
+        :return:
+        """
+        return self._tail - self._head
+
+
+class PersistentList(object):
+    """
+    Immutable singly linked list of Node cons cells.
+    Operations that change the list return a new PersistentList and
+    leave the old one valid; versions share every node they have in
+    common, so insert_first and delete_first are O(1) in time and
+    space and keeping an old version is free.
+
+    The nodes are never changed after they are built, so they must
+    not be handed to a mutable LinkedList.
+    """
+    __slots__ = ('_first', '_len')
+
+    def __init__(self, objs=()):
+        """
+        --first: pointer to first Node
+        --len: number of elements in list
+        :param objs: iterable of python objects, in list order
+        :return:
+        """
+        first = None
+        objs = list(objs)
+        for obj in reversed(objs):
+            first = Node(obj, first)
+        self._first = first
+        self._len = len(objs)
+
+    @classmethod
+    def _from_node(cls, first, length):
+        """
+        Wrap an existing chain of nodes without copying it
+        """
+        new = cls.__new__(cls)
+        new._first = first
+        new._len = length
+        return new
+
+    def __iter__(self):
+        """
+        Define iteration for the list, which is the traversal of each node
+        :return:
+        """
+        node = self._first
+        while node:
+            yield node.element
+            node = node.next_node
+
+    def __len__(self):
+        """
+        Define the len function for this list, which is the number of nodes
+        :return:
+        """
+        return self._len
+
+    def peek_first(self):
+        """
+        Return the first element of the list
+        :return: first object
+        :raise: Exception if list is empty
+        """
+        if self._first is None:
+            raise Exception("Cannot peek into empty list")
+        return self._first.element
+
+    def insert_first(self, obj):
+        """
+        Return a new list with obj in front of this one. O(1).
+        :param obj: python object to insert
+        :return: new PersistentList
+        """
+        return self._from_node(Node(obj, self._first), self._len + 1)
+
+    def delete_first(self):
+        """
+        Return the list without its first element. O(1).
+        :return: new PersistentList
+        :raise: Exception if list is empty
+        """
+        if self._first is None:
+            raise Exception("Cannot delete from empty list")
+        return self._from_node(self._first.next_node, self._len - 1)
+
+    def _copy_prefix(self, stop, tail, length):
+        """
+        Copy the nodes before stop onto tail, sharing tail unchanged
+        :param stop: node at which copying stops (None copies every node)
+        :param tail: node the copied prefix links to
+        :param length: length of the resulting list
+        :return: new PersistentList
+        """
+        prefix = []
+        node = self._first
+        while node is not stop:
+            prefix.append(node.element)
+            node = node.next_node
+
+        first = tail
+        for obj in reversed(prefix):
+            first = Node(obj, first)
+        return self._from_node(first, length)
+
+    def insert_last(self, obj):
+        """
+        Return a new list with obj after the last element.
+        Every node is copied, so this is O(n).
+        :param obj: python object to insert
+        :return: new PersistentList
+        """
+        return self._copy_prefix(None, Node(obj), self._len + 1)
+
+    def delete(self, obj):
+        """
+        Return the list without the first occurrence of obj.
+        The nodes before obj are copied and the rest are shared.
+        :param obj: python object to delete
+        :return: new PersistentList
+        :raise: Exception if obj not found
+        """
+        node = self._first
+        while node and node.element != obj:
+            node = node.next_node
+        if node is None:
+            raise Exception("Cannot delete obj. No node found for obj.")
+        return self._copy_prefix(node, node.next_node, self._len - 1)
+
+    def search(self, obj):
+        """
+        Search for obj in the list
+        :return: return True if exists, else False
+        """
+        node = self._first
+        while node:
+            if node.element == obj:
+                return True
+            node = node.next_node
+        return False
+
+    def size(self):
+        """
+        Return the size of the linked list
+        :return:
+        """
+        return self._len
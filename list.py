@@ -2,9 +2,11 @@
 Implement a list api in python
 """
 from abc import ABCMeta, abstractmethod, abstractproperty
+from heapq import merge
+import random
 
 
-from linked_lists import LinkedList
+from linked_lists import DoubleLinkedList, SkipNode
 
 
 # --------------------------------
@@ -134,12 +136,76 @@ class OrderedLinkedList(OrderedListABC):
         __eq__, __ne__, __lt__, __le__, __gt__, __ge__
 
     """
-    def __init__(self, element_class):
+    def __init__(self, element_class, backend=DoubleLinkedList):
         """
         :param element_class: class that this linked list will store
+        :param backend: linked list class used for storage,
+        e.g. DoubleLinkedList, LinkedList or UnrolledLinkedList.
+        The default DoubleLinkedList makes remove_last O(1);
+        LinkedList saves a link per element but remove_last is O(n).
         """
         self.element_class = element_class
-        self._list = LinkedList()
+        self._backend = backend
+        self._list = backend()
+
+    @classmethod
+    def from_iterable(cls, element_class, items, presorted=False, backend=DoubleLinkedList):
+        """
+        Build an ordered list from items in one pass.
+        Items are sorted once (timsort) and linked in order,
+        instead of calling add per element.
+        :param element_class: class that this linked list will store
+        :param items: iterable of element_class instances
+        :param presorted: True if items are already in order
+        :param backend: linked list class used for storage
+        :return: OrderedLinkedList
+        """
+        l = cls(element_class, backend=backend)
+        l.extend(items, presorted=presorted)
+        return l
+
+    def _prepare(self, items, presorted):
+        """
+        Check the class of each item and return them as a sorted list
+        :raise: ListException on a bad item, or if presorted items are out of order
+        """
+        items = list(items)
+        element_class = self.element_class
+        for x in items:
+            if not isinstance(x, element_class):
+                raise ListException("Cannot add element because is not an instance of {}"
+                                    .format(element_class.__name__))
+
+        if not presorted:
+            # sorted is stable, so equal items keep their order
+            return sorted(items)
+
+        for i in range(1, len(items)):
+            if items[i - 1] > items[i]:
+                raise ListException("Cannot extend list because presorted items are out of order")
+        return items
+
+    def extend(self, items, presorted=False):
+        """
+        Add all items to the list at their appropriate spots.
+        Items are sorted once, then merged with the current elements
+        in a single linear pass; existing elements come before equal new ones.
+        :param items: iterable of element_class instances
+        :param presorted: True if items are already in order
+        :return:
+        """
+        items = self._prepare(items, presorted)
+        if not items:
+            return
+
+        if len(self._list):
+            new_list = self._backend()
+            for obj in merge(self._list, items):
+                new_list.insert_last(obj)
+            self._list = new_list
+        else:
+            for obj in items:
+                self._list.insert_last(obj)
 
     def __iter__(self):
         for obj in self._list:
@@ -154,25 +220,7 @@ class OrderedLinkedList(OrderedListABC):
                                 .format(self.element_class.__name__))
 
         # find where the element belongs in the order
-        # base case, empty list
-        if len(self._list) == 0:
-            self._list.insert_first(x)
-        # > 0 element
-        else:
-            # loop until we hit a bigger item then insert
-            prev_node = None
-            node = self._list.first
-            while node:
-                if node.element > x:
-                    break
-                prev_node = node
-                node = node.next_node
-
-            if prev_node is None:
-                # first item was greater than x
-                self._list.insert_first(x)
-            else:
-                self._list.insert_after_node(prev_node, x)
+        self._list.insert_ordered(x)
 
         return
 
@@ -185,7 +233,7 @@ class OrderedLinkedList(OrderedListABC):
         # if there is nothing in the list then raise an exception
         if self.is_empty:
             raise ListException("Cannot fetch first element from empty list")
-        return self._list.first.element
+        return self._list.peek_first()
 
     @property
     def last(self):
@@ -196,7 +244,7 @@ class OrderedLinkedList(OrderedListABC):
         # if there is nothing in the list then raise an exception
         if self.is_empty:
             raise ListException("Cannot fetch last element from empty list")
-        return self._list.last.element
+        return self._list.peek_last()
 
     def __len__(self):
         """
@@ -240,3 +288,207 @@ class OrderedLinkedList(OrderedListABC):
         :return: True if in list, else False
         """
         return self._list.search(x)
+
+
+# --------------------------------
+# Ordered List Implementation: Skip List
+# --------------------------------
+class SkipListOrderedList(OrderedListABC):
+    """
+    The SkipListOrderedList class implements a skip list
+    that will insert elements based on their ordering.
+    Each node is promoted to the next level with probability 1/2,
+    so add and contains are expected O(log n).
+    It expects that elements are of the same type and
+    order-comparable.
+    An order-comparable class defines
+        __eq__, __ne__, __lt__, __le__, __gt__, __ge__
+
+    """
+    MAX_LEVEL = 32
+
+    def __init__(self, element_class, seed=None):
+        """
+        :param element_class: class that this skip list will store
+        :param seed: optional seed for the level generator
+        """
+        self.element_class = element_class
+        # sentinel head node with a link on every level
+        self._head = SkipNode(level=self.MAX_LEVEL)
+        self._last = None
+        # number of levels currently in use
+        self._level = 1
+        self._len = 0
+        self._random = random.Random(seed)
+
+    def __iter__(self):
+        node = self._head.next_nodes[0]
+        while node:
+            yield node.element
+            node = node.next_nodes[0]
+
+    def _random_level(self):
+        """
+        Pick a level for a new node: 1 + number of coin flips
+        that come up heads, capped at MAX_LEVEL
+        """
+        level = 1
+        while level < self.MAX_LEVEL and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def add(self, x):
+        """
+        Add an element into the list at its appropriate spot
+        Equal elements keep their insertion order.
+        """
+        if not isinstance(x, self.element_class):
+            raise ListException("Cannot add element because is not an instance of {}"
+                                .format(self.element_class.__name__))
+
+        # find the last node <= x on every level
+        update = [self._head] * self.MAX_LEVEL
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            next_node = node.next_nodes[level]
+            while next_node is not None and not next_node.element > x:
+                node = next_node
+                next_node = node.next_nodes[level]
+            update[level] = node
+
+        # link the new node in on each of its levels
+        new_level = self._random_level()
+        if new_level > self._level:
+            self._level = new_level
+
+        new_node = SkipNode(x, new_level)
+        for level in range(new_level):
+            new_node.next_nodes[level] = update[level].next_nodes[level]
+            update[level].next_nodes[level] = new_node
+
+        if new_node.next_nodes[0] is None:
+            self._last = new_node
+
+        self._len += 1
+
+    @property
+    def first(self):
+        """
+        Examine the element at the front of the list
+        :return: element at front
+        """
+        # if there is nothing in the list then raise an exception
+        if self.is_empty:
+            raise ListException("Cannot fetch first element from empty list")
+        return self._head.next_nodes[0].element
+
+    @property
+    def last(self):
+        """
+        Examine the element at the rear of the list
+        :return: element at rear
+        """
+        # if there is nothing in the list then raise an exception
+        if self.is_empty:
+            raise ListException("Cannot fetch last element from empty list")
+        return self._last.element
+
+    def __len__(self):
+        """
+        Return the length of the list
+        :return: number of elements
+        """
+        return self._len
+
+    @property
+    def size(self):
+        """
+        Return the number of elements in the list
+        :return:
+        """
+        return self._len
+
+    def _shrink_level(self):
+        """
+        Drop empty levels from the top of the list
+        """
+        while self._level > 1 and self._head.next_nodes[self._level - 1] is None:
+            self._level -= 1
+
+    def remove_first(self):
+        # if there is nothing in the list then raise an exception
+        if self.is_empty:
+            raise ListException("Cannot remove first from empty list")
+
+        # the first node is at the front of every level it belongs to
+        node = self._head.next_nodes[0]
+        for level in range(len(node.next_nodes)):
+            self._head.next_nodes[level] = node.next_nodes[level]
+
+        if self._head.next_nodes[0] is None:
+            self._last = None
+
+        self._shrink_level()
+        self._len -= 1
+        return node.element
+
+    def remove_last(self):
+        # if there is nothing in the list then raise an exception
+        if self.is_empty:
+            raise ListException("Cannot remove last from empty list")
+
+        # find the node before the last node on every level
+        target = self._last
+        update = [self._head] * len(target.next_nodes)
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            next_node = node.next_nodes[level]
+            while next_node is not None and next_node is not target:
+                node = next_node
+                next_node = node.next_nodes[level]
+            if level < len(update):
+                update[level] = node
+
+        for level in range(len(target.next_nodes)):
+            update[level].next_nodes[level] = None
+
+        self._last = update[0] if update[0] is not self._head else None
+
+        self._shrink_level()
+        self._len -= 1
+        return target.element
+
+    @property
+    def is_empty(self):
+        """
+        Return true if list is empty else False
+        :return: True or False
+        """
+        return True if self._len == 0 else False
+
+    def contains(self, x):
+        """
+        Return True if list contains element x, else False
+        :param x: object to check for
+        :return: True if in list, else False
+        """
+        # find the last node < x on every level
+        node = self._head
+        try:
+            for level in range(self._level - 1, -1, -1):
+                next_node = node.next_nodes[level]
+                while next_node is not None and next_node.element < x:
+                    node = next_node
+                    next_node = node.next_nodes[level]
+        except TypeError:
+            # x does not order against our elements; compare with == like
+            # OrderedLinkedList.contains, scanning the bottom level
+            node = self._head.next_nodes[0]
+            while node is not None:
+                if node.element == x:
+                    return True
+                node = node.next_nodes[0]
+            return False
+
+        node = node.next_nodes[0]
+        return node is not None and node.element == x
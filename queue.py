@@ -2,6 +2,16 @@
 Implement a queue api in python
 """
 from abc import ABCMeta, abstractmethod
+from array import array
+import asyncio
+from collections import deque
+import mmap
+import multiprocessing
+from multiprocessing import shared_memory
+import os
+import struct
+import threading
+import zlib
 
 
 # --------------------------------
@@ -69,6 +79,28 @@ class QueueABC(metaclass=ABCMeta):  # pragma: no cover
         """
         pass
 
+    def enqueue_many(self, xs):
+        """
+        Add each element of xs to the back of the queue, in order
+        Implementations may override this with a faster bulk copy.
+        :param xs: iterable of objects to add
+        :return:
+        """
+        for x in xs:
+            self.enqueue(x)
+
+    def dequeue_many(self, n):
+        """
+        Remove and return up to n elements from the front of the queue
+        Implementations may override this with a faster bulk copy.
+        :param n: max number of elements to dequeue
+        :return: list of elements, front first; empty if queue is empty
+        """
+        items = []
+        while len(items) < n and not self.is_empty():
+            items.append(self.dequeue())
+        return items
+
 
 # ----------------------------------------
 # Implementation: ArrayQueue
@@ -78,18 +110,37 @@ class CircularArrayQueue(QueueABC):
     Implements queuing with a python list for FIFO operations
     Note: for the purpose of the exercise, we
     pretend that python list does not support arbitrary inserts
+
+    The overflow policy decides what enqueue does on a full queue:
+    --OVERWRITE: replace the oldest element (default)
+    --RAISE: raise QueueException
+    --GROW: double the array; it is halved again when a quarter full,
+    but never below max_queue_size, so enqueue/dequeue are amortized O(1)
     """
-    def __init__(self, max_queue_size):
+    OVERWRITE = 'overwrite'
+    RAISE = 'raise'
+    GROW = 'grow'
+
+    # value stored in unused slots
+    _blank = None
+
+    def __init__(self, max_queue_size, overflow=OVERWRITE):
         """
         Initialize a CircularArrayQueue
         :param max_queue_size: max number of items we store in queue
+        (the initial size when overflow is GROW)
+        :param overflow: OVERWRITE, RAISE or GROW
         :return:
         """
         if max_queue_size <= 0:
             raise QueueException("Max_queue_size must be > 0")
+        if overflow not in (self.OVERWRITE, self.RAISE, self.GROW):
+            raise QueueException("Unknown overflow policy: {0}".format(overflow))
 
         self._max_queue_size = max_queue_size
-        self._array = [None]*max_queue_size
+        self._min_queue_size = max_queue_size
+        self._overflow = overflow
+        self._array = self._make_array([self._blank]*max_queue_size)
         # index of first element
         self._front_index = 0
         # index of next rear element
@@ -97,6 +148,39 @@ class CircularArrayQueue(QueueABC):
         # number of items in the queue
         self._count = 0
 
+    def _make_array(self, items):
+        """
+        Return storage holding items; the array type used for slots
+        :param items: list of elements
+        """
+        return items
+
+    def _clear(self, start, stop):
+        """
+        Drop the references held by slots start to stop
+        """
+        self._array[start:stop] = [None]*(stop - start)
+
+    def _resize(self, new_size):
+        """
+        Copy the elements into a new array of new_size,
+        re-linearized so the front element is at index 0
+        :param new_size: new array size, >= number of elements
+        """
+        front = self._front_index
+        end = front + self._count
+        if end <= self._max_queue_size:
+            items = self._array[front:end]
+        else:
+            # wrapped around
+            items = self._array[front:] + self._array[:end - self._max_queue_size]
+
+        items.extend(self._make_array([self._blank]*(new_size - self._count)))
+        self._array = items
+        self._max_queue_size = new_size
+        self._front_index = 0
+        self._rear_index = self._count % new_size
+
     def first(self):
         """
         Examine and return the element at the front of the queue
@@ -113,16 +197,71 @@ class CircularArrayQueue(QueueABC):
     def enqueue(self, x):
         """
         Add an element to the back of the queue.
-        Note: this method will wrap around and delete the
+        Note: by default this method will wrap around and delete the
         items in the front of the line if the queue is full.
         :param x: object to add
         :return:
         :raise: TypeError if nothing is queued
+        :raise: QueueException if the queue is full and overflow is RAISE
         """
+        if self._count == self._max_queue_size:
+            if self._overflow == self.GROW:
+                self._resize(2*self._max_queue_size)
+            elif self._overflow == self.RAISE:
+                raise QueueException("Cannot enqueue to full queue")
+            else:
+                # the oldest element is overwritten; front moves past it
+                self._front_index = (self._front_index + 1) % self._max_queue_size
+                self._count -= 1
+
         self._array[self._rear_index] = x
         self._rear_index = (self._rear_index + 1) % self._max_queue_size
-        if self._count < self._max_queue_size:
-            self._count += 1
+        self._count += 1
+
+    def enqueue_many(self, xs):
+        """
+        Add each element of xs to the back of the queue, in order,
+        using at most two slice copies into the ring.
+        The overflow policy applies as if each element were enqueued.
+        :param xs: iterable of objects to add
+        :return:
+        :raise: QueueException if the queue would overflow and overflow
+        is RAISE; no elements are added in that case
+        """
+        xs = self._make_array(list(xs))
+        k = len(xs)
+        if k == 0:
+            return
+
+        free = self._max_queue_size - self._count
+        if k > free:
+            if self._overflow == self.GROW:
+                new_size = self._max_queue_size
+                while new_size < self._count + k:
+                    new_size *= 2
+                self._resize(new_size)
+            elif self._overflow == self.RAISE:
+                raise QueueException("Cannot enqueue to full queue")
+            else:
+                # only the newest max_queue_size elements survive
+                if k >= self._max_queue_size:
+                    xs = xs[k - self._max_queue_size:]
+                    k = len(xs)
+                    self._front_index = self._rear_index = self._count = 0
+                else:
+                    dropped = k - free
+                    self._front_index = (self._front_index + dropped) % self._max_queue_size
+                    self._count -= dropped
+
+        # copy up to the end of the array, then wrap to the start
+        rear = self._rear_index
+        head = min(k, self._max_queue_size - rear)
+        self._array[rear:rear + head] = xs[:head]
+        if head < k:
+            self._array[:k - head] = xs[head:]
+
+        self._rear_index = (rear + k) % self._max_queue_size
+        self._count += k
 
     def __len__(self):
         """
@@ -149,12 +288,53 @@ class CircularArrayQueue(QueueABC):
 
         # fetch our item
         ret = self._array[self._front_index]
-        self._array[self._front_index] = None
+        self._array[self._front_index] = self._blank
         self._front_index = (self._front_index + 1) % self._max_queue_size
         if self._count > 0:
             self._count -= 1
+
+        self._shrink()
         return ret
 
+    def dequeue_many(self, n):
+        """
+        Remove and return up to n elements from the front of the queue,
+        using at most two slice copies out of the ring.
+        :param n: max number of elements to dequeue
+        :return: list of elements, front first; empty if queue is empty
+        """
+        k = min(n, self._count)
+        if k <= 0:
+            return []
+
+        # copy up to the end of the array, then wrap to the start
+        front = self._front_index
+        head = min(k, self._max_queue_size - front)
+        items = self._array[front:front + head]
+        self._clear(front, front + head)
+        if head < k:
+            items.extend(self._array[:k - head])
+            self._clear(0, k - head)
+
+        self._front_index = (front + k) % self._max_queue_size
+        self._count -= k
+        self._shrink()
+        return items
+
+    def _shrink(self):
+        """
+        Release space once a grown array is only a quarter full,
+        halving it until it is not, but never below the initial size
+        """
+        if self._overflow != self.GROW:
+            return
+
+        new_size = self._max_queue_size
+        while new_size > self._min_queue_size and self._count <= new_size // 4:
+            new_size = max(new_size // 2, self._min_queue_size)
+        if new_size != self._max_queue_size:
+            self._resize(new_size)
+
     def is_empty(self):
         """
         Return true if queue is empty else False
@@ -175,129 +355,1600 @@ class CircularArrayQueue(QueueABC):
 
 
 # ----------------------------------------
-# Implementation: Python List Queue
+# Implementation: TypedCircularArrayQueue
 # ----------------------------------------
-class PythonListQueue(QueueABC):
+class TypedCircularArrayQueue(CircularArrayQueue):
     """
-    Implementation of the queue data structure
-    using a python list for FIFO operations
+    CircularArrayQueue for numeric elements, stored unboxed in an
+    array.array of typecode (e.g. 'q' for int64, 'd' for float),
+    so each element takes itemsize bytes instead of a python object
+    plus a list slot. Elements come back as new python ints/floats.
+
+    Enqueuing a value that does not fit typecode raises TypeError
+    or OverflowError and leaves the queue unchanged.
     """
-    def __init__(self):
-        self._list = []
+    _blank = 0
+
+    def __init__(self, typecode, max_queue_size, overflow=CircularArrayQueue.OVERWRITE):
+        """
+        :param typecode: array module typecode of the elements
+        :param max_queue_size: max number of items we store in queue
+        (the initial size when overflow is GROW)
+        :param overflow: OVERWRITE, RAISE or GROW
+        :return:
+        """
+        self.typecode = typecode
+        # one-slot array used to check values before enqueue changes anything
+        self._check = array(typecode, (0,))
+        super().__init__(max_queue_size, overflow)
+
+    def _make_array(self, items):
+        return array(self.typecode, items)
+
+    def _clear(self, start, stop):
+        # slots hold no references
+        pass
 
     def enqueue(self, x):
         """
-        Add an element to the back of the queue
+        Add an element to the back of the queue.
+        :param x: number to add
+        :return:
+        :raise: TypeError or OverflowError if x does not fit typecode
+        :raise: QueueException if the queue is full and overflow is RAISE
+        """
+        self._check[0] = x
+        super().enqueue(x)
+
+    def dequeue_many(self, n):
+        """
+        Remove and return up to n elements from the front of the queue
+        :param n: max number of elements to dequeue
+        :return: list of elements, front first; empty if queue is empty
+        """
+        items = super().dequeue_many(n)
+        return items.tolist() if items else []
+
+    def snapshot(self):
+        """
+        Return zero-copy views of the queued elements, front first.
+        The ring can wrap, so the elements are split over at most two
+        views; the second is empty if they are contiguous. The views
+        show later changes to the slots until the queue is resized
+        (GROW policy); a resize moves the elements to a new array, and
+        older views are left on the stale one. Release them when done.
+        :return: tuple of two memoryviews
+        """
+        view = memoryview(self._array)
+        front = self._front_index
+        end = front + self._count
+        if end <= self._max_queue_size:
+            return view[front:end], view[0:0]
+        return view[front:], view[:end - self._max_queue_size]
+
+
+# ----------------------------------------
+# Implementation: SPSCCircularArrayQueue
+# ----------------------------------------
+class SPSCCircularArrayQueue(QueueABC):
+    """
+    Bounded ring for exactly one producer thread and one consumer
+    thread, with no lock.
+
+    _rear_index and _front_index are ever-increasing counts of
+    enqueued and dequeued elements (the array slot is the count
+    modulo max_queue_size), and the size is their difference.
+    Only the producer (enqueue, enqueue_many) writes _rear_index and
+    only the consumer (dequeue, dequeue_many, first) writes _front_index.
+    Each side stores its slots before publishing its index with a
+    single attribute store, which is atomic in CPython (with or without
+    the GIL), so the other side never sees a half-written element.
+
+    enqueue raises QueueException when full and dequeue when empty;
+    callers poll is_full/is_empty rather than waiting.
+    """
+    def __init__(self, max_queue_size):
+        """
+        :param max_queue_size: max number of items we store in queue
+        """
+        if max_queue_size <= 0:
+            raise QueueException("Max_queue_size must be > 0")
+
+        self._max_queue_size = max_queue_size
+        self._array = [None]*max_queue_size
+        # number of elements ever dequeued; consumer only
+        self._front_index = 0
+        # number of elements ever enqueued; producer only
+        self._rear_index = 0
+
+    def enqueue(self, x):
+        """
+        Add an element to the back of the queue. Producer only.
         :param x: object to add
         :return:
-        :raise: TypeError if nothing is queued
+        :raise: QueueException if queue is full
         """
-        self._list.append(x)
+        rear = self._rear_index
+        if rear - self._front_index >= self._max_queue_size:
+            raise QueueException("Cannot enqueue to full queue")
+        self._array[rear % self._max_queue_size] = x
+        # publish only after the element is stored
+        self._rear_index = rear + 1
+
+    def enqueue_many(self, xs):
+        """
+        Add each element of xs to the back of the queue,
+        publishing them all at once. Producer only.
+        :param xs: iterable of objects to add
+        :return:
+        :raise: QueueException if not all elements fit; none are added
+        """
+        xs = list(xs)
+        k = len(xs)
+        rear = self._rear_index
+        if rear - self._front_index + k > self._max_queue_size:
+            raise QueueException("Cannot enqueue to full queue")
+
+        start = rear % self._max_queue_size
+        head = min(k, self._max_queue_size - start)
+        self._array[start:start + head] = xs[:head]
+        if head < k:
+            self._array[:k - head] = xs[head:]
+        self._rear_index = rear + k
 
     def dequeue(self):
         """
-        Remove and return the element at the front of the queue
-        :return: element at front
+        Remove and return the first element in the queue. Consumer only.
+        :return: first element
         :raise: QueueException if empty queue
         """
-        try:
-            return self._list.pop(0)
-        except IndexError:
+        front = self._front_index
+        if self._rear_index == front:
             raise QueueException("Cannot dequeue from empty queue")
+        i = front % self._max_queue_size
+        ret = self._array[i]
+        self._array[i] = None
+        # publish only after the slot is released
+        self._front_index = front + 1
+        return ret
+
+    def dequeue_many(self, n):
+        """
+        Remove and return up to n elements from the front of the queue,
+        releasing their slots all at once. Consumer only.
+        :param n: max number of elements to dequeue
+        :return: list of elements, front first; empty if queue is empty
+        """
+        front = self._front_index
+        k = min(n, self._rear_index - front)
+        if k <= 0:
+            return []
+
+        start = front % self._max_queue_size
+        head = min(k, self._max_queue_size - start)
+        items = self._array[start:start + head]
+        self._array[start:start + head] = [None]*head
+        if head < k:
+            items.extend(self._array[:k - head])
+            self._array[:k - head] = [None]*(k - head)
+        self._front_index = front + k
+        return items
 
     def first(self):
         """
-        Examine and return the element at the front of the queue
-        :return:
+        Examine and return the element at the front of the queue. Consumer only.
+        :return: first element
         :raise: QueueException if empty queue
         """
-        try:
-            return self._list[0]
-        except IndexError:
+        front = self._front_index
+        if self._rear_index == front:
             raise QueueException("Cannot fetch first from empty queue")
+        return self._array[front % self._max_queue_size]
 
     def is_empty(self):
         """
         Return true if queue is empty else False
         :return: True or False
         """
-        return True if len(self._list) == 0 else False
+        return self._rear_index == self._front_index
+
+    def is_full(self):
+        """
+        Return true if the queue is full.
+        :return: True or False
+        """
+        return self._rear_index - self._front_index >= self._max_queue_size
 
     def __len__(self):
         """
         Return the length of the queue
         :return: number of elements
         """
-        return len(self._list)
+        return self.size()
 
     def size(self):
         """
-        Return the number of elements in the queue
+        Return the number of elements in the queue. From the other
+        thread this is a snapshot that may already be out of date.
         :return: number of elements
         """
-        return len(self._list)
+        # read front first: rear only grows, so the difference is never negative
+        front = self._front_index
+        return min(self._rear_index - front, self._max_queue_size)
+
+    @property
+    def max_queue_size(self):
+        return self._max_queue_size
 
 
 # ----------------------------------------
-# Implementation: LinkedListQueue
+# Implementation: SharedMemoryCircularArrayQueue
 # ----------------------------------------
-class LinkedListQueue(QueueABC):
+class SharedMemoryCircularArrayQueue(QueueABC):
     """
-    Implementation of the queue data structure
-    using a linked list for FIFO operations
+    Bounded ring stored in a multiprocessing.shared_memory segment,
+    so several processes can enqueue and dequeue without pickling.
+
+    The segment holds a header with the number of elements ever
+    dequeued and enqueued (front and rear counts), followed by
+    max_queue_size fixed-size slots. Elements are either:
+    --bytes of at most slot_size bytes (stored with a length prefix), or
+    --tuples packed with struct format record_format
+    A multiprocessing lock guards each operation, so any number of
+    producer and consumer processes may share the queue.
+
+    Pass the queue to child processes as a Process argument; it
+    re-attaches to the same segment by name. The creating process
+    should call unlink() once every process is done with the queue.
     """
-    def __init__(self):
-        self._list = LinkedList()
+    _HEADER = struct.Struct('<qq')
+    _LENGTH = struct.Struct('<I')
 
-    def first(self):
+    def __init__(self, max_queue_size, slot_size=None, record_format=None,
+                 name=None, lock=None):
         """
-        Examine and return the element at the front of the queue
-        :return: first element
-        :raise: QueueException if empty queue
+        :param max_queue_size: max number of items we store in queue
+        :param slot_size: max size in bytes of a bytes element
+        :param record_format: struct format of a tuple element;
+        give either slot_size or record_format
+        :param name: name of an existing segment to attach to;
+        None creates a new segment
+        :param lock: multiprocessing lock shared by all users of the queue;
+        None creates a new lock
         """
-        # if there is nothing in the queue then raise an exception
-        if self.is_empty():
-            raise QueueException("Cannot fetch first from empty queue")
-        return self._list.first.element
+        if max_queue_size <= 0:
+            raise QueueException("Max_queue_size must be > 0")
+        if (slot_size is None) == (record_format is None):
+            raise QueueException("Give exactly one of slot_size or record_format")
+
+        self._max_queue_size = max_queue_size
+        self._slot_size = slot_size
+        self._record_format = record_format
+        if record_format is not None:
+            self._record = struct.Struct(record_format)
+            self._stride = self._record.size
+            self._fields = len(self._record.unpack_from(bytes(self._stride)))
+            # Structs for runs of k records, packed with one call
+            self._runs = {}
+        else:
+            if slot_size <= 0:
+                raise QueueException("Slot_size must be > 0")
+            self._record = None
+            self._stride = self._LENGTH.size + slot_size
+
+        if name is None:
+            size = self._HEADER.size + max_queue_size*self._stride
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._HEADER.pack_into(self._shm.buf, 0, 0, 0)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._lock = lock if lock is not None else multiprocessing.Lock()
+
+    def __reduce__(self):
+        # attach to the same segment (and share the lock) when sent to a process
+        return (self.__class__, (self._max_queue_size, self._slot_size, self._record_format,
+                                 self._shm.name, self._lock))
+
+    @property
+    def name(self):
+        """
+        Name of the shared memory segment
+        """
+        return self._shm.name
+
+    def _offset(self, count):
+        return self._HEADER.size + (count % self._max_queue_size)*self._stride
+
+    def _write(self, count, x):
+        """
+        Store element x in the slot for count
+        """
+        offset = self._offset(count)
+        buf = self._shm.buf
+        if self._record is not None:
+            self._record.pack_into(buf, offset, *x)
+        else:
+            size = len(x)
+            if size > self._slot_size:
+                raise QueueException("Element of {0} bytes does not fit in a {1} byte slot"
+                                     .format(size, self._slot_size))
+            self._LENGTH.pack_into(buf, offset, size)
+            start = offset + self._LENGTH.size
+            buf[start:start + size] = x
+
+    def _read(self, count):
+        """
+        Return the element in the slot for count
+        """
+        offset = self._offset(count)
+        buf = self._shm.buf
+        if self._record is not None:
+            return self._record.unpack_from(buf, offset)
+        size = self._LENGTH.unpack_from(buf, offset)[0]
+        start = offset + self._LENGTH.size
+        return bytes(buf[start:start + size])
+
+    def _run_struct(self, k):
+        """
+        Return a Struct that packs k consecutive records
+        """
+        run = self._runs.get(k)
+        if run is None:
+            fmt = self._record.format
+            byte_order = fmt[0] if fmt[:1] in '@=<>!' else ''
+            run = self._runs[k] = struct.Struct(byte_order + fmt[len(byte_order):]*k)
+        return run
+
+    def _runs_between(self, count, k):
+        """
+        Split k slots starting at count into runs that do not wrap
+        :return: list of (count, length) pairs
+        """
+        head = min(k, self._max_queue_size - count % self._max_queue_size)
+        runs = [(count, head)]
+        if head < k:
+            runs.append((count + head, k - head))
+        return runs
+
+    def _write_many(self, count, xs):
+        """
+        Store the elements of xs in consecutive slots from count
+        """
+        if self._record is None:
+            for i, x in enumerate(xs):
+                self._write(count + i, x)
+            return
+
+        done = 0
+        for start, k in self._runs_between(count, len(xs)):
+            values = [v for x in xs[done:done + k] for v in x]
+            self._run_struct(k).pack_into(self._shm.buf, self._offset(start), *values)
+            done += k
+
+    def _read_many(self, count, k):
+        """
+        Return the elements of k consecutive slots from count
+        """
+        if self._record is None:
+            return [self._read(count + i) for i in range(k)]
+
+        fields = self._fields
+        items = []
+        for start, length in self._runs_between(count, k):
+            values = iter(self._run_struct(length).unpack_from(self._shm.buf, self._offset(start)))
+            items.extend(zip(*[values]*fields))
+        return items
 
     def enqueue(self, x):
         """
-        Add an element to the back of the queue.
-        :param x: object to add
+        Add an element to the back of the queue
+        :param x: bytes, or a tuple matching record_format
         :return:
-        :raise: TypeError if nothing is queued
+        :raise: QueueException if queue is full or x does not fit in a slot
         """
-        self._list.insert_last(x)
+        with self._lock:
+            front, rear = self._HEADER.unpack_from(self._shm.buf, 0)
+            if rear - front >= self._max_queue_size:
+                raise QueueException("Cannot enqueue to full queue")
+            self._write(rear, x)
+            self._HEADER.pack_into(self._shm.buf, 0, front, rear + 1)
 
-    def __len__(self):
+    def enqueue_many(self, xs):
         """
-        Return the length of the queue
-        :return: number of elements
+        Add each element of xs to the back of the queue, under one lock
+        :param xs: iterable of elements
+        :return:
+        :raise: QueueException if not all elements fit; none are added
         """
-        return len(self._list)
+        xs = list(xs)
+        with self._lock:
+            front, rear = self._HEADER.unpack_from(self._shm.buf, 0)
+            if rear - front + len(xs) > self._max_queue_size:
+                raise QueueException("Cannot enqueue to full queue")
+            self._write_many(rear, xs)
+            self._HEADER.pack_into(self._shm.buf, 0, front, rear + len(xs))
+
+    def dequeue(self):
+        """
+        Remove and return the first element in the queue
+        :return: first element
+        :raise: QueueException if empty queue
+        """
+        with self._lock:
+            front, rear = self._HEADER.unpack_from(self._shm.buf, 0)
+            if rear == front:
+                raise QueueException("Cannot dequeue from empty queue")
+            ret = self._read(front)
+            self._HEADER.pack_into(self._shm.buf, 0, front + 1, rear)
+            return ret
+
+    def dequeue_many(self, n):
+        """
+        Remove and return up to n elements from the front of the queue, under one lock
+        :param n: max number of elements to dequeue
+        :return: list of elements, front first; empty if queue is empty
+        """
+        with self._lock:
+            front, rear = self._HEADER.unpack_from(self._shm.buf, 0)
+            k = max(min(n, rear - front), 0)
+            items = self._read_many(front, k) if k else []
+            self._HEADER.pack_into(self._shm.buf, 0, front + k, rear)
+            return items
+
+    def first(self):
+        """
+        Examine and return the element at the front of the queue
+        :return: first element
+        :raise: QueueException if empty queue
+        """
+        with self._lock:
+            front, rear = self._HEADER.unpack_from(self._shm.buf, 0)
+            if rear == front:
+                raise QueueException("Cannot fetch first from empty queue")
+            return self._read(front)
 
     def size(self):
         """
         Return the number of elements in the queue
         :return: number of elements
         """
-        return len(self._list)
+        with self._lock:
+            front, rear = self._HEADER.unpack_from(self._shm.buf, 0)
+        return rear - front
 
-    def dequeue(self):
+    def __len__(self):
         """
-        Remove and return the first element in the queue
-        :return: first element
+        Return the length of the queue
+        :return: number of elements
         """
-        # if there is nothing in the queue then raise an exception
-        if self.is_empty():
-            raise QueueException("Cannot dequeue from empty queue")
-
-        return self._list.delete_first()
+        return self.size()
 
     def is_empty(self):
         """
         Return true if queue is empty else False
         :return: True or False
         """
-        return True if len(self._list) == 0 else False
+        return self.size() == 0
+
+    def is_full(self):
+        """
+        Return true if the queue is full.
+        :return: True or False
+        """
+        return self.size() >= self._max_queue_size
+
+    @property
+    def max_queue_size(self):
+        return self._max_queue_size
+
+    def close(self):
+        """
+        Detach this process from the shared memory segment
+        """
+        self._shm.close()
+
+    def unlink(self):
+        """
+        Close and destroy the shared memory segment.
+        Call once, from the creating process, when all users are done.
+        """
+        self._shm.close()
+        self._shm.unlink()
+
+
+# ----------------------------------------
+# Implementation: Python List Queue
+# ----------------------------------------
+class PythonListQueue(QueueABC):
+    """
+    Implementation of the queue data structure
+    using a python list for FIFO operations
+    """
+    def __init__(self):
+        self._list = []
 
+    def enqueue(self, x):
+        """
+        Add an element to the back of the queue
+        :param x: object to add
+        :return:
+        :raise: TypeError if nothing is queued
+        """
+        self._list.append(x)
+
+    def dequeue(self):
+        """
+        Remove and return the element at the front of the queue
+        :return: element at front
+        :raise: QueueException if empty queue
+        """
+        try:
+            return self._list.pop(0)
+        except IndexError:
+            raise QueueException("Cannot dequeue from empty queue")
+
+    def enqueue_many(self, xs):
+        """
+        Add each element of xs to the back of the queue, in order
+        :param xs: iterable of objects to add
+        :return:
+        """
+        self._list.extend(xs)
+
+    def dequeue_many(self, n):
+        """
+        Remove and return up to n elements from the front of the queue
+        :param n: max number of elements to dequeue
+        :return: list of elements, front first; empty if queue is empty
+        """
+        n = max(n, 0)
+        items = self._list[:n]
+        del self._list[:n]
+        return items
+
+    def first(self):
+        """
+        Examine and return the element at the front of the queue
+        :return:
+        :raise: QueueException if empty queue
+        """
+        try:
+            return self._list[0]
+        except IndexError:
+            raise QueueException("Cannot fetch first from empty queue")
+
+    def is_empty(self):
+        """
+        Return true if queue is empty else False
+        :return: True or False
+        """
+        return True if len(self._list) == 0 else False
+
+    def __len__(self):
+        """
+        Return the length of the queue
+        :return: number of elements
+        """
+        return len(self._list)
+
+    def size(self):
+        """
+        Return the number of elements in the queue
+        :return: number of elements
+        """
+        return len(self._list)
+
+
+# ----------------------------------------
+# Implementation: LinkedListQueue
+# ----------------------------------------
+class LinkedListQueue(QueueABC):
+    """
+    Implementation of the queue data structure
+    using a linked list for FIFO operations
+    """
+    def __init__(self, backend=LinkedList):
+        """
+        :param backend: linked list class used for storage,
+        e.g. LinkedList or UnrolledLinkedList
+        """
+        self._list = backend()
+
+    def first(self):
+        """
+        Examine and return the element at the front of the queue
+        :return: first element
+        :raise: QueueException if empty queue
+        """
+        # if there is nothing in the queue then raise an exception
+        if self.is_empty():
+            raise QueueException("Cannot fetch first from empty queue")
+        return self._list.peek_first()
+
+    def enqueue(self, x):
+        """
+        Add an element to the back of the queue.
+        :param x: object to add
+        :return:
+        :raise: TypeError if nothing is queued
+        """
+        self._list.insert_last(x)
+
+    def enqueue_many(self, xs):
+        """
+        Add each element of xs to the back of the queue, in order.
+        The nodes are chained together and spliced on once.
+        :param xs: iterable of objects to add
+        :return:
+        """
+        self._list.insert_last_many(xs)
+
+    def __len__(self):
+        """
+        Return the length of the queue
+        :return: number of elements
+        """
+        return len(self._list)
+
+    def size(self):
+        """
+        Return the number of elements in the queue
+        :return: number of elements
+        """
+        return len(self._list)
+
+    def dequeue(self):
+        """
+        Remove and return the first element in the queue
+        :return: first element
+        """
+        # if there is nothing in the queue then raise an exception
+        if self.is_empty():
+            raise QueueException("Cannot dequeue from empty queue")
+
+        return self._list.delete_first()
+
+    def dequeue_many(self, n):
+        """
+        Remove and return up to n elements from the front of the queue
+        :param n: max number of elements to dequeue
+        :return: list of elements, front first; empty if queue is empty
+        """
+        return self._list.delete_first_many(n)
+
+    def is_empty(self):
+        """
+        Return true if queue is empty else False
+        :return: True or False
+        """
+        return True if len(self._list) == 0 else False
+
+
+# ----------------------------------------
+# Implementation: BlockingQueue
+# ----------------------------------------
+class BlockingQueue(QueueABC):
+    """
+    Thread-safe wrapper around another QueueABC for
+    producer/consumer threads.
+
+    put and get block (optionally with a timeout) while the queue
+    is full or empty, using not_full/not_empty condition variables
+    that share one lock. enqueue and dequeue never block; they raise
+    QueueException instead, as the other queues do.
+    """
+    def __init__(self, queue, max_size=None):
+        """
+        :param queue: QueueABC instance used for storage;
+        it must not be used directly once wrapped
+        :param max_size: max number of elements, or None for unbounded
+        """
+        if max_size is not None and max_size <= 0:
+            raise QueueException("Max_size must be > 0")
+
+        self._queue = queue
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def _has_space(self):
+        return self._max_size is None or self._queue.size() < self._max_size
+
+    def _has_items(self):
+        return not self._queue.is_empty()
+
+    @staticmethod
+    def _wait(condition, predicate, block, timeout):
+        """
+        Wait on condition until predicate is true
+        The condition's lock must be held.
+        :return: True if predicate is true, False on timeout or if not blocking
+        """
+        if predicate():
+            return True
+        if not block:
+            return False
+        return condition.wait_for(predicate, timeout)
+
+    def put(self, x, block=True, timeout=None):
+        """
+        Add an element to the back of the queue,
+        waiting for space if the queue is full
+        :param x: object to add
+        :param block: if False, do not wait for space
+        :param timeout: max seconds to wait, or None to wait forever
+        :return:
+        :raise: QueueException if there is no space after waiting
+        """
+        with self._not_full:
+            if not self._wait(self._not_full, self._has_space, block, timeout):
+                raise QueueException("Cannot put to full queue")
+            self._queue.enqueue(x)
+            self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        """
+        Remove and return the element at the front of the queue,
+        waiting for an element if the queue is empty
+        :param block: if False, do not wait for an element
+        :param timeout: max seconds to wait, or None to wait forever
+        :return: element at front
+        :raise: QueueException if there is no element after waiting
+        """
+        with self._not_empty:
+            if not self._wait(self._not_empty, self._has_items, block, timeout):
+                raise QueueException("Cannot get from empty queue")
+            x = self._queue.dequeue()
+            self._not_full.notify()
+            return x
+
+    def get_many(self, n, block=True, timeout=None):
+        """
+        Remove and return up to n elements from the front of the queue,
+        waiting until at least one element is available
+        :param n: max number of elements to get
+        :param block: if False, do not wait for an element
+        :param timeout: max seconds to wait, or None to wait forever
+        :return: list of elements, front first
+        :raise: QueueException if there is no element after waiting
+        """
+        with self._not_empty:
+            if not self._wait(self._not_empty, self._has_items, block, timeout):
+                raise QueueException("Cannot get from empty queue")
+            items = self._queue.dequeue_many(n)
+            self._not_full.notify(len(items))
+            return items
+
+    def enqueue(self, x):
+        """
+        Add an element to the back of the queue without waiting
+        :param x: object to add
+        :return:
+        :raise: QueueException if queue is full
+        """
+        self.put(x, block=False)
+
+    def dequeue(self):
+        """
+        Remove and return the element at the front of the queue without waiting
+        :return: element at front
+        :raise: QueueException if empty queue
+        """
+        return self.get(block=False)
+
+    def enqueue_many(self, xs):
+        """
+        Add each element of xs to the back of the queue without waiting
+        :param xs: iterable of objects to add
+        :return:
+        :raise: QueueException if not all elements fit; none are added
+        """
+        xs = list(xs)
+        with self._lock:
+            if self._max_size is not None and self._queue.size() + len(xs) > self._max_size:
+                raise QueueException("Cannot enqueue to full queue")
+            self._queue.enqueue_many(xs)
+            self._not_empty.notify(len(xs))
+
+    def dequeue_many(self, n):
+        """
+        Remove and return up to n elements from the front of the queue without waiting
+        :param n: max number of elements to dequeue
+        :return: list of elements, front first; empty if queue is empty
+        """
+        with self._lock:
+            items = self._queue.dequeue_many(n)
+            self._not_full.notify(len(items))
+            return items
+
+    def first(self):
+        """
+        Examine and return the element at the front of the queue
+        :return: first element
+        :raise: QueueException if empty queue
+        """
+        with self._lock:
+            return self._queue.first()
+
+    def is_empty(self):
+        """
+        Return true if queue is empty else False
+        :return: True or False
+        """
+        with self._lock:
+            return self._queue.is_empty()
+
+    def is_full(self):
+        """
+        Return true if the queue is bounded and full.
+        :return: True or False
+        """
+        with self._lock:
+            return not self._has_space()
+
+    def __len__(self):
+        """
+        Return the length of the queue
+        :return: number of elements
+        """
+        return self.size()
+
+    def size(self):
+        """
+        Return the number of elements in the queue
+        :return: number of elements
+        """
+        with self._lock:
+            return self._queue.size()
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+
+class BlockingCircularArrayQueue(BlockingQueue):
+    """
+    Bounded thread-safe queue stored in a CircularArrayQueue ring
+    """
+    def __init__(self, max_queue_size):
+        """
+        :param max_queue_size: max number of items we store in queue
+        """
+        super(BlockingCircularArrayQueue, self).__init__(
+            CircularArrayQueue(max_queue_size, overflow=CircularArrayQueue.RAISE),
+            max_size=max_queue_size)
+
+
+class BlockingLinkedListQueue(BlockingQueue):
+    """
+    Thread-safe queue stored in a LinkedListQueue,
+    unbounded unless max_size is given
+    """
+    def __init__(self, max_size=None, backend=LinkedList):
+        """
+        :param max_size: max number of elements, or None for unbounded
+        :param backend: linked list class used for storage
+        """
+        super(BlockingLinkedListQueue, self).__init__(
+            LinkedListQueue(backend=backend), max_size=max_size)
+
+
+# ----------------------------------------
+# Implementation: AsyncCircularArrayQueue
+# ----------------------------------------
+class AsyncCircularArrayQueue(QueueABC):
+    """
+    Bounded asyncio queue stored in a CircularArrayQueue ring.
+    Not thread-safe; use it from a single event loop.
+
+    enqueue, enqueue_many, dequeue and dequeue_many are coroutines:
+    enqueue waits while the queue is full (backpressure) and dequeue
+    waits while it is empty. Waiting coroutines park on plain futures,
+    woken in FIFO order. enqueue_nowait and dequeue_nowait raise
+    QueueException instead of waiting.
+    """
+    def __init__(self, max_queue_size):
+        """
+        :param max_queue_size: max number of items we store in queue
+        """
+        self._queue = CircularArrayQueue(max_queue_size, overflow=CircularArrayQueue.RAISE)
+        # futures of coroutines waiting for an element / for space
+        self._getters = deque()
+        self._putters = deque()
+
+    @staticmethod
+    def _wakeup_next(waiters, n=1):
+        """
+        Wake up to n waiting coroutines, skipping cancelled ones
+        """
+        while waiters and n > 0:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                n -= 1
+
+    async def _wait(self, waiters, ready, timeout=None):
+        """
+        Wait until ready() is true
+        :param waiters: deque to park our future in
+        :param ready: callable, True once we can proceed
+        :param timeout: max seconds to wait, or None to wait forever
+        :return: True if ready, False on timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not ready():
+            timer = None
+            waiter = loop.create_future()
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                timer = loop.call_later(remaining, self._expire, waiter)
+            waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                # pass on a wakeup we may have swallowed
+                if ready():
+                    self._wakeup_next(waiters)
+                raise
+            finally:
+                if timer is not None:
+                    timer.cancel()
+                    # an expired waiter is still parked; drop it
+                    try:
+                        waiters.remove(waiter)
+                    except ValueError:
+                        pass
+        return True
+
+    @staticmethod
+    def _expire(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def _has_space(self):
+        return not self._queue.is_full()
+
+    def _has_items(self):
+        return not self._queue.is_empty()
+
+    def enqueue_nowait(self, x):
+        """
+        Add an element to the back of the queue without waiting
+        :param x: object to add
+        :return:
+        :raise: QueueException if queue is full
+        """
+        self._queue.enqueue(x)
+        self._wakeup_next(self._getters)
+
+    def dequeue_nowait(self):
+        """
+        Remove and return the element at the front of the queue without waiting
+        :return: element at front
+        :raise: QueueException if empty queue
+        """
+        x = self._queue.dequeue()
+        self._wakeup_next(self._putters)
+        return x
+
+    async def enqueue(self, x):
+        """
+        Add an element to the back of the queue,
+        waiting for space if the queue is full
+        :param x: object to add
+        :return:
+        """
+        if self._queue.is_full():
+            await self._wait(self._putters, self._has_space)
+        self._queue.enqueue(x)
+        if self._getters:
+            self._wakeup_next(self._getters)
+
+    async def dequeue(self):
+        """
+        Remove and return the element at the front of the queue,
+        waiting for an element if the queue is empty
+        :return: element at front
+        """
+        if self._queue.is_empty():
+            await self._wait(self._getters, self._has_items)
+        x = self._queue.dequeue()
+        if self._putters:
+            self._wakeup_next(self._putters)
+        return x
+
+    async def enqueue_many(self, xs):
+        """
+        Add each element of xs to the back of the queue, in order,
+        copying as many as fit into the ring at a time and
+        waiting for space in between
+        :param xs: iterable of objects to add
+        :return:
+        """
+        xs = list(xs)
+        start = 0
+        while start < len(xs):
+            await self._wait(self._putters, self._has_space)
+            free = self._queue.max_queue_size - self._queue.size()
+            batch = xs[start:start + free]
+            self._queue.enqueue_many(batch)
+            start += len(batch)
+            self._wakeup_next(self._getters, len(batch))
+
+    async def dequeue_many(self, n, timeout=None):
+        """
+        Remove and return up to n elements from the front of the queue,
+        waiting up to timeout seconds for at least one element
+        :param n: max number of elements to dequeue
+        :param timeout: max seconds to wait, or None to wait forever
+        :return: list of elements, front first; empty on timeout
+        """
+        if n <= 0 or not await self._wait(self._getters, self._has_items, timeout):
+            return []
+        items = self._queue.dequeue_many(n)
+        self._wakeup_next(self._putters, len(items))
+        if self._has_items():
+            self._wakeup_next(self._getters)
+        return items
+
+    def first(self):
+        """
+        Examine and return the element at the front of the queue
+        :return: first element
+        :raise: QueueException if empty queue
+        """
+        return self._queue.first()
+
+    def is_empty(self):
+        """
+        Return true if queue is empty else False
+        :return: True or False
+        """
+        return self._queue.is_empty()
+
+    def is_full(self):
+        """
+        Return true if the queue is full.
+        :return: True or False
+        """
+        return self._queue.is_full()
+
+    def __len__(self):
+        """
+        Return the length of the queue
+        :return: number of elements
+        """
+        return self._queue.size()
+
+    def size(self):
+        """
+        Return the number of elements in the queue
+        :return: number of elements
+        """
+        return self._queue.size()
+
+    @property
+    def max_queue_size(self):
+        return self._queue.max_queue_size
+
+
+# ----------------------------------------
+# Implementation: PersistentQueue
+# ----------------------------------------
+class PersistentQueue(QueueABC):
+    """
+    Disk-backed queue of bytes elements that survives crashes.
+
+    Every element is appended to a log of segment files in directory
+    (a new segment is started once one reaches segment_size bytes);
+    records carry a crc32 so a torn final write is detected and dropped.
+    A hot CircularArrayQueue ring holds elements in memory while they
+    fit in max_memory_bytes. Past that budget new elements are only on
+    disk (spilled), and dequeue reads them back with sequential
+    read-ahead through mmap, refilling the ring up to the budget.
+
+    Dequeued elements stay on disk until ack() is called. After a
+    crash (or close() without ack), reopening the directory redelivers
+    every element that was enqueued but not acknowledged.
+    """
+    _RECORD = struct.Struct('<II')
+    _CURSOR = struct.Struct('<qq')
+    _SUFFIX = '.seg'
+
+    def __init__(self, directory, max_memory_bytes=64*1024*1024,
+                 segment_size=64*1024*1024, sync=False):
+        """
+        :param directory: directory for the segment files and ack cursor
+        :param max_memory_bytes: budget for elements held in memory
+        :param segment_size: size in bytes at which a new segment is started
+        :param sync: if True, fsync after every write (survives power loss,
+        not just process crashes)
+        """
+        if max_memory_bytes <= 0 or segment_size <= 0:
+            raise QueueException("Max_memory_bytes and segment_size must be > 0")
+
+        self._directory = directory
+        self._max_memory_bytes = max_memory_bytes
+        self._segment_size = segment_size
+        self._sync = sync
+
+        # elements in memory, as (element, position after its record)
+        self._ring = CircularArrayQueue(1024, overflow=CircularArrayQueue.GROW)
+        self._memory_bytes = 0
+        # number of elements on disk that are not in the ring
+        self._spilled = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    def _segment_path(self, segment):
+        return os.path.join(self._directory, '{0:020d}{1}'.format(segment, self._SUFFIX))
+
+    def _ack_path(self):
+        return os.path.join(self._directory, 'ack')
+
+    def _scan(self, segment, offset):
+        """
+        Count the valid records of a segment from offset
+        :return: (number of records, offset after the last valid record)
+        """
+        count = 0
+        with open(self._segment_path(segment), 'rb') as f:
+            data = f.read()
+        while offset + self._RECORD.size <= len(data):
+            size, crc = self._RECORD.unpack_from(data, offset)
+            start = offset + self._RECORD.size
+            if start + size > len(data) or zlib.crc32(data[start:start + size]) != crc:
+                break
+            count += 1
+            offset = start + size
+        return count, offset
+
+    def _recover(self):
+        """
+        Rebuild the queue from the segment files and the ack cursor,
+        dropping torn records and segments that are fully acknowledged
+        """
+        segments = sorted(int(name[:-len(self._SUFFIX)]) for name in os.listdir(self._directory)
+                          if name.endswith(self._SUFFIX))
+
+        # position of the first unacknowledged record
+        cursor = (segments[0] if segments else 0, 0)
+        if os.path.exists(self._ack_path()):
+            with open(self._ack_path(), 'rb') as f:
+                cursor = self._CURSOR.unpack(f.read())
+
+        for segment in segments:
+            if segment < cursor[0]:
+                os.remove(self._segment_path(segment))
+                continue
+            size = os.path.getsize(self._segment_path(segment))
+            if size == 0 and segment != cursor[0]:
+                # left behind by a previous open that wrote nothing
+                os.remove(self._segment_path(segment))
+                continue
+            offset = cursor[1] if segment == cursor[0] else 0
+            count, end = self._scan(segment, offset)
+            if end < size:
+                # torn write at the end of the segment
+                with open(self._segment_path(segment), 'r+b') as f:
+                    f.truncate(end)
+            self._spilled += count
+
+        # every element is on disk; none are in memory yet
+        self._ack_cursor = self._read_cursor = self._disk_cursor = cursor
+        self._first_segment = cursor[0]
+
+        # always append to a fresh segment
+        self._write_segment = max(segments[-1] if segments else 0, cursor[0]) + 1
+        self._write_offset = 0
+        self._writer = open(self._segment_path(self._write_segment), 'ab')
+
+    def _append(self, xs):
+        """
+        Append records for the elements of xs to the log,
+        starting a new segment whenever one reaches segment_size
+        :return: list of positions after each record
+        """
+        positions = []
+        chunks = []
+        for x in xs:
+            chunks.append(self._RECORD.pack(len(x), zlib.crc32(x)))
+            chunks.append(x)
+            self._write_offset += self._RECORD.size + len(x)
+            positions.append((self._write_segment, self._write_offset))
+            if self._write_offset >= self._segment_size:
+                self._write(chunks)
+                chunks = []
+                self._writer.close()
+                self._write_segment += 1
+                self._write_offset = 0
+                self._writer = open(self._segment_path(self._write_segment), 'ab')
+        if chunks:
+            self._write(chunks)
+        return positions
+
+    def _write(self, chunks):
+        """
+        Write chunks to the current segment and flush them to the OS
+        """
+        self._writer.write(b''.join(chunks))
+        self._writer.flush()
+        if self._sync:
+            os.fsync(self._writer.fileno())
+
+    def _hold(self, x, position):
+        """
+        Keep a newly appended element in memory if nothing is spilled
+        and it fits in the budget, else leave it on disk only
+        """
+        if self._spilled == 0 and self._memory_bytes + len(x) <= self._max_memory_bytes:
+            self._ring.enqueue((x, position))
+            self._memory_bytes += len(x)
+            self._disk_cursor = position
+        else:
+            self._spilled += 1
+
+    @staticmethod
+    def _as_bytes(x):
+        if not isinstance(x, (bytes, bytearray, memoryview)):
+            raise QueueException("PersistentQueue elements must be bytes")
+        return bytes(x)
+
+    def enqueue(self, x):
+        """
+        Add an element to the back of the queue, writing it to disk first
+        :param x: bytes to add
+        :return:
+        :raise: QueueException if x is not bytes
+        """
+        x = self._as_bytes(x)
+        self._hold(x, self._append([x])[0])
+
+    def enqueue_many(self, xs):
+        """
+        Add each element of xs to the back of the queue with one disk write
+        :param xs: iterable of bytes
+        :return:
+        :raise: QueueException if an element is not bytes; none are added
+        """
+        xs = [self._as_bytes(x) for x in xs]
+        if not xs:
+            return
+        for x, position in zip(xs, self._append(xs)):
+            self._hold(x, position)
+
+    def _read_ahead(self):
+        """
+        Load spilled elements from disk into the ring, reading
+        segments sequentially, while they fit in the memory budget
+        (always at least one element)
+        """
+        segment, offset = self._disk_cursor
+        full = False
+        while self._spilled and not full:
+            path = self._segment_path(segment)
+            end = self._write_offset if segment == self._write_segment else \
+                (os.path.getsize(path) if os.path.exists(path) else 0)
+            if offset >= end:
+                segment, offset = segment + 1, 0
+                continue
+
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                while self._spilled and offset < end:
+                    size = self._RECORD.unpack_from(data, offset)[0]
+                    if not self._ring.is_empty() and self._memory_bytes + size > self._max_memory_bytes:
+                        full = True
+                        break
+                    start = offset + self._RECORD.size
+                    offset = start + size
+                    self._ring.enqueue((data[start:offset], (segment, offset)))
+                    self._memory_bytes += size
+                    self._spilled -= 1
+
+        self._disk_cursor = (segment, offset)
+
+    def dequeue(self):
+        """
+        Remove and return the element at the front of the queue.
+        It stays on disk until ack() is called.
+        :return: element at front
+        :raise: QueueException if empty queue
+        """
+        if self._ring.is_empty():
+            if not self._spilled:
+                raise QueueException("Cannot dequeue from empty queue")
+            self._read_ahead()
+
+        x, position = self._ring.dequeue()
+        self._memory_bytes -= len(x)
+        self._read_cursor = position
+        return x
+
+    def first(self):
+        """
+        Examine and return the element at the front of the queue
+        :return: first element
+        :raise: QueueException if empty queue
+        """
+        if self._ring.is_empty():
+            if not self._spilled:
+                raise QueueException("Cannot fetch first from empty queue")
+            self._read_ahead()
+        return self._ring.first()[0]
+
+    def ack(self):
+        """
+        Acknowledge every element dequeued so far: they will not be
+        redelivered after a restart, and fully consumed segments are deleted
+        """
+        if self._read_cursor == self._ack_cursor:
+            return
+
+        tmp_path = self._ack_path() + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self._CURSOR.pack(*self._read_cursor))
+            f.flush()
+            if self._sync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self._ack_path())
+        self._ack_cursor = self._read_cursor
+
+        for segment in range(self._first_segment, self._ack_cursor[0]):
+            path = self._segment_path(segment)
+            if os.path.exists(path):
+                os.remove(path)
+        self._first_segment = self._ack_cursor[0]
+
+    def close(self):
+        """
+        Close the segment file. Unacknowledged elements are
+        redelivered when the directory is opened again.
+        """
+        self._writer.close()
+
+    def is_empty(self):
+        """
+        Return true if queue is empty else False
+        :return: True or False
+        """
+        return self._ring.is_empty() and not self._spilled
+
+    def __len__(self):
+        """
+        Return the length of the queue
+        :return: number of elements
+        """
+        return self.size()
+
+    def size(self):
+        """
+        Return the number of elements in the queue
+        :return: number of elements
+        """
+        return self._ring.size() + self._spilled
+
+    @property
+    def memory_bytes(self):
+        """
+        Bytes of elements currently held in memory
+        """
+        return self._memory_bytes
+
+
+# ----------------------------------------
+# Implementation: HeapPriorityQueue
+# ----------------------------------------
+class HeapPriorityQueue(QueueABC):
+    """
+    Priority queue stored in an array-backed d-ary heap (binary by default).
+    dequeue returns the element with the smallest priority; equal
+    priorities come out in the order they were enqueued.
+    enqueue and dequeue are O(log n), first is O(1).
+
+    An indexed HeapPriorityQueue keeps each element's heap position
+    in a dict, so decrease_key is O(log n). It requires elements to
+    be hashable and unique.
+    """
+    def __init__(self, d=2, indexed=False):
+        """
+        :param d: number of children per heap node, >= 2
+        :param indexed: if True, maintain element positions for decrease_key
+        """
+        if d < 2:
+            raise QueueException("d must be >= 2")
+
+        self._d = d
+        # heap of [priority, sequence number, element] entries
+        self._heap = []
+        self._sequence = 0
+        self._positions = {} if indexed else None
+
+    def _sift_up(self, i):
+        """
+        Move the entry at i up until its parent is not larger
+        """
+        heap = self._heap
+        positions = self._positions
+        d = self._d
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) // d
+            if not entry < heap[parent]:
+                break
+            heap[i] = heap[parent]
+            if positions is not None:
+                positions[heap[i][2]] = i
+            i = parent
+        heap[i] = entry
+        if positions is not None:
+            positions[entry[2]] = i
+
+    def _sift_down(self, i):
+        """
+        Move the entry at i down until no child is smaller
+        """
+        heap = self._heap
+        positions = self._positions
+        d = self._d
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            first_child = d*i + 1
+            if first_child >= n:
+                break
+            # find the smallest child
+            child = first_child
+            for c in range(first_child + 1, min(first_child + d, n)):
+                if heap[c] < heap[child]:
+                    child = c
+            if not heap[child] < entry:
+                break
+            heap[i] = heap[child]
+            if positions is not None:
+                positions[heap[i][2]] = i
+            i = child
+        heap[i] = entry
+        if positions is not None:
+            positions[entry[2]] = i
+
+    def _entry(self, x, priority):
+        entry = [x if priority is None else priority, self._sequence, x]
+        self._sequence += 1
+        return entry
+
+    def enqueue(self, x, priority=None):
+        """
+        Add an element to the queue
+        :param x: object to add
+        :param priority: order-comparable priority; defaults to x itself
+        :return:
+        :raise: QueueException if indexed and x is already queued
+        """
+        if self._positions is not None and x in self._positions:
+            raise QueueException("Cannot enqueue element that is already queued")
+        self._heap.append(self._entry(x, priority))
+        self._sift_up(len(self._heap) - 1)
+
+    def enqueue_many(self, xs):
+        """
+        Add each element of xs to the queue, using their own values as
+        priorities. A large batch is added by re-heapifying in O(n).
+        :param xs: iterable of objects to add
+        :return:
+        :raise: QueueException if indexed and an element of xs is already
+        queued or repeated within xs; no elements are added in that case
+        """
+        xs = list(xs)
+        if self._positions is not None:
+            if len(set(xs)) != len(xs) or any(x in self._positions for x in xs):
+                raise QueueException("Cannot enqueue element that is already queued")
+        if len(xs) <= len(self._heap):
+            for x in xs:
+                self.enqueue(x)
+            return
+
+        self._heap.extend(self._entry(x, None) for x in xs)
+        for i in range((len(self._heap) - 2) // self._d, -1, -1):
+            self._sift_down(i)
+        if self._positions is not None:
+            for i, entry in enumerate(self._heap):
+                self._positions[entry[2]] = i
+
+    def dequeue(self):
+        """
+        Remove and return the element with the smallest priority
+        :return: element at front
+        :raise: QueueException if empty queue
+        """
+        heap = self._heap
+        if not heap:
+            raise QueueException("Cannot dequeue from empty queue")
+
+        entry = heap.pop()
+        if heap:
+            entry, heap[0] = heap[0], entry
+            self._sift_down(0)
+        if self._positions is not None:
+            del self._positions[entry[2]]
+        return entry[2]
+
+    def first(self):
+        """
+        Examine and return the element with the smallest priority
+        :return: first element
+        :raise: QueueException if empty queue
+        """
+        if not self._heap:
+            raise QueueException("Cannot fetch first from empty queue")
+        return self._heap[0][2]
+
+    def first_priority(self):
+        """
+        Return the priority of the first element
+        :return: smallest priority
+        :raise: QueueException if empty queue
+        """
+        if not self._heap:
+            raise QueueException("Cannot fetch first from empty queue")
+        return self._heap[0][0]
+
+    def decrease_key(self, x, priority):
+        """
+        Lower the priority of a queued element
+        :param x: queued element
+        :param priority: new priority, not larger than the current one
+        :return:
+        :raise: QueueException if not indexed, x is not queued,
+        or priority is larger than the current one
+        """
+        if self._positions is None:
+            raise QueueException("decrease_key needs an indexed queue")
+        try:
+            i = self._positions[x]
+        except KeyError:
+            raise QueueException("Cannot decrease key of element that is not queued")
+
+        entry = self._heap[i]
+        if priority > entry[0]:
+            raise QueueException("New priority is larger than the current priority")
+        entry[0] = priority
+        self._sift_up(i)
+
+    def __contains__(self, x):
+        """
+        Return True if x is queued. O(1) when indexed, else O(n).
+        """
+        if self._positions is not None:
+            return x in self._positions
+        return any(entry[2] == x for entry in self._heap)
+
+    def is_empty(self):
+        """
+        Return true if queue is empty else False
+        :return: True or False
+        """
+        return True if len(self._heap) == 0 else False
+
+    def __len__(self):
+        """
+        Return the length of the queue
+        :return: number of elements
+        """
+        return len(self._heap)
+
+    def size(self):
+        """
+        Return the number of elements in the queue
+        :return: number of elements
+        """
+        return len(self._heap)
@@ -1,17 +1,69 @@
 """
 implementations of several different sorting algorithms in python
+
+Every sort takes key= and reverse= like list.sort. With either one,
+key is called once per element and the sort runs on (key, position)
+pairs, so it is stable whatever the algorithm and never compares the
+elements themselves. Without them, each docstring says whether the
+algorithm is stable.
 """
+from array import array
+from collections import Counter
+import heapq
+from itertools import chain
+import multiprocessing
+from multiprocessing import shared_memory
+import os
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    # the numpy backend of sort falls back to the python sorts
+    numpy = None
+
+
+def _sort_decorated(sort, data, key, reverse, **kwargs):
+    """
+    Sort data with sort on (key, position) pairs built once per element.
+    Positions are unique, so elements are never compared and equal keys
+    keep their order. For reverse the positions are negated and the
+    result is read back to front, which keeps equal keys in order too.
+    :param sort: sort function to run on the pairs
+    :param data: list to sort
+    :param key: function of one argument, or None for the elements themselves
+    :param reverse: if True, sort largest first
+    :param kwargs: extra arguments for sort
+    """
+    if key is None:
+        pairs = [(x, i) for i, x in enumerate(data)]
+    else:
+        pairs = [(key(x), i) for i, x in enumerate(data)]
+    if reverse:
+        pairs = [(k, -i) for k, i in pairs]
 
+    sort(pairs, **kwargs)
+    if reverse:
+        pairs.reverse()
+        data[:] = [data[-i] for _, i in pairs]
+    else:
+        data[:] = [data[i] for _, i in pairs]
 
-def bubble_sort(data):
+
+def bubble_sort(data, key=None, reverse=False):
     """
     Sort the data by 'bubbling up' and
     comparing adjacent pairs of values.
     Each time we will loop for one less at the end
-    (because we already sorted those items). O(n^2)
+    (because we already sorted those items). O(n^2). Stable.
     :param data: list to sort
+    :param key: function of one argument giving the value to sort by
+    :param reverse: if True, sort largest first
     :return: None. modifies data param
     """
+    if key is not None or reverse:
+        _sort_decorated(bubble_sort, data, key, reverse)
+        return
+
     for j in range(len(data), 0, -1):
         for i in range(0, j - 1):
             # it's bigger, so swap!
@@ -20,13 +72,19 @@ def bubble_sort(data):
     return
 
 
-def selection_sort(data):
+def selection_sort(data, key=None, reverse=False):
     """
     Sort the data by selecting the smallest element
-    and swapping it in place. O(n^2)
+    and swapping it in place. O(n^2). Not stable.
     :param data: list to sort
+    :param key: function of one argument giving the value to sort by
+    :param reverse: if True, sort largest first
     :return: None. modifies data param
     """
+    if key is not None or reverse:
+        _sort_decorated(selection_sort, data, key, reverse)
+        return
+
     for j in range(0, len(data)):
         smallest = data[j]
         smallest_index = j
@@ -41,14 +99,20 @@ def selection_sort(data):
     return
 
 
-def insertion_sort(data):
+def insertion_sort(data, key=None, reverse=False):
     """
     Sort the data by taking an element and inserting
     it where it belongs in the list via a series of swaps.
-    O(n^2)... but works better than the previous two
+    O(n^2)... but works better than the previous two. Stable.
     :param data: list to sort
+    :param key: function of one argument giving the value to sort by
+    :param reverse: if True, sort largest first
     :return: None. modifies data param
     """
+    if key is not None or reverse:
+        _sort_decorated(insertion_sort, data, key, reverse)
+        return
+
     for j in range(1, len(data)):
         for i in range(j, 0, -1):
             if data[i - 1] > data[i]:
@@ -57,14 +121,20 @@ def insertion_sort(data):
     return
 
 
-def shell_sort(data):
+def shell_sort(data, key=None, reverse=False):
     """
     An improved insertion sort. Break the list
     into sublists, and sort those by insertion_sort.
-    Will be between O(n) and O(n^2)
+    Will be between O(n) and O(n^2). Not stable.
     :param data: list to sort
+    :param key: function of one argument giving the value to sort by
+    :param reverse: if True, sort largest first
     :return: None. modifies data param
     """
+    if key is not None or reverse:
+        _sort_decorated(shell_sort, data, key, reverse)
+        return
+
     gap = len(data) // 2
     while gap > 0:
         for i in range(gap, len(data)):
@@ -78,13 +148,19 @@ def shell_sort(data):
     return
 
 
-def merge_sort(data):
+def merge_sort(data, key=None, reverse=False):
     """
     Sort the list by recursively splitting the list, then merging
-    the sorted lists back together until done. O(n log n)
+    the sorted lists back together until done. O(n log n). Stable.
     :param data: list to sort
+    :param key: function of one argument giving the value to sort by
+    :param reverse: if True, sort largest first
     :return: None. modifies data param
     """
+    if key is not None or reverse:
+        _sort_decorated(merge_sort, data, key, reverse)
+        return
+
     # base case. 0 or 1 elements is sorted
     if len(data) <= 1:
         return
@@ -100,12 +176,13 @@ def merge_sort(data):
     # for each half, order and switch in place
     i = j = k = 0
     while i < len(left) and j < len(right):
-        if left[i] < right[j]:
-            data[k] = left[i]
-            i += 1
-        else:
+        # take from the left on ties, so equal elements keep their order
+        if right[j] < left[i]:
             data[k] = right[j]
             j += 1
+        else:
+            data[k] = left[i]
+            i += 1
         k += 1
 
     # only the list with more items will be entered here
@@ -121,5 +198,770 @@ def merge_sort(data):
 
     return
 
-def quick_sort(data):
-    pass
+# natural runs shorter than this are extended by insertion sort
+MIN_RUN = 16
+# bottom_up_merge_sort copies ranges in slices of at most this many
+# elements, so the temporary lists stay small
+COPY_CHUNK = 1024
+
+
+def bottom_up_merge_sort(data, key=None, reverse=False):
+    """
+    Sort the list iteratively: split it into natural runs (reversing
+    strictly descending ones and extending short ones to MIN_RUN with
+    insertion sort), then merge adjacent runs pairwise, level by level,
+    ping-ponging between data and one auxiliary list of size n.
+    Adjacent runs that are already in order are copied, not merged,
+    so sorted input costs one pass. O(n log n). Stable.
+    :param data: list to sort
+    :param key: function of one argument giving the value to sort by
+    :param reverse: if True, sort largest first
+    :return: None. modifies data param
+    """
+    if key is not None or reverse:
+        _sort_decorated(bottom_up_merge_sort, data, key, reverse)
+        return
+
+    n = len(data)
+    runs = _find_runs(data, n)
+    if len(runs) <= 2:
+        return
+
+    src, dst = data, [None] * n
+    while len(runs) > 2:
+        merged_runs = [0]
+        for r in range(0, len(runs) - 1, 2):
+            lo = runs[r]
+            if r + 2 < len(runs):
+                mid, hi = runs[r + 1], runs[r + 2]
+                if src[mid] < src[mid - 1]:
+                    _merge_runs(src, dst, lo, mid, hi)
+                else:
+                    # the two runs are already in order
+                    _copy_range(src, dst, lo, hi)
+            else:
+                # odd run out: carry it to the next level
+                hi = runs[r + 1]
+                _copy_range(src, dst, lo, hi)
+            merged_runs.append(hi)
+        runs = merged_runs
+        src, dst = dst, src
+
+    if src is not data:
+        _copy_range(src, data, 0, n)
+    return
+
+
+def _find_runs(data, n):
+    """
+    Turn data into ascending runs of at least MIN_RUN elements
+    (except the last), in place
+    :return: list of run boundaries, starting with 0 and ending with n
+    """
+    runs = [0]
+    i = 0
+    while i < n:
+        j = i + 1
+        if j < n and data[j] < data[i]:
+            # strictly descending, so reversing keeps the sort stable
+            while j + 1 < n and data[j + 1] < data[j]:
+                j += 1
+            lo, hi = i, j
+            while lo < hi:
+                data[lo], data[hi] = data[hi], data[lo]
+                lo += 1
+                hi -= 1
+            j += 1
+        else:
+            while j < n and not data[j] < data[j - 1]:
+                j += 1
+
+        if j - i < MIN_RUN and j < n:
+            j = min(i + MIN_RUN, n)
+            _insertion_sort_range(data, i, j)
+        runs.append(j)
+        i = j
+    return runs
+
+
+def _merge_runs(src, dst, lo, mid, hi):
+    """
+    Stably merge the sorted runs src[lo:mid] and src[mid:hi] into dst[lo:hi]
+    """
+    i, j, k = lo, mid, lo
+    a, b = src[i], src[j]
+    while True:
+        if b < a:
+            dst[k] = b
+            k += 1
+            j += 1
+            if j == hi:
+                break
+            b = src[j]
+        else:
+            dst[k] = a
+            k += 1
+            i += 1
+            if i == mid:
+                break
+            a = src[i]
+
+    # only one of the runs has elements left
+    if i < mid:
+        _copy_range(src, dst, i, mid, k)
+    else:
+        _copy_range(src, dst, j, hi, k)
+
+
+def _copy_range(src, dst, lo, hi, to=None):
+    """
+    Copy src[lo:hi] into dst starting at index to (default lo),
+    in slices of at most COPY_CHUNK elements
+    """
+    if to is None:
+        to = lo
+    for start in range(lo, hi, COPY_CHUNK):
+        end = min(start + COPY_CHUNK, hi)
+        dst[to:to + end - start] = src[start:end]
+        to += end - start
+
+
+# lists shorter than this are sorted serially by parallel_merge_sort
+PARALLEL_THRESHOLD = 50000
+
+
+def parallel_merge_sort(data, workers=None, threshold=PARALLEL_THRESHOLD, key=None, reverse=False):
+    """
+    Sort the list by splitting it into one chunk per worker,
+    merge sorting the chunks in worker processes, then k-way
+    merging the sorted chunks. Lists of ints that fit in 64 bits,
+    or of floats, are shared with the workers through shared memory;
+    anything else is pickled to them. O(n log n). Stable.
+    :param data: list to sort
+    :param workers: number of worker processes (default: cpu count)
+    :param threshold: below this many elements, sort serially with merge_sort
+    :param key: function of one argument giving the value to sort by
+    :param reverse: if True, sort largest first
+    :return: None. modifies data param
+    """
+    if key is not None or reverse:
+        _sort_decorated(parallel_merge_sort, data, key, reverse,
+                        workers=workers, threshold=threshold)
+        return
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    n = len(data)
+    if workers <= 1 or n < max(threshold, 2):
+        merge_sort(data)
+        return
+
+    bounds = [n * i // workers for i in range(workers + 1)]
+    typecode = _shared_typecode(data)
+    if typecode is None:
+        chunks = _sort_chunks_pickled(data, bounds)
+    else:
+        chunks = _sort_chunks_shared(data, bounds, typecode)
+    data[:] = heapq.merge(*chunks)
+    return
+
+
+def _shared_typecode(data):
+    """
+    Return the array typecode that holds every element of data
+    unchanged ('q' for ints, 'd' for floats), or None if there is none
+    """
+    if all(type(x) is float for x in data):
+        return 'd'
+    if all(type(x) is int for x in data):
+        try:
+            array('q', data)
+        except OverflowError:
+            return None
+        return 'q'
+    return None
+
+
+def _run_workers(target, args_list):
+    """
+    Start one process per args tuple, each given the sending end
+    of a pipe, and collect what each one sends back
+    :raise: the exception raised in a worker, if any
+    """
+    procs = []
+    for args in args_list:
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        proc = multiprocessing.Process(target=target, args=args + (sender,))
+        proc.start()
+        sender.close()
+        procs.append((proc, receiver))
+
+    results = []
+    try:
+        for proc, receiver in procs:
+            try:
+                results.append(receiver.recv())
+            except EOFError:
+                proc.join()
+                raise Exception("parallel_merge_sort worker exited with code {0}"
+                                .format(proc.exitcode))
+    finally:
+        for proc, receiver in procs:
+            receiver.close()
+            proc.join()
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+def _sort_pickled_worker(chunk, conn):
+    try:
+        merge_sort(chunk)
+        conn.send(chunk)
+    except Exception as e:
+        conn.send(e)
+    finally:
+        conn.close()
+
+
+def _sort_chunks_pickled(data, bounds):
+    """
+    Sort each data[bounds[i]:bounds[i+1]] in a worker process
+    :return: list of sorted chunks
+    """
+    return _run_workers(_sort_pickled_worker,
+                        [(data[lo:hi],) for lo, hi in zip(bounds, bounds[1:])])
+
+
+def _sort_shared_worker(name, typecode, lo, hi, conn):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with shm.buf.cast(typecode) as view:
+            chunk = view[lo:hi].tolist()
+            merge_sort(chunk)
+            view[lo:hi] = array(typecode, chunk)
+        conn.send(None)
+    except Exception as e:
+        conn.send(e)
+    finally:
+        shm.close()
+        conn.close()
+
+
+def _sort_chunks_shared(data, bounds, typecode):
+    """
+    Copy data into a shared memory segment and sort each
+    [bounds[i]:bounds[i+1]] slice of it in place in a worker process
+    :return: list of sorted chunks
+    """
+    values = array(typecode, data)
+    shm = shared_memory.SharedMemory(create=True, size=max(len(values) * values.itemsize, 1))
+    try:
+        with shm.buf.cast(typecode) as view:
+            view[:len(values)] = values
+        _run_workers(_sort_shared_worker,
+                     [(shm.name, typecode, lo, hi) for lo, hi in zip(bounds, bounds[1:])])
+        with shm.buf.cast(typecode) as view:
+            return [view[lo:hi].tolist() for lo, hi in zip(bounds, bounds[1:])]
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# partitions this small are finished by insertion sort
+INSERTION_SORT_CUTOFF = 16
+# partitions larger than this use the ninther for a pivot
+NINTHER_CUTOFF = 40
+
+
+def quick_sort(data, key=None, reverse=False):
+    """
+    Sort the list with introsort: quicksort with a median-of-three
+    (ninther for large partitions) pivot and three-way partitioning,
+    insertion sort for small partitions, and heapsort for any
+    partition left once the depth passes 2*log2(n).
+    O(n log n) in the worst case. Not stable.
+    :param data: list to sort
+    :param key: function of one argument giving the value to sort by
+    :param reverse: if True, sort largest first
+    :return: None. modifies data param
+    """
+    if key is not None or reverse:
+        _sort_decorated(quick_sort, data, key, reverse)
+        return
+
+    n = len(data)
+    if n <= 1:
+        return
+    _introsort(data, 0, n, 2 * n.bit_length())
+    return
+
+
+def _introsort(data, lo, hi, depth_limit):
+    """
+    Sort data[lo:hi]. Recurse into the smaller side of each
+    partition and loop on the larger, so the stack stays O(log n).
+    """
+    while hi - lo > INSERTION_SORT_CUTOFF:
+        if depth_limit == 0:
+            _heap_sort_range(data, lo, hi)
+            return
+        depth_limit -= 1
+
+        pivot = data[_choose_pivot(data, lo, hi)]
+        lt, gt = _partition3(data, lo, hi, pivot)
+        # data[lt:gt] equals the pivot and is in place
+        if lt - lo < hi - gt:
+            _introsort(data, lo, lt, depth_limit)
+            lo = gt
+        else:
+            _introsort(data, gt, hi, depth_limit)
+            hi = lt
+
+    _insertion_sort_range(data, lo, hi)
+
+
+def _median_of_three(data, i, j, k):
+    """
+    Return whichever of the indexes i, j, k holds the median value
+    """
+    a, b, c = data[i], data[j], data[k]
+    if a < b:
+        if b < c:
+            return j
+        return k if a < c else i
+    if a < c:
+        return i
+    return k if b < c else j
+
+
+def _choose_pivot(data, lo, hi):
+    """
+    Return the index of a pivot for data[lo:hi]: the median of the
+    first, middle and last elements, or for large partitions the
+    median of three such medians (Tukey's ninther)
+    """
+    n = hi - lo
+    mid = lo + n // 2
+    last = hi - 1
+    if n <= NINTHER_CUTOFF:
+        return _median_of_three(data, lo, mid, last)
+
+    step = n // 8
+    return _median_of_three(
+        data,
+        _median_of_three(data, lo, lo + step, lo + 2*step),
+        _median_of_three(data, mid - step, mid, mid + step),
+        _median_of_three(data, last - 2*step, last - step, last))
+
+
+def _partition3(data, lo, hi, pivot):
+    """
+    Three-way partition data[lo:hi] around pivot, so runs of
+    duplicates are finished in one pass
+    :return: (lt, gt) where data[lo:lt] < pivot, data[lt:gt] == pivot
+    and data[gt:hi] > pivot
+    """
+    lt = i = lo
+    gt = hi
+    while i < gt:
+        x = data[i]
+        if x < pivot:
+            data[i] = data[lt]
+            data[lt] = x
+            lt += 1
+            i += 1
+        elif pivot < x:
+            gt -= 1
+            data[i] = data[gt]
+            data[gt] = x
+        else:
+            i += 1
+    return lt, gt
+
+
+def _insertion_sort_range(data, lo, hi):
+    """
+    Insertion sort data[lo:hi], shifting instead of swapping
+    """
+    for i in range(lo + 1, hi):
+        x = data[i]
+        j = i
+        while j > lo and x < data[j - 1]:
+            data[j] = data[j - 1]
+            j -= 1
+        data[j] = x
+
+
+def _heap_sort_range(data, lo, hi):
+    """
+    Heapsort data[lo:hi] in place with a max heap. O(n log n)
+    """
+    n = hi - lo
+    for start in range(n // 2 - 1, -1, -1):
+        _sift_down(data, lo, start, n)
+    for end in range(n - 1, 0, -1):
+        data[lo], data[lo + end] = data[lo + end], data[lo]
+        _sift_down(data, lo, 0, end)
+
+
+def _sift_down(data, lo, i, n):
+    """
+    Restore the max heap of the n elements at data[lo:lo + n]
+    below heap position i
+    """
+    x = data[lo + i]
+    while True:
+        child = 2*i + 1
+        if child >= n:
+            break
+        if child + 1 < n and data[lo + child] < data[lo + child + 1]:
+            child += 1
+        if not x < data[lo + child]:
+            break
+        data[lo + i] = data[lo + child]
+        i = child
+    data[lo + i] = x
+
+
+# ----------------------------------------
+# distribution sorts: no element comparisons
+# ----------------------------------------
+# counting_sort refuses key ranges wider than this
+COUNTING_SORT_MAX_RANGE = 1 << 20
+
+
+def counting_sort(data, key=None, reverse=False, max_range=COUNTING_SORT_MAX_RANGE):
+    """
+    Sort integers in a small range by counting how often each value
+    occurs. O(n + k) for a range of k values. Stable.
+    data may be a list, an array.array or a writable memoryview of ints.
+    :param data: list, array.array or memoryview to sort
+    :param key: function of one argument giving the int to sort by
+    :param reverse: if True, sort largest first
+    :param max_range: largest allowed max - min + 1 of the keys
+    :return: None. modifies data param
+    :raise: TypeError if a key is not an int
+    :raise: ValueError if the keys span more than max_range values
+    """
+    _sort_by_keys(_counting_sort, data, key, reverse, max_range)
+    return
+
+
+def lsd_radix_sort(data, key=None, reverse=False, radix_bits=8):
+    """
+    Sort integers least significant digit first: one stable bucket
+    pass per radix_bits of (key - min key), skipping passes where
+    every key has the same digit. O(n * w / radix_bits) for keys
+    spanning w bits. Stable.
+    data may be a list, an array.array or a writable memoryview of ints.
+    :param data: list, array.array or memoryview to sort
+    :param key: function of one argument giving the int to sort by
+    :param reverse: if True, sort largest first
+    :param radix_bits: bits per digit (2**radix_bits buckets per pass)
+    :return: None. modifies data param
+    :raise: TypeError if a key is not an int
+    """
+    _sort_by_keys(_lsd_radix_sort, data, key, reverse, radix_bits)
+    return
+
+
+def msd_radix_sort(data, key=None, reverse=False):
+    """
+    Sort bytes or strings most significant character first: bucket
+    by the character at each depth, with shorter keys before their
+    extensions, and insertion sort buckets of INSERTION_SORT_CUTOFF
+    or fewer. Uses an explicit stack, so long keys cannot overflow
+    the recursion limit. O(n * average distinguishing prefix). Stable.
+    :param data: list of bytes or str to sort
+    :param key: function of one argument giving the bytes/str to sort by
+    :param reverse: if True, sort largest first
+    :return: None. modifies data param
+    """
+    _sort_by_keys(_msd_radix_sort, data, key, reverse)
+    return
+
+
+def _sort_by_keys(core, data, key, reverse, *args):
+    """
+    Run a distribution sort core on data, read into a list and
+    written back to data's own type.
+    Without key the core sorts the values; with key it sorts the
+    element indexes by keys computed once per element.
+    For reverse, a stable ascending sort of the reversed input,
+    read back to front, keeps equal keys in their original order.
+    """
+    values = data if isinstance(data, list) else data.tolist()
+    if key is None:
+        if reverse:
+            values = values[::-1]
+        core(values, None, *args)
+        if reverse:
+            values.reverse()
+    else:
+        keys = [key(x) for x in values]
+        order = list(range(len(values)))
+        if reverse:
+            order.reverse()
+        core(order, keys, *args)
+        if reverse:
+            order.reverse()
+        values = [values[i] for i in order]
+    _write_values(data, values)
+
+
+def _write_values(data, values):
+    """
+    Store the list values into data, a list, array.array,
+    writable memoryview or numpy array of the same length
+    """
+    if values is data:
+        return
+    if isinstance(data, array):
+        data[:] = array(data.typecode, values)
+    elif isinstance(data, memoryview):
+        data[:] = array(data.format, values)
+    else:
+        data[:] = values
+
+
+def _check_int_keys(ks, name):
+    """
+    Raise a TypeError naming the sort unless every key is an int
+    """
+    if not all(isinstance(k, int) for k in ks):
+        raise TypeError("{0} keys must be ints".format(name))
+
+
+def _counting_sort(items, keys, max_range):
+    """
+    Counting sort core: sort items in place by keys (or by themselves
+    if keys is None)
+    """
+    if not items:
+        return
+    ks = items if keys is None else [keys[i] for i in items]
+    _check_int_keys(ks, 'counting_sort')
+    lo, hi = min(ks), max(ks)
+    if hi - lo + 1 > max_range:
+        raise ValueError("counting_sort key range {0} is larger than {1}"
+                         .format(hi - lo + 1, max_range))
+
+    counts = Counter(ks)
+    if keys is None and all(type(k) is int for k in ks):
+        # equal ints are interchangeable: rebuild from the counts
+        # (int subclasses such as bool must keep their own objects)
+        items[:] = chain.from_iterable([value] * counts[value]
+                                       for value in range(lo, hi + 1) if value in counts)
+        return
+
+    # stable placement: each key's run starts after all smaller keys
+    starts = {}
+    position = 0
+    for value in range(lo, hi + 1):
+        if value in counts:
+            starts[value] = position
+            position += counts[value]
+    placed = [None] * len(items)
+    for item, k in zip(items, ks):
+        placed[starts[k]] = item
+        starts[k] += 1
+    items[:] = placed
+
+
+def _lsd_radix_sort(items, keys, radix_bits):
+    """
+    LSD radix sort core: sort items in place by integer keys
+    (or by themselves if keys is None)
+    """
+    if not items:
+        return
+    ks = items if keys is None else [keys[i] for i in items]
+    _check_int_keys(ks, 'lsd_radix_sort')
+    lo = min(ks)
+    span = max(ks) - lo
+    mask = (1 << radix_bits) - 1
+    n = len(items)
+
+    for shift in range(0, span.bit_length(), radix_bits):
+        if keys is not None:
+            ks = [keys[i] for i in items]
+        buckets = [[] for _ in range(mask + 1)]
+        appends = [bucket.append for bucket in buckets]
+        for item, k in zip(items, ks):
+            appends[((k - lo) >> shift) & mask](item)
+        if max(len(bucket) for bucket in buckets) == n:
+            # every key has the same digit here
+            continue
+        items[:] = chain.from_iterable(buckets)
+        if keys is None:
+            ks = items
+
+
+def _msd_radix_sort(items, keys):
+    """
+    MSD radix sort core: sort items in place by bytes/str keys
+    (or by themselves if keys is None)
+    """
+    key_of = (lambda item: item) if keys is None else keys.__getitem__
+    stack = [(0, len(items), 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= INSERTION_SORT_CUTOFF:
+            _insertion_sort_by_key(items, lo, hi, key_of)
+            continue
+
+        # keys that end at this depth come first
+        ended = []
+        buckets = {}
+        for item in items[lo:hi]:
+            k = key_of(item)
+            if len(k) == depth:
+                ended.append(item)
+            else:
+                buckets.setdefault(k[depth:depth + 1], []).append(item)
+
+        position = lo
+        items[position:position + len(ended)] = ended
+        position += len(ended)
+        for digit in sorted(buckets):
+            bucket = buckets[digit]
+            items[position:position + len(bucket)] = bucket
+            if len(bucket) > 1:
+                stack.append((position, position + len(bucket), depth + 1))
+            position += len(bucket)
+
+
+def _insertion_sort_by_key(items, lo, hi, key_of):
+    """
+    Stable insertion sort of items[lo:hi] comparing key_of(item)
+    """
+    for i in range(lo + 1, hi):
+        x = items[i]
+        k = key_of(x)
+        j = i
+        while j > lo and k < key_of(items[j - 1]):
+            items[j] = items[j - 1]
+            j -= 1
+        items[j] = x
+
+
+# ----------------------------------------
+# sort: pick an algorithm and a backend
+# ----------------------------------------
+ALGORITHMS = {
+    'bubble': bubble_sort,
+    'selection': selection_sort,
+    'insertion': insertion_sort,
+    'shell': shell_sort,
+    'merge': merge_sort,
+    'bottom_up_merge': bottom_up_merge_sort,
+    'parallel_merge': parallel_merge_sort,
+    'quick': quick_sort,
+    'counting': counting_sort,
+    'lsd_radix': lsd_radix_sort,
+    'msd_radix': msd_radix_sort,
+}
+
+# numpy sort kind used for each algorithm by the numpy backend.
+# 'stable' is radix sort for integers of 16 bits or less and
+# timsort/mergesort otherwise; 'quicksort' is numpy's introsort.
+NUMPY_KINDS = {
+    'merge': 'stable',
+    'bottom_up_merge': 'stable',
+    'parallel_merge': 'stable',
+    'quick': 'quicksort',
+    'counting': 'stable',
+    'lsd_radix': 'stable',
+}
+
+# array module typecode -> numpy dtype of the same layout
+_NUMPY_DTYPES = {
+    'b': 'i1', 'B': 'u1', 'h': 'i2', 'H': 'u2', 'i': 'i4', 'I': 'u4',
+    'l': 'i8' if array('l').itemsize == 8 else 'i4',
+    'L': 'u8' if array('L').itemsize == 8 else 'u4',
+    'q': 'i8', 'Q': 'u8', 'f': 'f4', 'd': 'f8',
+}
+
+
+def sort(data, algorithm='quick', backend='python', key=None, reverse=False):
+    """
+    Sort data in place with the named algorithm.
+
+    backend='numpy' sorts numeric data with numpy's vectorized sorts,
+    without a python object per element while sorting:
+    --numpy.ndarray (1-d): sorted in place
+    --array.array: sorted in place through a zero-copy numpy view
+    --list of ints (64 bit) or floats: copied to an ndarray and back
+    Algorithms without a numpy kind, key functions, other element types,
+    and a missing numpy all fall back to the python backend.
+    :param data: list, array.array, memoryview or numpy.ndarray to sort
+    :param algorithm: name of a sort in ALGORITHMS
+    :param backend: 'python' or 'numpy'
+    :param key: function of one argument giving the value to sort by
+    :param reverse: if True, sort largest first
+    :return: None. modifies data param
+    :raise: ValueError for an unknown algorithm or backend,
+    or a numpy.ndarray that is not 1-d
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError("Unknown sort algorithm: {0}".format(algorithm))
+    if backend not in ('python', 'numpy'):
+        raise ValueError("Unknown sort backend: {0}".format(backend))
+    if numpy is not None and isinstance(data, numpy.ndarray) and data.ndim != 1:
+        raise ValueError("Cannot sort a {0}-d array; sort expects 1-d data".format(data.ndim))
+
+    if backend == 'numpy' and key is None and _sort_numpy(data, algorithm, reverse):
+        return
+
+    func = ALGORITHMS[algorithm]
+    if isinstance(data, list):
+        func(data, key=key, reverse=reverse)
+        return
+
+    # python sorts slice their input, which must be a list
+    values = data.tolist()
+    func(values, key=key, reverse=reverse)
+    _write_values(data, values)
+    return
+
+
+def _sort_numpy(data, algorithm, reverse):
+    """
+    Sort data with numpy if it can
+    :return: True if data was sorted, False to fall back to python
+    """
+    kind = NUMPY_KINDS.get(algorithm)
+    if numpy is None or kind is None:
+        return False
+
+    if isinstance(data, numpy.ndarray):
+        values = data
+    elif isinstance(data, array):
+        if data.typecode not in _NUMPY_DTYPES or not len(data):
+            return False
+        values = numpy.frombuffer(data, dtype=_NUMPY_DTYPES[data.typecode])
+    elif isinstance(data, list):
+        typecode = _shared_typecode(data)
+        if typecode is None:
+            return False
+        values = numpy.array(data, dtype=_NUMPY_DTYPES[typecode])
+    else:
+        return False
+
+    if not reverse:
+        values.sort(kind=kind)
+    elif values.dtype.kind == 'f':
+        # -0.0 == 0.0 but they differ, so a stable descending sort is
+        # needed: stably sort the reversed input, then reverse the result
+        backwards = values[::-1]
+        values[:] = backwards[numpy.argsort(backwards, kind='stable')][::-1]
+    else:
+        # equal ints are indistinguishable, so flipping keeps stability
+        values.sort(kind=kind)
+        values[:] = values[::-1].copy()
+    if isinstance(data, list):
+        data[:] = values.tolist()
+    return True
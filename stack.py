@@ -2,9 +2,11 @@
 Implement a stack api in python
 """
 from abc import ABCMeta, abstractmethod
+from array import array
+from itertools import islice
 
 
-from linked_lists import LinkedList
+from linked_lists import LinkedList, PersistentList
 
 
 # --------------------------------
@@ -69,6 +71,39 @@ class StackABC(metaclass=ABCMeta):  # pragma: no cover
         """
         pass
 
+    def push_many(self, xs):
+        """
+        Push each element of xs onto the stack, in order,
+        so the last element ends up on top
+        Implementations may override this with a faster bulk copy.
+        :param xs: iterable of objects
+        :return:
+        """
+        for x in xs:
+            self.push(x)
+
+    def pop_many(self, n):
+        """
+        Pop up to n objects from the stack
+        Implementations may override this with a faster bulk copy.
+        :param n: max number of objects to pop
+        :return: list of popped objects, top first; empty if stack is empty
+        """
+        items = []
+        while len(items) < n and not self.is_empty():
+            items.append(self.pop())
+        return items
+
+    def peek_many(self, n):
+        """
+        Peek at up to n objects from the top of the stack
+        :param n: max number of objects to peek at
+        :return: list of objects, top first; empty if stack is empty
+        """
+        items = self.pop_many(n)
+        self.push_many(reversed(items))
+        return items
+
     @abstractmethod
     def __iter__(self):
         """
@@ -125,6 +160,14 @@ class ArrayStack(StackABC):
         """
         self._array.append(x)
 
+    def push_many(self, xs):
+        """
+        Push each element of xs onto the stack with one extend
+        :param xs: iterable of objects
+        :return:
+        """
+        self._array.extend(xs)
+
     def is_empty(self):
         """
         Return True if empty stack else False
@@ -140,6 +183,86 @@ class ArrayStack(StackABC):
         except IndexError:
             raise StackException("Cannot pop from empty stack")
 
+    def pop_many(self, n):
+        """
+        Pop up to n elements by copying the top slice and truncating once
+        :param n: max number of objects to pop
+        :return: list of popped objects, top first; empty if stack is empty
+        """
+        start = max(len(self._array) - max(n, 0), 0)
+        items = self._array[start:]
+        del self._array[start:]
+        items.reverse()
+        return items
+
+    def peek_many(self, n):
+        """
+        Peek at up to n elements by copying the top slice
+        :param n: max number of objects to peek at
+        :return: list of objects, top first; empty if stack is empty
+        """
+        start = max(len(self._array) - max(n, 0), 0)
+        items = self._array[start:]
+        items.reverse()
+        return items
+
+
+# ----------------------------------------
+# Implementation: TypedArrayStack
+# ----------------------------------------
+class TypedArrayStack(ArrayStack):
+    """
+    ArrayStack for numeric elements, stored unboxed in an
+    array.array of typecode (e.g. 'd' for float, 'q' for int64),
+    so each element takes itemsize bytes instead of a python object
+    plus a list slot. Elements come back as new python ints/floats.
+
+    push raises TypeError or OverflowError if x does not fit typecode,
+    and push/pop raise BufferError while a snapshot is still held.
+    """
+    def __init__(self, typecode):
+        """
+        :param typecode: array module typecode of the elements
+        """
+        self.typecode = typecode
+        self._array = array(typecode)
+
+    def push_many(self, xs):
+        """
+        Push each element of xs onto the stack with one extend.
+        xs is converted to typecode first, so a bad value leaves
+        the stack unchanged.
+        :param xs: iterable of numbers
+        :return:
+        :raise: TypeError or OverflowError if an element does not fit typecode
+        """
+        self._array.extend(array(self.typecode, xs))
+
+    def pop_many(self, n):
+        """
+        Pop up to n elements by copying the top slice and truncating once
+        :param n: max number of objects to pop
+        :return: list of popped objects, top first; empty if stack is empty
+        """
+        return super().pop_many(n).tolist()
+
+    def peek_many(self, n):
+        """
+        Peek at up to n elements by copying the top slice
+        :param n: max number of objects to peek at
+        :return: list of objects, top first; empty if stack is empty
+        """
+        return super().peek_many(n).tolist()
+
+    def snapshot(self):
+        """
+        Return a zero-copy memoryview of the elements, bottom first.
+        The stack cannot push or pop while the view is held,
+        so release it (or use it in a with block) when done.
+        :return: memoryview
+        """
+        return memoryview(self._array)
+
 
 # ----------------------------------------
 # Implementation: LinkedListStack
@@ -149,8 +272,12 @@ class LinkedListStack(StackABC):
     Implementation of the stack data structure
     using a linked list for LIFO operations
     """
-    def __init__(self):
-        self._list = LinkedList()
+    def __init__(self, backend=LinkedList):
+        """
+        :param backend: linked list class used for storage,
+        e.g. LinkedList or UnrolledLinkedList
+        """
+        self._list = backend()
 
     def __len__(self):
         return self.size()
@@ -171,8 +298,8 @@ class LinkedListStack(StackABC):
         :return: object
         :raise: StackException
         """
-        if self._list.first:
-            return self._list.first.element
+        if len(self._list):
+            return self._list.peek_first()
         else:
             raise StackException("Cannot peek into empty stack")
 
@@ -184,6 +311,31 @@ class LinkedListStack(StackABC):
         """
         self._list.insert_first(x)
 
+    def push_many(self, xs):
+        """
+        Push each element of xs onto the stack, in order.
+        The backend chains the new nodes and splices them on once.
+        :param xs: iterable of objects
+        :return:
+        """
+        self._list.insert_first_many(xs)
+
+    def pop_many(self, n):
+        """
+        Pop up to n elements from the top of the stack
+        :param n: max number of objects to pop
+        :return: list of popped objects, top first; empty if stack is empty
+        """
+        return self._list.delete_first_many(n)
+
+    def peek_many(self, n):
+        """
+        Peek at up to n elements from the top of the stack
+        :param n: max number of objects to peek at
+        :return: list of objects, top first; empty if stack is empty
+        """
+        return list(islice(self._list, max(n, 0)))
+
     def is_empty(self):
         """
         Return True if empty stack else False
@@ -202,3 +354,276 @@ class LinkedListStack(StackABC):
         else:
             raise StackException("Cannot pop from empty stack")
 
+
+# ----------------------------------------
+# Implementation: ChunkedArrayStack
+# ----------------------------------------
+class ChunkedArrayStack(StackABC):
+    """
+    Implementation of the stack data structure
+    using a list of fixed-size array chunks for LIFO operations.
+    Growing never copies the existing elements, and chunks are
+    released as they empty. Up to pool_size empty chunks are kept
+    for reuse so pushing and popping across a chunk boundary
+    does not allocate each time.
+    """
+    def __init__(self, chunk_size=1024, pool_size=2):
+        """
+        :param chunk_size: number of elements per chunk
+        :param pool_size: max number of empty chunks kept for reuse
+        """
+        if chunk_size < 1:
+            raise StackException("chunk_size must be >= 1")
+        if pool_size < 0:
+            raise StackException("pool_size must be >= 0")
+
+        self._chunk_size = chunk_size
+        self._pool_size = pool_size
+        # full chunks, then the top chunk holding _top_count elements
+        self._chunks = []
+        self._top_count = 0
+        self._pool = []
+
+    def __len__(self):
+        return self.size()
+
+    def __iter__(self):
+        """
+        Iterate from the bottom of the stack to the top, like ArrayStack
+        """
+        chunks = self._chunks
+        for chunk in chunks[:-1]:
+            yield from chunk
+        if chunks:
+            yield from chunks[-1][:self._top_count]
+
+    def size(self):
+        """
+        Return the number of elements in the stack
+        """
+        if not self._chunks:
+            return 0
+        return (len(self._chunks) - 1) * self._chunk_size + self._top_count
+
+    def peek(self):
+        """
+        Return the top element on the stack
+        :return: object
+        :raise: StackException
+        """
+        if not self._chunks:
+            raise StackException("Cannot peek into empty stack")
+        return self._chunks[-1][self._top_count - 1]
+
+    def push(self, x):
+        """
+        Add a new element x to the top of the stack
+        :param x: object to push on stack
+        :return:
+        """
+        if not self._chunks or self._top_count == self._chunk_size:
+            chunk = self._pool.pop() if self._pool else [None] * self._chunk_size
+            self._chunks.append(chunk)
+            self._top_count = 0
+        self._chunks[-1][self._top_count] = x
+        self._top_count += 1
+
+    def push_many(self, xs):
+        """
+        Push each element of xs onto the stack, copying a slice per chunk
+        :param xs: iterable of objects
+        :return:
+        """
+        xs = list(xs)
+        i = 0
+        while i < len(xs):
+            if not self._chunks or self._top_count == self._chunk_size:
+                chunk = self._pool.pop() if self._pool else [None] * self._chunk_size
+                self._chunks.append(chunk)
+                self._top_count = 0
+            top = self._top_count
+            take = min(self._chunk_size - top, len(xs) - i)
+            self._chunks[-1][top:top + take] = xs[i:i + take]
+            self._top_count += take
+            i += take
+
+    def is_empty(self):
+        """
+        Return True if empty stack else False
+        """
+        return False if self._chunks else True
+
+    def pop(self):
+        """
+        Remove the top element from the stack and return it
+        :return: newest object
+        :raise: StackException
+        """
+        if not self._chunks:
+            raise StackException("Cannot pop from empty stack")
+
+        chunk = self._chunks[-1]
+        self._top_count -= 1
+        x = chunk[self._top_count]
+        chunk[self._top_count] = None
+
+        if self._top_count == 0:
+            self._release_top()
+        return x
+
+    def _release_top(self):
+        """
+        Drop the empty top chunk, keeping it for reuse if the pool has room
+        """
+        chunk = self._chunks.pop()
+        if len(self._pool) < self._pool_size:
+            self._pool.append(chunk)
+        self._top_count = self._chunk_size if self._chunks else 0
+
+    def pop_many(self, n):
+        """
+        Pop up to n elements, copying a slice per chunk
+        :param n: max number of objects to pop
+        :return: list of popped objects, top first; empty if stack is empty
+        """
+        items = []
+        while self._chunks and len(items) < n:
+            chunk = self._chunks[-1]
+            top = self._top_count
+            start = max(top - (n - len(items)), 0)
+            part = chunk[start:top]
+            part.reverse()
+            items.extend(part)
+            chunk[start:top] = [None] * (top - start)
+            self._top_count = start
+            if start == 0:
+                self._release_top()
+        return items
+
+    def peek_many(self, n):
+        """
+        Peek at up to n elements, copying a slice per chunk
+        :param n: max number of objects to peek at
+        :return: list of objects, top first; empty if stack is empty
+        """
+        items = []
+        top = self._top_count
+        for chunk in reversed(self._chunks):
+            if len(items) >= n:
+                break
+            start = max(top - (n - len(items)), 0)
+            part = chunk[start:top]
+            part.reverse()
+            items.extend(part)
+            top = self._chunk_size
+        return items
+
+
+# ----------------------------------------
+# Implementation: PersistentStack
+# ----------------------------------------
+class PersistentStack(StackABC):
+    """
+    Immutable stack on a PersistentList of shared cons cells.
+    push and pop return a new stack in O(1) and leave this one
+    unchanged, so every old version stays valid and taking a
+    snapshot for undo is just keeping a reference.
+
+    Unlike the other stacks, pop returns the new stack rather than
+    the top element; read the top with peek first.
+    """
+    def __init__(self, xs=()):
+        """
+        :param xs: iterable of objects pushed in order, so the last is on top
+        """
+        xs = list(xs)
+        xs.reverse()
+        self._list = PersistentList(xs)
+
+    @classmethod
+    def _from_list(cls, persistent_list):
+        new = cls.__new__(cls)
+        new._list = persistent_list
+        return new
+
+    def __len__(self):
+        return self.size()
+
+    def __iter__(self):
+        """
+        Iterate from the top of the stack down, like LinkedListStack
+        """
+        return iter(self._list)
+
+    def size(self):
+        """
+        Return number of items in stack
+        """
+        return len(self._list)
+
+    def peek(self):
+        """
+        Return the top element
+        :return: object
+        :raise: StackException
+        """
+        if len(self._list):
+            return self._list.peek_first()
+        else:
+            raise StackException("Cannot peek into empty stack")
+
+    def push(self, x):
+        """
+        Return a new stack with x on top
+        :param x: object to push on stack
+        :return: new PersistentStack
+        """
+        return self._from_list(self._list.insert_first(x))
+
+    def push_many(self, xs):
+        """
+        Return a new stack with each element of xs pushed in order
+        :param xs: iterable of objects
+        :return: new PersistentStack
+        """
+        persistent_list = self._list
+        for x in xs:
+            persistent_list = persistent_list.insert_first(x)
+        return self._from_list(persistent_list)
+
+    def is_empty(self):
+        """
+        Return True if empty stack else False
+        :return: True/False
+        """
+        return False if len(self._list) else True
+
+    def pop(self):
+        """
+        Return a new stack without the top element
+        :return: new PersistentStack
+        :raise: StackException
+        """
+        if len(self._list):
+            return self._from_list(self._list.delete_first())
+        else:
+            raise StackException("Cannot pop from empty stack")
+
+    def pop_many(self, n):
+        """
+        Return a new stack without up to n elements from the top
+        :param n: max number of objects to pop
+        :return: new PersistentStack
+        """
+        persistent_list = self._list
+        for _ in range(min(n, len(persistent_list))):
+            persistent_list = persistent_list.delete_first()
+        return self._from_list(persistent_list)
+
+    def peek_many(self, n):
+        """
+        Peek at up to n elements from the top of the stack
+        :param n: max number of objects to peek at
+        :return: list of objects, top first; empty if stack is empty
+        """
+        return list(islice(self._list, max(n, 0)))
@@ -1,5 +1,5 @@
 from unittest import TestCase
-from linked_lists import DoubleLinkedList, Node
+from linked_lists import LinkedList, DoubleLinkedList, UnrolledLinkedList, IndexedDeque, PersistentList, Node, DoubleNode, CheckedNode, CheckedDoubleNode
 
 
 class DoubleLinkedListTests(TestCase):
@@ -204,3 +204,476 @@ class DoubleLinkedListTests(TestCase):
         self.assertEqual(l.first.next_node, l.last)
         self.assertEqual(l.last.previous_node, l.first)
         self.assertIsNone(l.last.next_node)
+
+
+class NodeTests(TestCase):
+    """
+    Tests on the slotted nodes and the checked (debug) nodes
+    """
+    def test_nodes_have_no_dict(self):
+        self.assertFalse(hasattr(Node(1), '__dict__'))
+        self.assertFalse(hasattr(DoubleNode(1), '__dict__'))
+        self.assertFalse(hasattr(CheckedDoubleNode(1), '__dict__'))
+
+    def test_node_links(self):
+        m = DoubleNode(2)
+        n = DoubleNode(1, next_node=m)
+        m.previous_node = n
+        self.assertEqual(n.next_node, m)
+        self.assertEqual(m.previous_node, n)
+        self.assertIsNone(n.previous_node)
+        self.assertIsNone(m.next_node)
+
+    def test_checked_node_rejects_bad_links(self):
+        n = CheckedNode(1)
+        with self.assertRaises(Exception):
+            n.next_node = 'x'
+        n.next_node = Node(2)
+        self.assertEqual(n.next_node.element, 2)
+
+        d = CheckedDoubleNode(1)
+        with self.assertRaises(Exception):
+            d.previous_node = 'x'
+        with self.assertRaises(Exception):
+            CheckedDoubleNode(1, next_node='x')
+
+    def test_debug_lists_use_checked_nodes(self):
+        l = LinkedList(debug=True)
+        l.insert_last(1)
+        l.insert_first(0)
+        self.assertIsInstance(l.first, CheckedNode)
+        self.assertEqual([i for i in l], [0, 1])
+
+        d = DoubleLinkedList(debug=True)
+        d.insert_last(1)
+        d.insert_after(1, 2)
+        self.assertIsInstance(d.last, CheckedDoubleNode)
+        self.assertEqual(d.last.previous_node, d.first)
+
+
+class UnrolledLinkedListTests(TestCase):
+    """
+    Tests on the UnrolledLinkedList class
+    Mostly to check on block splitting, merging and unlinking
+    """
+    def test_bad_block_size(self):
+        with self.assertRaises(Exception):
+            UnrolledLinkedList(block_size=1)
+
+    def test_insert_first_and_last(self):
+        l = UnrolledLinkedList(block_size=2)
+        for i in range(5):
+            l.insert_last(i)
+        l.insert_first(-1)
+        self.assertEqual([i for i in l], [-1, 0, 1, 2, 3, 4])
+        self.assertEqual(len(l), 6)
+        self.assertEqual(l.peek_first(), -1)
+        self.assertEqual(l.peek_last(), 4)
+
+        # blocks never hold more than block_size
+        block = l.first
+        while block:
+            self.assertLessEqual(len(block.elements), 2)
+            block = block.next_node
+
+    def test_insert_after_splits_block(self):
+        l = UnrolledLinkedList(block_size=4)
+        for i in [1, 2, 1, 2]:
+            l.insert_last(i)
+        l.insert_after(1, 'x', occurrence=2)
+        l.insert_after(2, 'y')
+        self.assertEqual([i for i in l], [1, 2, 'y', 1, 'x', 2])
+        self.assertIsNot(l.first, l.last)
+
+        with self.assertRaises(Exception):
+            l.insert_after(1, 'z', occurrence=3)
+
+    def test_delete(self):
+        l = UnrolledLinkedList(block_size=4)
+        for i in range(10):
+            l.insert_last(i)
+        self.assertEqual(l.delete(5), 5)
+        self.assertEqual(l.delete_first(), 0)
+        self.assertEqual(l.delete_last(), 9)
+        self.assertEqual([i for i in l], [1, 2, 3, 4, 6, 7, 8])
+        self.assertEqual(l.size(), 7)
+        with self.assertRaises(Exception):
+            l.delete(5)
+
+        for i in [1, 2, 3, 4, 6, 7, 8]:
+            l.delete(i)
+        self.assertIsNone(l.first)
+        self.assertIsNone(l.last)
+        with self.assertRaises(Exception):
+            l.delete_first()
+        with self.assertRaises(Exception):
+            l.delete_last()
+
+    def test_search(self):
+        l = UnrolledLinkedList(block_size=2)
+        self.assertFalse(l.search(3))
+        for i in range(5):
+            l.insert_last(i)
+        self.assertTrue(l.search(3))
+        self.assertFalse(l.search(9))
+
+    def test_insert_ordered(self):
+        l = UnrolledLinkedList(block_size=3)
+        for i in [5, 1, 4, 2, 3, 9, 0, 4]:
+            l.insert_ordered(i)
+        self.assertEqual([i for i in l], [0, 1, 2, 3, 4, 4, 5, 9])
+
+    def test_matches_linked_list(self):
+        """
+        A random mix of operations gives the same result as LinkedList
+        """
+        import random
+        rng = random.Random(7)
+        expected = LinkedList()
+        l = UnrolledLinkedList(block_size=4)
+        for _ in range(2000):
+            op = rng.randrange(5)
+            x = rng.randrange(20)
+            if op == 0:
+                expected.insert_first(x)
+                l.insert_first(x)
+            elif op == 1:
+                expected.insert_last(x)
+                l.insert_last(x)
+            elif op == 2 and expected.search(x):
+                expected.insert_after(x, -x)
+                l.insert_after(x, -x)
+            elif op == 3 and expected.search(x):
+                self.assertEqual(expected.delete(x), l.delete(x))
+            elif op == 4 and len(expected):
+                self.assertEqual(expected.delete_first(), l.delete_first())
+            self.assertEqual(len(expected), len(l))
+        self.assertEqual([i for i in expected], [i for i in l])
+
+
+class IndexedLinkedListTests(TestCase):
+    """
+    Tests on LinkedList and DoubleLinkedList with an element index
+    """
+    def _check_against_scan(self, cls):
+        """
+        A random mix of operations on an indexed list gives
+        the same result as on an unindexed list
+        """
+        import random
+        rng = random.Random(11)
+        expected = cls()
+        l = cls(indexed=True)
+        for _ in range(3000):
+            op = rng.randrange(7)
+            x = rng.randrange(30)
+            if op == 0:
+                expected.insert_first(x)
+                l.insert_first(x)
+            elif op == 1:
+                expected.insert_last(x)
+                l.insert_last(x)
+            elif op == 2:
+                # insert a (possibly duplicated) value mid-list
+                new_x = rng.choice((-x, rng.randrange(30)))
+                occurrence = rng.randint(1, 3)
+                try:
+                    expected.insert_after(x, new_x, occurrence=occurrence)
+                except Exception:
+                    with self.assertRaises(Exception):
+                        l.insert_after(x, new_x, occurrence=occurrence)
+                else:
+                    l.insert_after(x, new_x, occurrence=occurrence)
+            elif op == 3:
+                self.assertEqual(expected.search(x), l.search(x))
+                if expected.search(x):
+                    self.assertEqual(expected.delete(x), l.delete(x))
+                else:
+                    with self.assertRaises(Exception):
+                        l.delete(x)
+            elif op == 4 and len(expected):
+                self.assertEqual(expected.delete_first(), l.delete_first())
+            elif op == 5 and len(expected):
+                self.assertEqual(expected.delete_last(), l.delete_last())
+            elif op == 6:
+                expected.insert_ordered(x)
+                l.insert_ordered(x)
+            self.assertEqual(len(expected), len(l))
+        self.assertEqual([i for i in expected], [i for i in l])
+        self._check_index_order(l)
+
+    def _check_index_order(self, l):
+        """
+        The index holds the nodes for each element in list order
+        """
+        in_order = {}
+        node = l.first
+        while node:
+            in_order.setdefault(node.element, []).append(node)
+            node = node.next_node
+        for element, nodes in in_order.items():
+            self.assertEqual(list(l._index.lookup(element)), nodes)
+
+    def test_linked_list_matches_scan(self):
+        self._check_against_scan(LinkedList)
+
+    def test_double_linked_list_matches_scan(self):
+        self._check_against_scan(DoubleLinkedList)
+
+    def test_insert_after_occurrence(self):
+        for cls in (LinkedList, DoubleLinkedList):
+            l = cls(indexed=True)
+            for i in [1, 2, 1, 2]:
+                l.insert_last(i)
+            l.insert_after(1, 'x', occurrence=2)
+            l.insert_after(2, 'y')
+            self.assertEqual([i for i in l], [1, 2, 'y', 1, 'x', 2])
+            with self.assertRaises(Exception):
+                l.insert_after(1, 'z', occurrence=3)
+
+    def test_duplicates_keep_list_order(self):
+        for cls in (LinkedList, DoubleLinkedList):
+            l = cls(indexed=True)
+            for i in [1, 2, 1, 3, 1]:
+                l.insert_last(i)
+            l.insert_first(1)
+            l.insert_after(2, 1)
+            l.insert_after(1, 1, occurrence=4)
+            l.insert_ordered(0)
+            self.assertEqual([i for i in l], [0, 1, 1, 2, 1, 1, 1, 3, 1])
+            self._check_index_order(l)
+            l.insert_after(1, 'x', occurrence=5)
+            self.assertEqual(l.delete(1), 1)
+            self.assertEqual([i for i in l], [0, 1, 2, 1, 1, 1, 'x', 3, 1])
+            self._check_index_order(l)
+
+    def test_delete_last_indexed_linked_list(self):
+        l = LinkedList(indexed=True)
+        for i in range(5):
+            l.insert_last(i)
+        self.assertEqual([l.delete_last() for _ in range(5)], [4, 3, 2, 1, 0])
+        self.assertIsNone(l.first)
+        self.assertIsNone(l.last)
+
+    def test_unhashable_elements(self):
+        for cls in (LinkedList, DoubleLinkedList):
+            l = cls(indexed=True)
+            l.insert_last([1])
+            l.insert_last(2)
+            l.insert_last({'a': 1})
+            self.assertTrue(l.search([1]))
+            self.assertTrue(l.search(2))
+            self.assertFalse(l.search([3]))
+            self.assertEqual(l.delete([1]), [1])
+            self.assertEqual(l.delete({'a': 1}), {'a': 1})
+            self.assertEqual(l.delete(2), 2)
+            self.assertEqual(len(l), 0)
+            self.assertFalse(l.search(2))
+
+
+class IndexedDequeTests(TestCase):
+    """
+    Tests on the IndexedDeque class
+    Mostly to check indexing and the block map at both ends
+    """
+    def test_bad_block_size(self):
+        with self.assertRaises(Exception):
+            IndexedDeque(block_size=1)
+
+    def test_indexing(self):
+        l = IndexedDeque(block_size=4)
+        for i in range(10):
+            l.insert_last(i)
+        for i in range(1, 6):
+            l.insert_first(-i)
+        expected = list(range(-5, 10))
+        self.assertEqual([l[i] for i in range(len(l))], expected)
+        self.assertEqual(l[-1], 9)
+        self.assertEqual(l[-15], -5)
+        l[3] = 'x'
+        self.assertEqual(l[3], 'x')
+        with self.assertRaises(IndexError):
+            l[15]
+        with self.assertRaises(IndexError):
+            l[-16]
+
+    def test_matches_deque(self):
+        from collections import deque
+        import random
+
+        rng = random.Random(11)
+        for block_size in (2, 3, 64):
+            l = IndexedDeque(block_size=block_size)
+            model = deque()
+            for step in range(3000):
+                op = rng.randrange(6)
+                if op == 0:
+                    l.insert_first(step)
+                    model.appendleft(step)
+                elif op == 1:
+                    l.insert_last(step)
+                    model.append(step)
+                elif op == 2 and model:
+                    self.assertEqual(l.delete_first(), model.popleft())
+                elif op == 3 and model:
+                    self.assertEqual(l.delete_last(), model.pop())
+                elif op == 4:
+                    items = list(range(rng.randrange(10)))
+                    l.insert_last_many(items)
+                    model.extend(items)
+                else:
+                    n = rng.randrange(10)
+                    self.assertEqual(l.delete_first_many(n),
+                                     [model.popleft() for _ in range(min(n, len(model)))])
+                self.assertEqual(len(l), len(model))
+                if model:
+                    i = rng.randrange(len(model))
+                    self.assertEqual(l[i], model[i])
+            self.assertEqual(list(l), list(model))
+            # the map is at most about twice the blocks in use
+            self.assertLessEqual(len(l._blocks), 2 * (len(model) // block_size + 2))
+
+    def test_fifo_map_stays_small(self):
+        l = IndexedDeque(block_size=4)
+        for i in range(10000):
+            l.insert_last(i)
+            if i >= 10:
+                self.assertEqual(l.delete_first(), i - 10)
+        self.assertLessEqual(len(l._blocks), 8)
+        self.assertEqual(list(l), list(range(9990, 10000)))
+
+    def test_alternating_at_block_boundary_reuses_blocks(self):
+        block_size = 4
+        for insert, delete in (('insert_first', 'delete_first'), ('insert_last', 'delete_last')):
+            l = IndexedDeque(block_size=block_size)
+            l.insert_last_many(range(block_size))
+            getattr(l, insert)('x')
+            getattr(l, delete)()
+            blocks = [id(block) for block in l._blocks if block is not None]
+            for i in range(100):
+                getattr(l, insert)(i)
+                self.assertEqual(getattr(l, delete)(), i)
+                self.assertEqual([id(block) for block in l._blocks if block is not None], blocks)
+            self.assertEqual(list(l), list(range(block_size)))
+
+    def test_empty(self):
+        l = IndexedDeque()
+        for method in (l.peek_first, l.peek_last, l.delete_first, l.delete_last):
+            with self.assertRaises(Exception):
+                method()
+        self.assertEqual(l.delete_first_many(3), [])
+        self.assertFalse(l.search(1))
+
+    def test_middle_operations(self):
+        l = IndexedDeque(block_size=2)
+        for i in [1, 2, 1, 2]:
+            l.insert_last(i)
+        l.insert_after(1, 'x', occurrence=2)
+        l.insert_after(2, 'y')
+        self.assertEqual(list(l), [1, 2, 'y', 1, 'x', 2])
+        with self.assertRaises(Exception):
+            l.insert_after(1, 'z', occurrence=3)
+
+        self.assertEqual(l.delete('y'), 'y')
+        self.assertEqual(l.delete(2), 2)
+        self.assertEqual(list(l), [1, 1, 'x', 2])
+        self.assertTrue(l.search('x'))
+        with self.assertRaises(Exception):
+            l.delete('y')
+
+        l = IndexedDeque(block_size=3)
+        for i in [5, 1, 4, 1, 5, 9, 2, 6, 5]:
+            l.insert_ordered(i)
+        self.assertEqual(list(l), [1, 1, 2, 4, 5, 5, 5, 6, 9])
+        self.assertEqual(l.size(), 9)
+
+
+class BatchInsertTests(TestCase):
+    """
+    insert_first_many and insert_last_many on every backend
+    """
+    backends = (
+        LinkedList, DoubleLinkedList, UnrolledLinkedList, IndexedDeque,
+        lambda: LinkedList(debug=True), lambda: DoubleLinkedList(debug=True),
+        lambda: LinkedList(indexed=True), lambda: DoubleLinkedList(indexed=True),
+        lambda: UnrolledLinkedList(block_size=3), lambda: IndexedDeque(block_size=2),
+    )
+
+    def test_insert_first_many(self):
+        for backend in self.backends:
+            l = backend()
+            l.insert_first_many([])
+            self.assertEqual(len(l), 0)
+            l.insert_first_many(range(5))
+            self.assertEqual([i for i in l], [4, 3, 2, 1, 0])
+            l.insert_first_many(iter(['a', 'b']))
+            l.insert_last('z')
+            self.assertEqual([i for i in l], ['b', 'a', 4, 3, 2, 1, 0, 'z'])
+            self.assertEqual(len(l), 8)
+            self.assertEqual(l.peek_first(), 'b')
+            self.assertEqual(l.peek_last(), 'z')
+            # links in both directions survive the splice
+            self.assertEqual([l.delete_last() for _ in range(3)], ['z', 0, 1])
+            self.assertEqual(l.delete_first_many(10), ['b', 'a', 4, 3, 2])
+            self.assertEqual(len(l), 0)
+
+    def test_matches_repeated_insert_first(self):
+        for backend in self.backends:
+            expected = backend()
+            l = backend()
+            for batch in ([1], list(range(10)), [], list(range(7))):
+                for x in batch:
+                    expected.insert_first(x)
+                l.insert_first_many(batch)
+            self.assertEqual([i for i in l], [i for i in expected])
+
+
+class PersistentListTests(TestCase):
+    """
+    Tests on the PersistentList class
+    Old versions must be unchanged and share nodes with new ones
+    """
+    def test_build(self):
+        l = PersistentList(range(4))
+        self.assertEqual([i for i in l], [0, 1, 2, 3])
+        self.assertEqual(len(l), 4)
+        self.assertEqual(l.size(), 4)
+        self.assertEqual(l.peek_first(), 0)
+        self.assertEqual(len(PersistentList()), 0)
+
+    def test_versions(self):
+        empty = PersistentList()
+        one = empty.insert_first(1)
+        two = one.insert_first(2)
+        three = one.insert_first(3)
+        self.assertEqual([i for i in empty], [])
+        self.assertEqual([i for i in one], [1])
+        self.assertEqual([i for i in two], [2, 1])
+        self.assertEqual([i for i in three], [3, 1])
+        # both versions share the tail node
+        self.assertIs(two._first.next_node, three._first.next_node)
+        self.assertIs(two.delete_first()._first, one._first)
+
+        with self.assertRaises(Exception):
+            empty.delete_first()
+        with self.assertRaises(Exception):
+            empty.peek_first()
+
+    def test_delete_shares_suffix(self):
+        l = PersistentList([1, 2, 3, 4, 5])
+        removed = l.delete(3)
+        self.assertEqual([i for i in removed], [1, 2, 4, 5])
+        self.assertEqual([i for i in l], [1, 2, 3, 4, 5])
+        self.assertEqual(len(removed), 4)
+        self.assertIs(removed._first.next_node.next_node, l._first.next_node.next_node.next_node)
+        self.assertTrue(l.search(3))
+        self.assertFalse(removed.search(3))
+        with self.assertRaises(Exception):
+            removed.delete(3)
+
+    def test_insert_last(self):
+        l = PersistentList([1, 2])
+        longer = l.insert_last(3)
+        self.assertEqual([i for i in longer], [1, 2, 3])
+        self.assertEqual([i for i in l], [1, 2])
+        self.assertEqual([i for i in PersistentList().insert_last('a')], ['a'])
@@ -1,5 +1,6 @@
 from unittest import TestCase
-from list import OrderedLinkedList, ListException
+from linked_lists import LinkedList, DoubleLinkedList, UnrolledLinkedList, IndexedDeque
+from list import OrderedLinkedList, SkipListOrderedList, ListException
 
 
 class OrderedLinkedListTests(TestCase):
@@ -174,3 +175,178 @@ class OrderedLinkedListTests(TestCase):
         expected_ret = [1, 2, 3, 4, 5]
         ret = [i for i in l]
         self.assertEqual(expected_ret, ret)
+
+
+    def test_unrolled_backend(self):
+        l = OrderedLinkedList(int, backend=UnrolledLinkedList)
+        for i in [5, 2, 8, 1, 9, 3, 7, 4, 6]:
+            l.add(i)
+        self.assertEqual([i for i in l], [1, 2, 3, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(l.first, 1)
+        self.assertEqual(l.last, 9)
+        self.assertTrue(l.contains(7))
+        self.assertEqual(l.remove_first(), 1)
+        self.assertEqual(l.remove_last(), 9)
+        self.assertEqual(l.size, 7)
+
+    def test_from_iterable(self):
+        for backend in (DoubleLinkedList, LinkedList, UnrolledLinkedList, IndexedDeque):
+            l = OrderedLinkedList.from_iterable(int, [5, 3, 9, 1, 3], backend=backend)
+            self.assertEqual([i for i in l], [1, 3, 3, 5, 9])
+            self.assertEqual(l.size, 5)
+            self.assertEqual(l.first, 1)
+            self.assertEqual(l.last, 9)
+
+        l = OrderedLinkedList.from_iterable(int, range(5), presorted=True)
+        self.assertEqual([i for i in l], [0, 1, 2, 3, 4])
+
+        with self.assertRaises(ListException):
+            OrderedLinkedList.from_iterable(int, [3, 1], presorted=True)
+        with self.assertRaises(ListException):
+            OrderedLinkedList.from_iterable(int, [3, 'a'])
+
+    def test_extend(self):
+        l = OrderedLinkedList(int)
+        l.extend([])
+        self.assertTrue(l.is_empty)
+
+        for i in [4, 2, 8]:
+            l.add(i)
+        l.extend([9, 1, 4])
+        self.assertEqual([i for i in l], [1, 2, 4, 4, 8, 9])
+        l.extend([0, 5, 10], presorted=True)
+        self.assertEqual([i for i in l], [0, 1, 2, 4, 4, 5, 8, 9, 10])
+        self.assertEqual(l.size, 9)
+        self.assertEqual(l.last, 10)
+
+        # a bad batch leaves the list unchanged
+        with self.assertRaises(ListException):
+            l.extend([3, 'a'])
+        self.assertEqual(l.size, 9)
+
+    def test_extend_is_stable(self):
+        """
+        Existing elements come before equal new elements, like add
+        """
+        class Item(object):
+            def __init__(self, key, tag):
+                self.key = key
+                self.tag = tag
+
+            def __lt__(self, other):
+                return self.key < other.key
+
+            def __gt__(self, other):
+                return self.key > other.key
+
+        l = OrderedLinkedList(Item)
+        l.add(Item(1, 'old'))
+        l.extend([Item(1, 'new'), Item(0, 'new')])
+        self.assertEqual([(i.key, i.tag) for i in l], [(0, 'new'), (1, 'old'), (1, 'new')])
+
+    def test_remove_last_drain(self):
+        """
+        Draining from the tail returns elements largest first
+        on every backend; the default backend is doubly linked
+        so remove_last does not walk the list
+        """
+        self.assertIsInstance(OrderedLinkedList(int)._list, DoubleLinkedList)
+        for backend in (DoubleLinkedList, LinkedList, UnrolledLinkedList, IndexedDeque):
+            l = OrderedLinkedList(int, backend=backend)
+            for i in [3, 1, 4, 1, 5, 9, 2, 6]:
+                l.add(i)
+            ret = [l.remove_last() for _ in range(l.size)]
+            self.assertEqual(ret, [9, 6, 5, 4, 3, 2, 1, 1])
+            self.assertTrue(l.is_empty)
+
+
+class SkipListOrderedListTests(TestCase):
+    def test_mixed_classes(self):
+        l = SkipListOrderedList(int)
+        with self.assertRaises(ListException):
+            l.add('7')
+        self.assertFalse(l.contains('7'))
+
+    def test_empty(self):
+        l = SkipListOrderedList(int)
+        self.assertTrue(l.is_empty)
+        self.assertEqual(l.size, 0)
+        with self.assertRaises(ListException):
+            l.first
+        with self.assertRaises(ListException):
+            l.last
+        with self.assertRaises(ListException):
+            l.remove_first()
+        with self.assertRaises(ListException):
+            l.remove_last()
+
+    def test_add_first_last(self):
+        l = SkipListOrderedList(int, seed=3)
+        l.add(5)
+        self.assertEqual(l.first, 5)
+        self.assertEqual(l.last, 5)
+        l.add(1)
+        l.add(9)
+        self.assertEqual(l.first, 1)
+        self.assertEqual(l.last, 9)
+        self.assertEqual(len(l), 3)
+        self.assertFalse(l.is_empty)
+
+    def test_contains(self):
+        l = SkipListOrderedList(int, seed=3)
+        self.assertFalse(l.contains(4))
+        for i in [3, 2, 5]:
+            l.add(i)
+        self.assertTrue(l.contains(5))
+        self.assertTrue(l.contains(2))
+        self.assertFalse(l.contains(9))
+        self.assertFalse(l.contains(4))
+
+    def test_contains_matches_ordered_linked_list(self):
+        skip, linked = SkipListOrderedList(float, seed=3), OrderedLinkedList(float)
+        for x in [1.0, 2.5, 4.0]:
+            skip.add(x)
+            linked.add(x)
+        for x in [1, 4, 2.5, 3, '1.0', None]:
+            self.assertEqual(skip.contains(x), linked.contains(x))
+        self.assertTrue(skip.contains(1))
+
+    def test_remove(self):
+        l = SkipListOrderedList(int, seed=3)
+        for i in [4, 8, 6]:
+            l.add(i)
+        self.assertEqual(l.remove_first(), 4)
+        self.assertEqual(l.remove_last(), 8)
+        self.assertEqual(l.first, 6)
+        self.assertEqual(l.last, 6)
+        self.assertEqual(l.remove_last(), 6)
+        self.assertTrue(l.is_empty)
+
+        # the list is usable again after being emptied
+        l.add(1)
+        self.assertEqual(l.first, 1)
+        self.assertEqual(l.last, 1)
+
+    def test_matches_sorted(self):
+        """
+        A random mix of adds and removes gives the same result as sorted()
+        """
+        import random
+        rng = random.Random(5)
+        l = SkipListOrderedList(int, seed=5)
+        expected = []
+        for _ in range(2000):
+            op = rng.randrange(4)
+            if op < 2 or not expected:
+                x = rng.randrange(50)
+                l.add(x)
+                expected.append(x)
+                expected.sort()
+            elif op == 2:
+                self.assertEqual(l.remove_first(), expected.pop(0))
+            else:
+                self.assertEqual(l.remove_last(), expected.pop())
+            self.assertEqual(l.size, len(expected))
+        self.assertEqual([i for i in l], expected)
+        for x in range(50):
+            self.assertEqual(l.contains(x), x in expected)
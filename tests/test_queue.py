@@ -1,5 +1,18 @@
+import asyncio
+from functools import partial
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
 from unittest import TestCase
-from queue import CircularArrayQueue, QueueException, PythonListQueue, LinkedListQueue
+
+from linked_lists import LinkedList, DoubleLinkedList, UnrolledLinkedList, IndexedDeque
+from queue import CircularArrayQueue, QueueException, PythonListQueue, LinkedListQueue, \
+    BlockingQueue, BlockingCircularArrayQueue, BlockingLinkedListQueue, AsyncCircularArrayQueue, \
+    SPSCCircularArrayQueue, SharedMemoryCircularArrayQueue, PersistentQueue, HeapPriorityQueue, \
+    TypedCircularArrayQueue
 
 
 class CircularArrayQueueTests(TestCase):
@@ -91,6 +104,314 @@ class CircularArrayQueueTests(TestCase):
         self.assertTrue(q.is_full())
 
 
+    def test_overwrite_drops_oldest(self):
+        q = CircularArrayQueue(max_queue_size=2)
+        q.enqueue('a')
+        q.enqueue('b')
+        q.enqueue('c')
+        self.assertEqual(q.size(), 2)
+        self.assertEqual(q.first(), 'b')
+        self.assertEqual(q.dequeue(), 'b')
+        self.assertEqual(q.dequeue(), 'c')
+        self.assertTrue(q.is_empty())
+
+    def test_bad_overflow_policy(self):
+        with self.assertRaises(QueueException):
+            CircularArrayQueue(max_queue_size=2, overflow='bogus')
+
+    def test_overflow_raise(self):
+        q = CircularArrayQueue(max_queue_size=2, overflow=CircularArrayQueue.RAISE)
+        q.enqueue('a')
+        q.enqueue('b')
+        with self.assertRaises(QueueException):
+            q.enqueue('c')
+        self.assertEqual(q.dequeue(), 'a')
+        q.enqueue('c')
+        self.assertEqual([q.dequeue(), q.dequeue()], ['b', 'c'])
+
+    def test_overflow_grow_and_shrink(self):
+        q = CircularArrayQueue(max_queue_size=4, overflow=CircularArrayQueue.GROW)
+
+        # wrap the ring around before it has to grow
+        for i in range(3):
+            q.enqueue(i)
+        q.dequeue()
+        q.dequeue()
+        for i in range(3, 100):
+            q.enqueue(i)
+        self.assertEqual(q.size(), 98)
+        self.assertEqual(q.max_queue_size, 128)
+        self.assertEqual(q.first(), 2)
+
+        ret = [q.dequeue() for _ in range(90)]
+        self.assertEqual(ret, list(range(2, 92)))
+        self.assertLess(q.max_queue_size, 128)
+        ret = [q.dequeue() for _ in range(8)]
+        self.assertEqual(ret, list(range(92, 100)))
+        self.assertTrue(q.is_empty())
+
+        # never shrinks below the initial size
+        self.assertEqual(q.max_queue_size, 4)
+
+    def test_enqueue_many_dequeue_many_wraps(self):
+        q = CircularArrayQueue(max_queue_size=5, overflow=CircularArrayQueue.RAISE)
+        q.enqueue_many([0, 1, 2])
+        self.assertEqual(q.dequeue_many(2), [0, 1])
+        # rear wraps around the end of the array
+        q.enqueue_many([3, 4, 5, 6])
+        self.assertEqual(q.size(), 5)
+        self.assertTrue(q.is_full())
+        with self.assertRaises(QueueException):
+            q.enqueue_many([7])
+        # front wraps around the end of the array
+        self.assertEqual(q.dequeue_many(10), [2, 3, 4, 5, 6])
+        self.assertEqual(q.dequeue_many(3), [])
+        self.assertTrue(q.is_empty())
+        self.assertEqual(q._array, [None]*5)
+
+    def test_enqueue_many_overwrite(self):
+        q = CircularArrayQueue(max_queue_size=3)
+        q.enqueue_many(['a', 'b'])
+        q.enqueue_many(['c', 'd'])
+        self.assertEqual(q.dequeue_many(3), ['b', 'c', 'd'])
+
+        q.enqueue_many(range(10))
+        self.assertEqual(q.size(), 3)
+        self.assertEqual(q.dequeue_many(3), [7, 8, 9])
+
+    def test_enqueue_many_grow(self):
+        q = CircularArrayQueue(max_queue_size=4, overflow=CircularArrayQueue.GROW)
+        q.enqueue_many(range(3))
+        q.dequeue()
+        q.enqueue_many(range(3, 20))
+        self.assertEqual(q.size(), 19)
+        self.assertEqual(q.max_queue_size, 32)
+        self.assertEqual(q.dequeue_many(18), list(range(1, 19)))
+        self.assertEqual(q.max_queue_size, 4)
+        self.assertEqual(q.dequeue(), 19)
+
+    def test_matches_single_item_operations(self):
+        """
+        Batches give the same results as one element at a time
+        """
+        import random
+        rng = random.Random(3)
+        for overflow in (CircularArrayQueue.OVERWRITE, CircularArrayQueue.GROW):
+            batched = CircularArrayQueue(max_queue_size=7, overflow=overflow)
+            single = CircularArrayQueue(max_queue_size=7, overflow=overflow)
+            for i in range(500):
+                if rng.randrange(2):
+                    xs = list(range(i, i + rng.randrange(12)))
+                    batched.enqueue_many(xs)
+                    for x in xs:
+                        single.enqueue(x)
+                else:
+                    n = rng.randrange(12)
+                    self.assertEqual(batched.dequeue_many(n),
+                                     [single.dequeue() for _ in range(min(n, single.size()))])
+                self.assertEqual(batched.size(), single.size())
+
+class TypedCircularArrayQueueTests(TestCase):
+
+    def test_fifo(self):
+        q = TypedCircularArrayQueue('q', 4)
+        with self.assertRaises(QueueException):
+            q.dequeue()
+        for i in range(3):
+            q.enqueue(i)
+        self.assertEqual(q.first(), 0)
+        self.assertEqual([q.dequeue() for _ in range(3)], [0, 1, 2])
+        self.assertTrue(q.is_empty())
+
+    def test_overflow_policies(self):
+        q = TypedCircularArrayQueue('d', 3)
+        q.enqueue_many([1.0, 2.0, 3.0, 4.5])
+        self.assertEqual(q.dequeue_many(5), [2.0, 3.0, 4.5])
+
+        q = TypedCircularArrayQueue('i', 2, overflow=CircularArrayQueue.RAISE)
+        q.enqueue_many([1, 2])
+        self.assertRaises(QueueException, q.enqueue, 3)
+
+        q = TypedCircularArrayQueue('i', 2, overflow=CircularArrayQueue.GROW)
+        q.enqueue(-1)
+        q.enqueue_many(range(100))
+        self.assertEqual(q.size(), 101)
+        self.assertEqual(q.dequeue_many(200), [-1] + list(range(100)))
+        self.assertEqual(q.max_queue_size, 2)
+
+    def test_bad_values_leave_queue_unchanged(self):
+        q = TypedCircularArrayQueue('b', 2)
+        q.enqueue_many([1, 2])
+        with self.assertRaises(OverflowError):
+            q.enqueue(1000)
+        with self.assertRaises(TypeError):
+            q.enqueue_many([3, 'x'])
+        self.assertEqual(q.dequeue_many(2), [1, 2])
+
+    def test_snapshot(self):
+        q = TypedCircularArrayQueue('q', 4)
+        self.assertEqual([v.tolist() for v in q.snapshot()], [[], []])
+        q.enqueue_many([1, 2, 3])
+        front, wrapped = q.snapshot()
+        self.assertEqual((front.tolist(), wrapped.tolist()), ([1, 2, 3], []))
+
+        q.dequeue_many(2)
+        q.enqueue_many([4, 5, 6])
+        front, wrapped = q.snapshot()
+        self.assertEqual((front.tolist(), wrapped.tolist()), ([3, 4], [5, 6]))
+
+        # the views share the queue's buffer
+        q.dequeue()
+        q.enqueue(7)
+        self.assertEqual(wrapped.tolist(), [5, 6])
+        self.assertEqual(front[0], 7)
+
+
+class SPSCCircularArrayQueueTests(TestCase):
+    def test_max_queue_size_zero(self):
+        with self.assertRaises(QueueException):
+            SPSCCircularArrayQueue(max_queue_size=0)
+
+    def test_queue_api(self):
+        q = SPSCCircularArrayQueue(3)
+        self.assertTrue(q.is_empty())
+        with self.assertRaises(QueueException):
+            q.first()
+        with self.assertRaises(QueueException):
+            q.dequeue()
+        q.enqueue('a')
+        q.enqueue_many(['b', 'c'])
+        self.assertTrue(q.is_full())
+        with self.assertRaises(QueueException):
+            q.enqueue('d')
+        with self.assertRaises(QueueException):
+            q.enqueue_many(['d'])
+        self.assertEqual(q.first(), 'a')
+        self.assertEqual(q.size(), 3)
+        self.assertEqual(len(q), 3)
+        self.assertEqual(q.dequeue(), 'a')
+        # wrap around the end of the array
+        q.enqueue_many(['d'])
+        self.assertEqual(q.dequeue_many(5), ['b', 'c', 'd'])
+        self.assertEqual(q.dequeue_many(5), [])
+        self.assertEqual(q._array, [None]*3)
+
+    def test_producer_consumer_threads(self):
+        """
+        Every item crosses from the producer to the consumer
+        thread exactly once and in order
+        """
+        q = SPSCCircularArrayQueue(64)
+        n = 200000
+        got = []
+
+        def produce():
+            i = 0
+            while i < n:
+                if q.is_full():
+                    # let the consumer run
+                    time.sleep(0)
+                else:
+                    q.enqueue(i)
+                    i += 1
+
+        def consume():
+            while len(got) < n:
+                if q.is_empty():
+                    time.sleep(0)
+                else:
+                    got.append(q.dequeue())
+
+        threads = [threading.Thread(target=produce), threading.Thread(target=consume)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(got, list(range(n)))
+        self.assertTrue(q.is_empty())
+
+
+def _shared_memory_producer(q, start, count):
+    """
+    Child process: enqueue count records, waiting for space
+    """
+    i = start
+    while i < start + count:
+        try:
+            q.enqueue((i, i*0.5))
+            i += 1
+        except QueueException:
+            pass
+    q.close()
+
+
+class SharedMemoryCircularArrayQueueTests(TestCase):
+    def test_bad_arguments(self):
+        with self.assertRaises(QueueException):
+            SharedMemoryCircularArrayQueue(0, slot_size=8)
+        with self.assertRaises(QueueException):
+            SharedMemoryCircularArrayQueue(4)
+        with self.assertRaises(QueueException):
+            SharedMemoryCircularArrayQueue(4, slot_size=8, record_format='<q')
+
+    def test_bytes_slots(self):
+        q = SharedMemoryCircularArrayQueue(3, slot_size=4)
+        try:
+            self.assertTrue(q.is_empty())
+            with self.assertRaises(QueueException):
+                q.first()
+            with self.assertRaises(QueueException):
+                q.dequeue()
+            with self.assertRaises(QueueException):
+                q.enqueue(b'too long')
+            q.enqueue(b'a')
+            q.enqueue_many([b'bb', b''])
+            self.assertTrue(q.is_full())
+            with self.assertRaises(QueueException):
+                q.enqueue(b'c')
+            self.assertEqual(q.first(), b'a')
+            self.assertEqual(len(q), 3)
+            self.assertEqual(q.dequeue(), b'a')
+            # wrap around the end of the segment
+            q.enqueue(b'dddd')
+            self.assertEqual(q.dequeue_many(5), [b'bb', b'', b'dddd'])
+            self.assertEqual(q.dequeue_many(5), [])
+        finally:
+            q.unlink()
+
+    def test_record_slots_and_attach(self):
+        q = SharedMemoryCircularArrayQueue(4, record_format='<qd')
+        try:
+            q.enqueue((1, 0.5))
+            # a second handle attaches to the same segment by name
+            other = SharedMemoryCircularArrayQueue(4, record_format='<qd', name=q.name, lock=q._lock)
+            self.assertEqual(other.dequeue(), (1, 0.5))
+            other.enqueue((2, 1.5))
+            other.close()
+            self.assertEqual(q.dequeue(), (2, 1.5))
+        finally:
+            q.unlink()
+
+    def test_producer_processes(self):
+        """
+        Records enqueued by child processes are all dequeued exactly once
+        """
+        q = SharedMemoryCircularArrayQueue(16, record_format='<qd')
+        try:
+            procs = [multiprocessing.Process(target=_shared_memory_producer, args=(q, p*500, 500))
+                     for p in range(2)]
+            for p in procs:
+                p.start()
+            got = []
+            while len(got) < 1000:
+                got.extend(q.dequeue_many(16))
+            for p in procs:
+                p.join()
+            self.assertEqual(sorted(got), [(i, i*0.5) for i in range(1000)])
+        finally:
+            q.unlink()
+
+
 class PythonListQueueTests(TestCase):
     def test_enqueue_and_first(self):
         """
@@ -159,6 +480,15 @@ class PythonListQueueTests(TestCase):
         self.assertFalse(q.is_empty())
 
 
+    def test_enqueue_many_dequeue_many(self):
+        q = PythonListQueue()
+        q.enqueue_many(range(5))
+        self.assertEqual(q.size(), 5)
+        self.assertEqual(q.dequeue_many(3), [0, 1, 2])
+        self.assertEqual(q.dequeue_many(-1), [])
+        self.assertEqual(q.dequeue_many(3), [3, 4])
+        self.assertEqual(q.dequeue_many(3), [])
+
 class LinkedListQueueTests(TestCase):
     def test_enqueue_and_first(self):
         """
@@ -224,4 +554,389 @@ class LinkedListQueueTests(TestCase):
 
         # one item in the queue
         q.enqueue('x')
-        self.assertFalse(q.is_empty())
\ No newline at end of file
+        self.assertFalse(q.is_empty())
+
+    def test_unrolled_backend(self):
+        q = LinkedListQueue(backend=UnrolledLinkedList)
+        with self.assertRaises(QueueException):
+            q.first()
+        for i in range(200):
+            q.enqueue(i)
+        self.assertEqual(q.first(), 0)
+        self.assertEqual([q.dequeue() for _ in range(200)], list(range(200)))
+        self.assertTrue(q.is_empty())
+
+    def test_enqueue_many_dequeue_many(self):
+        for backend in (LinkedList, DoubleLinkedList, UnrolledLinkedList, IndexedDeque,
+                        partial(LinkedList, indexed=True), partial(IndexedDeque, block_size=2)):
+            q = LinkedListQueue(backend=backend)
+            self.assertEqual(q.dequeue_many(3), [])
+            q.enqueue_many([])
+            q.enqueue('a')
+            q.enqueue_many(range(100))
+            q.enqueue('b')
+            self.assertEqual(q.size(), 102)
+            self.assertEqual(q.first(), 'a')
+            self.assertEqual(q.dequeue_many(51), ['a'] + list(range(50)))
+            self.assertEqual(q.dequeue_many(100), list(range(50, 100)) + ['b'])
+            self.assertTrue(q.is_empty())
+            with self.assertRaises(QueueException):
+                q.first()
+            q.enqueue_many([1, 2])
+            self.assertEqual([q.dequeue(), q.dequeue()], [1, 2])
+
+
+class BlockingQueueTests(TestCase):
+    def test_bad_max_size(self):
+        with self.assertRaises(QueueException):
+            BlockingQueue(PythonListQueue(), max_size=0)
+
+    def test_queue_api(self):
+        for q in (BlockingCircularArrayQueue(3), BlockingLinkedListQueue()):
+            self.assertTrue(q.is_empty())
+            with self.assertRaises(QueueException):
+                q.first()
+            with self.assertRaises(QueueException):
+                q.dequeue()
+            q.enqueue('a')
+            q.enqueue_many(['b', 'c'])
+            self.assertEqual(q.first(), 'a')
+            self.assertEqual(q.size(), 3)
+            self.assertEqual(len(q), 3)
+            self.assertEqual(q.dequeue(), 'a')
+            self.assertEqual(q.dequeue_many(5), ['b', 'c'])
+            self.assertEqual(q.dequeue_many(5), [])
+
+    def test_bounded(self):
+        q = BlockingCircularArrayQueue(2)
+        self.assertEqual(q.max_size, 2)
+        q.put(1)
+        q.put(2)
+        self.assertTrue(q.is_full())
+        with self.assertRaises(QueueException):
+            q.enqueue(3)
+        with self.assertRaises(QueueException):
+            q.put(3, timeout=0.01)
+        with self.assertRaises(QueueException):
+            q.enqueue_many([3])
+        self.assertEqual(q.size(), 2)
+        self.assertFalse(BlockingLinkedListQueue().is_full())
+
+    def test_get_timeout(self):
+        q = BlockingLinkedListQueue()
+        with self.assertRaises(QueueException):
+            q.get(timeout=0.01)
+        with self.assertRaises(QueueException):
+            q.get(block=False)
+        with self.assertRaises(QueueException):
+            q.get_many(3, timeout=0.01)
+
+    def test_put_waits_for_space(self):
+        q = BlockingCircularArrayQueue(1)
+        q.put('a')
+
+        def consume():
+            self.assertEqual(q.get(timeout=5), 'a')
+        t = threading.Thread(target=consume)
+        t.start()
+        q.put('b', timeout=5)
+        t.join()
+        self.assertEqual(q.get(), 'b')
+
+    def test_get_many_waits_for_items(self):
+        q = BlockingLinkedListQueue()
+        t = threading.Thread(target=q.enqueue_many, args=([1, 2, 3],))
+        t.start()
+        # enqueue_many adds the whole batch under the lock
+        self.assertEqual(q.get_many(2, timeout=5), [1, 2])
+        t.join()
+        self.assertEqual(q.get_many(5, timeout=5), [3])
+
+    def test_producers_and_consumers(self):
+        """
+        Every item put by several producers is got exactly once
+        """
+        q = BlockingCircularArrayQueue(8)
+        producers, consumers, per_producer = 3, 3, 2000
+        results = [[] for _ in range(consumers)]
+
+        def produce(p):
+            for i in range(per_producer):
+                q.put((p, i), timeout=5)
+
+        def consume(c):
+            for _ in range(producers * per_producer // consumers):
+                results[c].append(q.get(timeout=5))
+
+        threads = [threading.Thread(target=produce, args=(p,)) for p in range(producers)]
+        threads += [threading.Thread(target=consume, args=(c,)) for c in range(consumers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        got = sorted(x for r in results for x in r)
+        self.assertEqual(got, sorted((p, i) for p in range(producers) for i in range(per_producer)))
+        self.assertTrue(q.is_empty())
+
+
+class AsyncCircularArrayQueueTests(TestCase):
+    def test_queue_api(self):
+        async def run():
+            q = AsyncCircularArrayQueue(3)
+            self.assertTrue(q.is_empty())
+            with self.assertRaises(QueueException):
+                q.first()
+            with self.assertRaises(QueueException):
+                q.dequeue_nowait()
+            await q.enqueue('a')
+            await q.enqueue_many(['b', 'c'])
+            self.assertTrue(q.is_full())
+            with self.assertRaises(QueueException):
+                q.enqueue_nowait('d')
+            self.assertEqual(q.first(), 'a')
+            self.assertEqual(q.size(), 3)
+            self.assertEqual(len(q), 3)
+            self.assertEqual(q.max_queue_size, 3)
+            self.assertEqual(await q.dequeue(), 'a')
+            self.assertEqual(await q.dequeue_many(5), ['b', 'c'])
+        asyncio.run(run())
+
+    def test_backpressure(self):
+        """
+        A producer faster than the consumer waits for space
+        and nothing is lost or reordered
+        """
+        async def run():
+            q = AsyncCircularArrayQueue(4)
+            got = []
+
+            async def produce():
+                await q.enqueue_many(range(50))
+                for i in range(50, 100):
+                    await q.enqueue(i)
+
+            async def consume(count):
+                while count > 0:
+                    if count % 2:
+                        got.append(await q.dequeue())
+                        count -= 1
+                    else:
+                        items = await q.dequeue_many(min(count, 3))
+                        got.extend(items)
+                        count -= len(items)
+                    self.assertLessEqual(q.size(), 4)
+
+            await asyncio.gather(produce(), consume(50), consume(50))
+            return got
+        self.assertEqual(sorted(asyncio.run(run())), list(range(100)))
+
+    def test_dequeue_many_timeout(self):
+        async def run():
+            q = AsyncCircularArrayQueue(4)
+            self.assertEqual(await q.dequeue_many(3, timeout=0.01), [])
+            self.assertEqual(len(q._getters), 0)
+
+            async def later():
+                await asyncio.sleep(0.01)
+                q.enqueue_nowait('x')
+            task = asyncio.ensure_future(later())
+            self.assertEqual(await q.dequeue_many(3, timeout=5), ['x'])
+            await task
+        asyncio.run(run())
+
+    def test_cancelled_getter(self):
+        async def run():
+            q = AsyncCircularArrayQueue(2)
+            task = asyncio.ensure_future(q.dequeue())
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            await q.enqueue('a')
+            self.assertEqual(await q.dequeue(), 'a')
+        asyncio.run(run())
+
+
+class PersistentQueueTests(TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_queue_api(self):
+        q = PersistentQueue(self.directory)
+        self.assertTrue(q.is_empty())
+        with self.assertRaises(QueueException):
+            q.first()
+        with self.assertRaises(QueueException):
+            q.dequeue()
+        with self.assertRaises(QueueException):
+            q.enqueue('not bytes')
+        q.enqueue(b'a')
+        q.enqueue_many([b'b', bytearray(b'c')])
+        self.assertEqual(q.size(), 3)
+        self.assertEqual(len(q), 3)
+        self.assertEqual(q.first(), b'a')
+        self.assertEqual([q.dequeue() for _ in range(3)], [b'a', b'b', b'c'])
+        self.assertTrue(q.is_empty())
+        q.close()
+
+    def test_spill_and_read_ahead(self):
+        """
+        Elements past the memory budget are read back from disk in order
+        """
+        q = PersistentQueue(self.directory, max_memory_bytes=10, segment_size=64)
+        items = [str(i).encode()*3 for i in range(100)]
+        for x in items[:50]:
+            q.enqueue(x)
+        q.enqueue_many(items[50:])
+        self.assertLessEqual(q.memory_bytes, 10)
+        self.assertEqual(q.size(), 100)
+        self.assertGreater(len(os.listdir(self.directory)), 2)
+
+        ret = []
+        while not q.is_empty():
+            self.assertEqual(q.first(), items[len(ret)])
+            ret.append(q.dequeue())
+            self.assertLessEqual(q.memory_bytes, 10)
+        self.assertEqual(ret, items)
+        q.close()
+
+    def test_recover_unacknowledged(self):
+        q = PersistentQueue(self.directory, max_memory_bytes=8, segment_size=32)
+        items = [bytes([i])*4 for i in range(40)]
+        q.enqueue_many(items)
+        self.assertEqual([q.dequeue() for _ in range(10)], items[:10])
+        q.ack()
+        segments = len(os.listdir(self.directory))
+        # dequeued but never acknowledged
+        self.assertEqual([q.dequeue() for _ in range(5)], items[10:15])
+        q.close()
+
+        q = PersistentQueue(self.directory, max_memory_bytes=8, segment_size=32)
+        self.assertEqual(q.size(), 30)
+        self.assertEqual([q.dequeue() for _ in range(30)], items[10:])
+        q.ack()
+        self.assertLess(len(os.listdir(self.directory)), segments)
+        q.enqueue(b'new')
+        q.close()
+
+        q = PersistentQueue(self.directory)
+        self.assertEqual([q.dequeue() for _ in range(q.size())], [b'new'])
+        q.close()
+
+    def test_recover_torn_write(self):
+        q = PersistentQueue(self.directory)
+        q.enqueue_many([b'one', b'two'])
+        segment = q._segment_path(q._write_segment)
+        q.close()
+
+        # crash in the middle of writing a third record
+        with open(segment, 'ab') as f:
+            f.write(b'\x09\x00\x00\x00\x00\x00\x00\x00thr')
+
+        q = PersistentQueue(self.directory)
+        self.assertEqual([q.dequeue() for _ in range(q.size())], [b'one', b'two'])
+        self.assertEqual(os.path.getsize(segment), 2*(8 + 3))
+        q.close()
+
+
+class HeapPriorityQueueTests(TestCase):
+
+    def test_bad_arity(self):
+        self.assertRaises(QueueException, HeapPriorityQueue, 1)
+
+    def test_empty(self):
+        q = HeapPriorityQueue()
+        self.assertTrue(q.is_empty())
+        self.assertRaises(QueueException, q.dequeue)
+        self.assertRaises(QueueException, q.first)
+
+    def test_dequeue_in_priority_order(self):
+        rng = random.Random(7)
+        items = [rng.randrange(1000) for _ in range(500)]
+        for d in (2, 3, 4, 8):
+            q = HeapPriorityQueue(d=d)
+            for x in items:
+                q.enqueue(x)
+            self.assertEqual(q.size(), 500)
+            self.assertEqual(q.first(), min(items))
+            self.assertEqual([q.dequeue() for _ in range(500)], sorted(items))
+            self.assertTrue(q.is_empty())
+
+    def test_priority_argument_is_stable(self):
+        q = HeapPriorityQueue()
+        q.enqueue('low', priority=5)
+        q.enqueue('high', priority=1)
+        q.enqueue('also low', priority=5)
+        q.enqueue('unorderable', priority=5)
+        self.assertEqual(q.first_priority(), 1)
+        self.assertEqual([q.dequeue() for _ in range(4)],
+                         ['high', 'low', 'also low', 'unorderable'])
+
+    def test_enqueue_many_heapify(self):
+        rng = random.Random(3)
+        items = rng.sample(range(10000), 1000)
+        for indexed in (False, True):
+            q = HeapPriorityQueue(d=4, indexed=indexed)
+            q.enqueue(5000.5)
+            q.enqueue_many(items)
+            q.enqueue_many([-1, 20000])
+            self.assertEqual(q.dequeue_many(q.size()), sorted(items + [5000.5, -1, 20000]))
+
+    def test_decrease_key(self):
+        q = HeapPriorityQueue(indexed=True)
+        for name, priority in (('a', 10), ('b', 20), ('c', 30), ('d', 40)):
+            q.enqueue(name, priority)
+        q.decrease_key('d', 15)
+        q.decrease_key('c', 1)
+        self.assertIn('d', q)
+        self.assertEqual([q.dequeue() for _ in range(4)], ['c', 'a', 'd', 'b'])
+        self.assertNotIn('d', q)
+
+    def test_decrease_key_errors(self):
+        q = HeapPriorityQueue()
+        q.enqueue('a', 1)
+        self.assertRaises(QueueException, q.decrease_key, 'a', 0)
+
+        q = HeapPriorityQueue(indexed=True)
+        q.enqueue('a', 1)
+        self.assertRaises(QueueException, q.enqueue, 'a', 2)
+        self.assertRaises(QueueException, q.decrease_key, 'b', 0)
+        self.assertRaises(QueueException, q.decrease_key, 'a', 2)
+
+    def test_indexed_enqueue_many_rejects_duplicates(self):
+        q = HeapPriorityQueue(indexed=True)
+        self.assertRaises(QueueException, q.enqueue_many, [1, 2, 1])
+        self.assertEqual(len(q), 0)
+        self.assertNotIn(2, q)
+        q.enqueue(2)
+        q.decrease_key(2, 0)
+        self.assertEqual(q.first(), 2)
+
+        # already queued, on both the per-element and the heapify path
+        for batch in ([3, 2], [3, 4, 5, 2]):
+            self.assertRaises(QueueException, q.enqueue_many, batch)
+            self.assertEqual(len(q), 1)
+            self.assertNotIn(3, q)
+        q.enqueue_many([5, 4, 3])
+        q.decrease_key(5, -1)
+        self.assertEqual(q.dequeue_many(4), [5, 2, 3, 4])
+
+    def test_dijkstra(self):
+        graph = {'s': {'a': 7, 'b': 2}, 'a': {'t': 1}, 'b': {'a': 3, 't': 8}, 't': {}}
+        distance = {v: float('inf') for v in graph}
+        distance['s'] = 0
+        q = HeapPriorityQueue(d=4, indexed=True)
+        for v in graph:
+            q.enqueue(v, distance[v])
+        while not q.is_empty():
+            u = q.dequeue()
+            for v, w in graph[u].items():
+                if distance[u] + w < distance[v]:
+                    distance[v] = distance[u] + w
+                    q.decrease_key(v, distance[v])
+        self.assertEqual(distance, {'s': 0, 'a': 5, 'b': 2, 't': 6})
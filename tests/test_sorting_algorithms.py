@@ -1,5 +1,11 @@
-from unittest import TestCase
-from sorts.sorting_algorithms import bubble_sort, selection_sort, insertion_sort, shell_sort, merge_sort
+from array import array
+from enum import IntEnum
+import random
+from unittest import TestCase, skipIf
+from sorts import sorting_algorithms
+from sorts.sorting_algorithms import bubble_sort, selection_sort, insertion_sort, shell_sort, merge_sort, \
+    quick_sort, parallel_merge_sort, bottom_up_merge_sort, sort, numpy, counting_sort, lsd_radix_sort, \
+    msd_radix_sort
 
 
 class BubbleSortTests(TestCase):
@@ -149,4 +155,474 @@ class MergeSortTests(TestCase):
     def test_unsorted_list(self):
         l = [9, 1, 3, 13]
         merge_sort(l)
-        self.assertEqual(l, [1, 3, 9, 13])
\ No newline at end of file
+        self.assertEqual(l, [1, 3, 9, 13])
+
+
+class QuickSortTests(TestCase):
+    """
+    Tests on the quick sort function
+    """
+    def test_empty_list(self):
+        l = []
+        quick_sort(l)
+        self.assertEqual(len(l), 0)
+
+    def test_single_item_list(self):
+        l = [9]
+        quick_sort(l)
+        self.assertEqual(len(l), 1)
+
+    def test_already_sorted_list(self):
+        l = [1, 3, 9, 13]
+        quick_sort(l)
+        self.assertEqual(l, [1, 3, 9, 13])
+
+    def test_reverse_sorted_list(self):
+        l = [13, 9, 3, 1]
+        quick_sort(l)
+        self.assertEqual(l, [1, 3, 9, 13])
+
+    def test_unsorted_list(self):
+        l = [9, 1, 3, 13]
+        quick_sort(l)
+        self.assertEqual(l, [1, 3, 9, 13])
+
+    def test_large_inputs(self):
+        rng = random.Random(5)
+        n = 3000
+        inputs = {
+            'random': [rng.random() for _ in range(n)],
+            'sorted': list(range(n)),
+            'reversed': list(range(n, 0, -1)),
+            'few distinct': [rng.randrange(3) for _ in range(n)],
+            'all equal': [7] * n,
+            'organ pipe': list(range(n // 2)) + list(range(n // 2, 0, -1)),
+            'strings': [str(rng.randrange(n)) for _ in range(n)],
+        }
+        for name, l in inputs.items():
+            expected = sorted(l)
+            quick_sort(l)
+            self.assertEqual(l, expected, name)
+
+    def test_heapsort_fallback(self):
+        rng = random.Random(9)
+        l = [rng.randrange(1000) for _ in range(500)]
+        expected = sorted(l)
+        # a zero depth limit sends the whole list to heapsort
+        sorting_algorithms._introsort(l, 0, len(l), 0)
+        self.assertEqual(l, expected)
+
+        l = [rng.randrange(1000) for _ in range(100)]
+        expected = l[:10] + sorted(l[10:90]) + l[90:]
+        sorting_algorithms._heap_sort_range(l, 10, 90)
+        self.assertEqual(l, expected)
+
+
+class ParallelMergeSortTests(TestCase):
+    """
+    Tests on the parallel merge sort function
+    A zero threshold forces the worker processes even for small lists
+    """
+    def test_empty_list(self):
+        l = []
+        parallel_merge_sort(l, workers=2, threshold=0)
+        self.assertEqual(len(l), 0)
+
+    def test_single_item_list(self):
+        l = [9]
+        parallel_merge_sort(l, workers=2, threshold=0)
+        self.assertEqual(l, [9])
+
+    def test_serial_fallback(self):
+        l = [13, 9, 3, 1]
+        parallel_merge_sort(l)
+        self.assertEqual(l, [1, 3, 9, 13])
+
+    def test_shared_memory_ints_and_floats(self):
+        rng = random.Random(4)
+        for l in ([rng.randrange(-10**12, 10**12) for _ in range(1000)],
+                  [rng.random() for _ in range(1000)]):
+            expected = sorted(l)
+            parallel_merge_sort(l, workers=3, threshold=0)
+            self.assertEqual(l, expected)
+            self.assertIs(type(l[0]), type(expected[0]))
+
+    def test_pickled_elements(self):
+        rng = random.Random(6)
+        inputs = (
+            [str(rng.randrange(1000)) for _ in range(500)],
+            [rng.choice([1, 2.5]) for _ in range(500)],
+            [2**70, 1, -2**70, 5],
+        )
+        for l in inputs:
+            expected = sorted(l)
+            parallel_merge_sort(l, workers=4, threshold=0)
+            self.assertEqual(l, expected)
+
+    def test_more_workers_than_elements(self):
+        l = [3, 1, 2]
+        parallel_merge_sort(l, workers=8, threshold=0)
+        self.assertEqual(l, [1, 2, 3])
+
+    def test_worker_error(self):
+        l = [3, 'a', 1, None]
+        with self.assertRaises(TypeError):
+            parallel_merge_sort(l, workers=2, threshold=0)
+
+
+class BottomUpMergeSortTests(TestCase):
+    """
+    Tests on the bottom up merge sort function
+    """
+    def test_empty_list(self):
+        l = []
+        bottom_up_merge_sort(l)
+        self.assertEqual(len(l), 0)
+
+    def test_single_item_list(self):
+        l = [9]
+        bottom_up_merge_sort(l)
+        self.assertEqual(len(l), 1)
+
+    def test_already_sorted_list(self):
+        l = [1, 3, 9, 13]
+        bottom_up_merge_sort(l)
+        self.assertEqual(l, [1, 3, 9, 13])
+
+    def test_reverse_sorted_list(self):
+        l = [13, 9, 3, 1]
+        bottom_up_merge_sort(l)
+        self.assertEqual(l, [1, 3, 9, 13])
+
+    def test_unsorted_list(self):
+        l = [9, 1, 3, 13]
+        bottom_up_merge_sort(l)
+        self.assertEqual(l, [1, 3, 9, 13])
+
+    def test_large_inputs(self):
+        rng = random.Random(8)
+        n = 5000
+        inputs = {
+            'random': [rng.random() for _ in range(n)],
+            'sorted': list(range(n)),
+            'reversed': list(range(n, 0, -1)),
+            'few distinct': [rng.randrange(3) for _ in range(n)],
+            'sorted blocks': [x for b in range(50) for x in sorted(rng.sample(range(10**6), 100))],
+            'sawtooth': [i % 77 for i in range(n)],
+        }
+        for name, l in inputs.items():
+            expected = sorted(l)
+            bottom_up_merge_sort(l)
+            self.assertEqual(l, expected, name)
+
+    def test_stable(self):
+        class Item(object):
+            def __init__(self, key, tag):
+                self.key = key
+                self.tag = tag
+
+            def __lt__(self, other):
+                return self.key < other.key
+
+        rng = random.Random(2)
+        # descending stretches with ties exercise the run reversal
+        keys = [rng.randrange(10) for _ in range(1000)] + list(range(200, 0, -1)) * 2
+        l = [Item(k, i) for i, k in enumerate(keys)]
+        bottom_up_merge_sort(l)
+        self.assertEqual([(x.key, x.tag) for x in l],
+                         sorted((k, i) for i, k in enumerate(keys)))
+
+
+class KeyAndReverseTests(TestCase):
+    """
+    key= and reverse= on every sort match list.sort, including
+    the order of equal keys
+    """
+    sorts = (bubble_sort, selection_sort, insertion_sort, shell_sort, merge_sort,
+             bottom_up_merge_sort, quick_sort,
+             lambda data, **kwargs: parallel_merge_sort(data, workers=2, threshold=0, **kwargs))
+
+    def records(self):
+        rng = random.Random(12)
+        return [{'id': i, 'age': rng.randrange(20), 'name': rng.choice('abc')} for i in range(300)]
+
+    def test_key(self):
+        for sort_func in self.sorts:
+            l = self.records()
+            expected = sorted(l, key=lambda r: r['age'])
+            sort_func(l, key=lambda r: r['age'])
+            self.assertEqual([r['id'] for r in l], [r['id'] for r in expected])
+
+    def test_reverse(self):
+        for sort_func in self.sorts:
+            l = self.records()
+            expected = sorted(l, key=lambda r: (r['name'], r['age']), reverse=True)
+            sort_func(l, key=lambda r: (r['name'], r['age']), reverse=True)
+            self.assertEqual([r['id'] for r in l], [r['id'] for r in expected])
+
+            l = [3, 1, 2, 3, 0]
+            sort_func(l, reverse=True)
+            self.assertEqual(l, [3, 3, 2, 1, 0])
+
+    def test_key_called_once_per_element(self):
+        for sort_func in self.sorts:
+            calls = []
+
+            def key(x):
+                calls.append(x)
+                return -x
+
+            l = list(range(50))
+            sort_func(l, key=key)
+            self.assertEqual(l, list(range(49, -1, -1)))
+            self.assertEqual(len(calls), 50)
+
+    def test_elements_never_compared(self):
+        class Opaque(object):
+            def __init__(self, value):
+                self.value = value
+
+        for sort_func in (bubble_sort, selection_sort, insertion_sort, shell_sort, merge_sort,
+                          bottom_up_merge_sort, quick_sort):
+            l = [Opaque(v) for v in (3, 1, 2, 1)]
+            sort_func(l, key=lambda o: o.value)
+            self.assertEqual([o.value for o in l], [1, 1, 2, 3])
+
+    def test_merge_sort_stable_without_key(self):
+        class Item(object):
+            def __init__(self, key, tag):
+                self.key = key
+                self.tag = tag
+
+            def __lt__(self, other):
+                return self.key < other.key
+
+            def __gt__(self, other):
+                return self.key > other.key
+
+        for sort_func in (merge_sort, bottom_up_merge_sort, insertion_sort, bubble_sort):
+            l = [Item(k, i) for i, k in enumerate([2, 1, 2, 1, 0, 2])]
+            sort_func(l)
+            self.assertEqual([x.tag for x in l], [4, 1, 3, 0, 2, 5])
+
+
+class SortTests(TestCase):
+    """
+    Tests on the sort function and its backends
+    """
+    def test_every_algorithm(self):
+        for backend in ('python', 'numpy'):
+            for algorithm in sorting_algorithms.ALGORITHMS:
+                if algorithm == 'msd_radix':
+                    l = [b'e', b'c', b'i', b'a', b'c']
+                    expected = [b'a', b'c', b'c', b'e', b'i']
+                else:
+                    l = [5, 3, 9, 1, 3]
+                    expected = [1, 3, 3, 5, 9]
+                sort(l, algorithm, backend=backend)
+                self.assertEqual(l, expected, (algorithm, backend))
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            sort([2, 1], 'bogo')
+        with self.assertRaises(ValueError):
+            sort([2, 1], backend='cuda')
+
+    def test_python_backend_array(self):
+        a = array('d', [2.5, -1.0, 2.0])
+        sort(a, 'merge', reverse=True)
+        self.assertEqual(a, array('d', [2.5, 2.0, -1.0]))
+
+    def test_numpy_backend_falls_back(self):
+        # keys, strings and big ints need the python sorts
+        l = [{'a': 2}, {'a': 1}]
+        sort(l, 'merge', backend='numpy', key=lambda d: d['a'])
+        self.assertEqual(l, [{'a': 1}, {'a': 2}])
+        l = ['b', 'c', 'a']
+        sort(l, 'quick', backend='numpy')
+        self.assertEqual(l, ['a', 'b', 'c'])
+        l = [2**70, 1]
+        sort(l, 'merge', backend='numpy')
+        self.assertEqual(l, [1, 2**70])
+
+    def test_numpy_backend_without_numpy(self):
+        saved = sorting_algorithms.numpy
+        sorting_algorithms.numpy = None
+        try:
+            l = [3.0, 1.0, 2.0]
+            sort(l, 'merge', backend='numpy', reverse=True)
+            self.assertEqual(l, [3.0, 2.0, 1.0])
+        finally:
+            sorting_algorithms.numpy = saved
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_backend(self):
+        rng = random.Random(3)
+        ints = [rng.randrange(-1000, 1000) for _ in range(1000)]
+        for algorithm in ('merge', 'quick', 'bottom_up_merge', 'parallel_merge'):
+            l = list(ints)
+            sort(l, algorithm, backend='numpy')
+            self.assertEqual(l, sorted(ints))
+            self.assertIs(type(l[0]), int)
+
+            a = array('i', ints)
+            sort(a, algorithm, backend='numpy', reverse=True)
+            self.assertEqual(a.tolist(), sorted(ints, reverse=True))
+
+            n = numpy.array(ints, dtype=float)
+            sort(n, algorithm, backend='numpy')
+            self.assertEqual(n.tolist(), sorted(float(x) for x in ints))
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_backend_reverse_keeps_signed_zeros_stable(self):
+        import math
+        data = [0.0, -0.0, 1.0, -0.0, 0.0, -1.0]
+        expected = sorted(data, reverse=True)
+        for algorithm in ('merge', 'quick', 'bottom_up_merge'):
+            for backend in ('python', 'numpy'):
+                for values in (list(data), array('d', data), numpy.array(data)):
+                    sort(values, algorithm, backend=backend, reverse=True)
+                    signs = [math.copysign(1, x) for x in values]
+                    self.assertEqual(signs, [math.copysign(1, x) for x in expected],
+                                     (algorithm, backend, type(values)))
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_rejects_multidimensional_arrays(self):
+        for backend in ('python', 'numpy'):
+            n = numpy.array([[3, 1], [2, 0]])
+            with self.assertRaises(ValueError):
+                sort(n, 'merge', backend=backend)
+            self.assertEqual(n.tolist(), [[3, 1], [2, 0]])
+
+
+class IntegerDistributionSortTests(TestCase):
+    """
+    Tests on the counting sort and LSD radix sort functions
+    """
+    sorts = (counting_sort, lsd_radix_sort, lambda data, **kwargs: lsd_radix_sort(data, radix_bits=3, **kwargs))
+
+    def test_small_lists(self):
+        for sort_func in self.sorts:
+            for l, expected in (([], []), ([9], [9]), ([13, 9, 3, 1], [1, 3, 9, 13]),
+                                ([1, 3, 9, 13], [1, 3, 9, 13]), ([4, 4, 4], [4, 4, 4])):
+                sort_func(l)
+                self.assertEqual(l, expected)
+
+    def test_negative_and_random(self):
+        rng = random.Random(10)
+        ints = [rng.randrange(-5000, 5000) for _ in range(3000)]
+        for sort_func in self.sorts:
+            l = list(ints)
+            sort_func(l)
+            self.assertEqual(l, sorted(ints))
+            l = list(ints)
+            sort_func(l, reverse=True)
+            self.assertEqual(l, sorted(ints, reverse=True))
+
+    def test_buffers_sorted_in_place(self):
+        ints = [7, -2, 300, 0, -2, 41]
+        for sort_func in self.sorts:
+            a = array('q', ints)
+            sort_func(a)
+            self.assertEqual(a, array('q', sorted(ints)))
+
+            a = array('h', ints)
+            with memoryview(a) as view:
+                sort_func(view)
+            self.assertEqual(a.tolist(), sorted(ints))
+
+    def test_key_is_stable(self):
+        rng = random.Random(11)
+        records = [(rng.randrange(6), i) for i in range(500)]
+        for sort_func in self.sorts:
+            for reverse in (False, True):
+                calls = []
+
+                def key(record):
+                    calls.append(record)
+                    return record[0]
+
+                l = list(records)
+                sort_func(l, key=key, reverse=reverse)
+                self.assertEqual(l, sorted(records, key=lambda r: r[0], reverse=reverse))
+                self.assertEqual(len(calls), len(records))
+
+    def test_large_lsd_keys(self):
+        rng = random.Random(12)
+        ints = [rng.randrange(-2**70, 2**70) for _ in range(1000)]
+        l = list(ints)
+        lsd_radix_sort(l)
+        self.assertEqual(l, sorted(ints))
+
+    def test_int_subclasses_keep_their_type(self):
+        class Level(IntEnum):
+            LOW = 1
+            HIGH = 3
+
+        for sort_func in self.sorts:
+            l = [True, False, True, 2]
+            sort_func(l)
+            self.assertEqual([type(x) for x in l], [bool, bool, bool, int])
+            self.assertEqual(l, [False, True, True, 2])
+
+            l = [Level.HIGH, 2, Level.LOW]
+            sort_func(l, reverse=True)
+            self.assertEqual(l, [Level.HIGH, 2, Level.LOW])
+            self.assertIs(l[0], Level.HIGH)
+            self.assertIs(l[2], Level.LOW)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            counting_sort([0, 10**9])
+        with self.assertRaises(ValueError):
+            counting_sort([0, 100], max_range=10)
+        with self.assertRaises(TypeError):
+            lsd_radix_sort([1.5, 2.0])
+        # a float strictly inside the range used to slip past the check
+        with self.assertRaises(TypeError):
+            lsd_radix_sort([1, 1.5, 2])
+
+    def test_counting_sort_rejects_non_int_keys(self):
+        for data, key in (([1.5, 2.0], None), ([3, 1.5, 2], None),
+                          (['b', 'a'], None), ([(1, 'a'), (0.5, 'b')], lambda r: r[0])):
+            l = list(data)
+            with self.assertRaises(TypeError) as context:
+                counting_sort(l, key=key)
+            self.assertIn('counting_sort', str(context.exception))
+            self.assertEqual(l, data)
+
+
+class MSDRadixSortTests(TestCase):
+    """
+    Tests on the MSD radix sort function
+    """
+    def test_small_lists(self):
+        for l, expected in (([], []), ([b'x'], [b'x']), ([b'b', b'', b'ab', b'a'], [b'', b'a', b'ab', b'b'])):
+            msd_radix_sort(l)
+            self.assertEqual(l, expected)
+
+    def test_bytes_and_str(self):
+        rng = random.Random(13)
+        words = [bytes(rng.randrange(97, 101) for _ in range(rng.randrange(8))) for _ in range(3000)]
+        l = list(words)
+        msd_radix_sort(l)
+        self.assertEqual(l, sorted(words))
+
+        strings = [w.decode() + rng.choice(['', '\u00e9', '\u4e2d']) for w in words]
+        l = list(strings)
+        msd_radix_sort(l, reverse=True)
+        self.assertEqual(l, sorted(strings, reverse=True))
+
+    def test_long_common_prefix(self):
+        l = [b'x' * 3000 + bytes([i % 7]) for i in range(100)]
+        expected = sorted(l)
+        msd_radix_sort(l)
+        self.assertEqual(l, expected)
+
+    def test_key_is_stable(self):
+        rng = random.Random(14)
+        records = [(rng.choice(['ab', 'a', 'b', 'abc', '']), i) for i in range(400)]
+        for reverse in (False, True):
+            l = list(records)
+            msd_radix_sort(l, key=lambda r: r[0], reverse=reverse)
+            self.assertEqual(l, sorted(records, key=lambda r: r[0], reverse=reverse))
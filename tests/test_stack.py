@@ -1,7 +1,9 @@
 from unittest import TestCase
 
 
-from stack import ArrayStack, StackException, LinkedListStack
+from linked_lists import UnrolledLinkedList, IndexedDeque
+from stack import ArrayStack, StackException, LinkedListStack, ChunkedArrayStack, TypedArrayStack, \
+    PersistentStack
 
 
 class ArrayStackTests(TestCase):
@@ -157,4 +159,204 @@ class LinkedListStackTests(TestCase):
 
         # +1 item
         stack.push('b')
-        self.assertEqual(stack.size(), 2)
\ No newline at end of file
+        self.assertEqual(stack.size(), 2)
+
+    def test_unrolled_backend(self):
+        for backend in (UnrolledLinkedList, IndexedDeque):
+            stack = LinkedListStack(backend=backend)
+            with self.assertRaises(StackException):
+                stack.peek()
+            for i in range(200):
+                stack.push(i)
+            self.assertEqual(stack.peek(), 199)
+            self.assertEqual([i for i in stack], list(range(199, -1, -1)))
+            self.assertEqual([stack.pop() for _ in range(200)], list(range(199, -1, -1)))
+            with self.assertRaises(StackException):
+                stack.pop()
+
+
+class ChunkedArrayStackTests(TestCase):
+    """
+    Tests on the ChunkedArrayStack class
+    """
+    def test_bad_sizes(self):
+        with self.assertRaises(StackException):
+            ChunkedArrayStack(chunk_size=0)
+        with self.assertRaises(StackException):
+            ChunkedArrayStack(pool_size=-1)
+
+    def test_empty(self):
+        stack = ChunkedArrayStack()
+        self.assertTrue(stack.is_empty())
+        self.assertEqual(len(stack), 0)
+        self.assertEqual([i for i in stack], [])
+        with self.assertRaises(StackException):
+            stack.peek()
+        with self.assertRaises(StackException):
+            stack.pop()
+
+    def test_push_pop_across_chunks(self):
+        stack = ChunkedArrayStack(chunk_size=3)
+        for i in range(10):
+            stack.push(i)
+        self.assertEqual(stack.size(), 10)
+        self.assertEqual(stack.peek(), 9)
+        # iteration goes bottom to top, like ArrayStack
+        self.assertEqual([i for i in stack], list(range(10)))
+        self.assertEqual([stack.pop() for _ in range(10)], list(range(9, -1, -1)))
+        self.assertTrue(stack.is_empty())
+
+    def test_chunks_released_and_pooled(self):
+        stack = ChunkedArrayStack(chunk_size=4, pool_size=2)
+        for i in range(40):
+            stack.push(i)
+        self.assertEqual(len(stack._chunks), 10)
+        for _ in range(38):
+            stack.pop()
+        self.assertEqual(len(stack._chunks), 1)
+        self.assertEqual(len(stack._pool), 2)
+
+        # pooled chunks are reused and hold no stale references
+        pooled = stack._pool[-1]
+        for i in range(3):
+            stack.push(i)
+        self.assertIs(stack._chunks[-1], pooled)
+        self.assertEqual(pooled, [2, None, None, None])
+        self.assertEqual([i for i in stack], [0, 1, 0, 1, 2])
+
+
+class TypedArrayStackTests(TestCase):
+    """
+    Tests on the TypedArrayStack class
+    """
+    def test_push_pop(self):
+        stack = TypedArrayStack('d')
+        with self.assertRaises(StackException):
+            stack.pop()
+        with self.assertRaises(StackException):
+            stack.peek()
+        for x in (1.5, 2, -3.25):
+            stack.push(x)
+        self.assertEqual(stack.size(), 3)
+        self.assertEqual(stack.peek(), -3.25)
+        self.assertEqual([i for i in stack], [1.5, 2.0, -3.25])
+        self.assertEqual([stack.pop() for _ in range(3)], [-3.25, 2.0, 1.5])
+        self.assertTrue(stack.is_empty())
+
+    def test_type_checked(self):
+        stack = TypedArrayStack('b')
+        with self.assertRaises(TypeError):
+            stack.push('x')
+        with self.assertRaises(OverflowError):
+            stack.push(1000)
+        self.assertTrue(stack.is_empty())
+
+    def test_bad_values_leave_stack_unchanged(self):
+        stack = TypedArrayStack('b')
+        stack.push_many([1, 2])
+        with self.assertRaises(TypeError):
+            stack.push_many([3, 'x', 4])
+        with self.assertRaises(OverflowError):
+            stack.push_many([3, 1000])
+        self.assertEqual(stack.pop_many(5), [2, 1])
+
+    def test_snapshot(self):
+        stack = TypedArrayStack('q')
+        for i in range(5):
+            stack.push(i)
+        with stack.snapshot() as view:
+            self.assertEqual(view.tolist(), [0, 1, 2, 3, 4])
+            self.assertEqual(view.itemsize, 8)
+            # the view shares the stack's buffer
+            with self.assertRaises(BufferError):
+                stack.push(5)
+        stack.push(5)
+        self.assertEqual(stack.pop(), 5)
+
+
+class BatchStackTests(TestCase):
+    """
+    push_many, pop_many and peek_many on every stack
+    """
+    factories = (
+        ArrayStack, LinkedListStack, lambda: ChunkedArrayStack(chunk_size=3),
+        lambda: LinkedListStack(backend=UnrolledLinkedList),
+        lambda: LinkedListStack(backend=IndexedDeque),
+        lambda: TypedArrayStack('q'),
+    )
+
+    def test_batches(self):
+        for factory in self.factories:
+            stack = factory()
+            self.assertEqual(stack.pop_many(3), [])
+            self.assertEqual(stack.peek_many(3), [])
+            stack.push(100)
+            stack.push_many(range(10))
+            self.assertEqual(stack.size(), 11)
+            self.assertEqual(stack.peek(), 9)
+            self.assertEqual(stack.peek_many(3), [9, 8, 7])
+            self.assertEqual(stack.size(), 11)
+            self.assertEqual(stack.pop_many(4), [9, 8, 7, 6])
+            self.assertEqual(stack.pop(), 5)
+            self.assertEqual(stack.peek_many(0), [])
+            self.assertEqual(stack.pop_many(-1), [])
+            self.assertEqual(stack.peek_many(50), [4, 3, 2, 1, 0, 100])
+            self.assertEqual(stack.pop_many(50), [4, 3, 2, 1, 0, 100])
+            self.assertTrue(stack.is_empty())
+            with self.assertRaises(StackException):
+                stack.pop()
+
+    def test_matches_single_item_calls(self):
+        for factory in self.factories:
+            single = factory()
+            batched = factory()
+            for i in range(5):
+                single.push(i)
+            batched.push_many(range(5))
+            self.assertEqual([i for i in batched], [i for i in single])
+            self.assertEqual(batched.pop_many(2), [single.pop(), single.pop()])
+
+
+class PersistentStackTests(TestCase):
+    """
+    Tests on the PersistentStack class
+    """
+    def test_empty(self):
+        stack = PersistentStack()
+        self.assertTrue(stack.is_empty())
+        self.assertEqual(len(stack), 0)
+        with self.assertRaises(StackException):
+            stack.peek()
+        with self.assertRaises(StackException):
+            stack.pop()
+
+    def test_push_pop_return_new_versions(self):
+        empty = PersistentStack()
+        a = empty.push('a')
+        ab = a.push('b')
+        ac = a.push('c')
+        self.assertTrue(empty.is_empty())
+        self.assertEqual(a.peek(), 'a')
+        self.assertEqual([i for i in ab], ['b', 'a'])
+        self.assertEqual([i for i in ac], ['c', 'a'])
+        self.assertEqual(ab.size(), 2)
+
+        popped = ab.pop()
+        self.assertEqual([i for i in popped], ['a'])
+        self.assertEqual([i for i in ab], ['b', 'a'])
+
+    def test_undo(self):
+        history = [PersistentStack([1, 2])]
+        for x in range(3, 6):
+            history.append(history[-1].push(x))
+        history.append(history[-1].pop())
+        self.assertEqual([s.peek() for s in history], [2, 3, 4, 5, 4])
+        self.assertEqual([i for i in history[0]], [2, 1])
+
+    def test_batches(self):
+        stack = PersistentStack().push_many(range(5))
+        self.assertEqual(stack.peek_many(3), [4, 3, 2])
+        smaller = stack.pop_many(3)
+        self.assertEqual([i for i in smaller], [1, 0])
+        self.assertEqual(stack.size(), 5)
+        self.assertTrue(stack.pop_many(10).is_empty())